@@ -15,12 +15,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from users.views import GroupViewSet, StudentViewSet, TeacherViewSet  # pyright: ignore[reportMissingImports]
+from users.views import ChangeFeedView, DatabaseHealthView, GroupViewSet, JobViewSet, MetricsView, StudentViewSet, TeacherViewSet, ThrottledTokenObtainPairView, ThrottledTokenRefreshView  # pyright: ignore[reportMissingImports]
 
 BASE_URL: str = "api/v1/"
 
@@ -29,16 +29,61 @@ router = DefaultRouter()
 router.register(BASE_URL + "students", StudentViewSet, basename="students")
 router.register(BASE_URL + "teachers", TeacherViewSet, basename="teachers")
 router.register(BASE_URL + "groups", GroupViewSet, basename="groups")
+router.register(BASE_URL + "jobs", JobViewSet, basename="jobs")
+
+
+def async_read_urls():
+    """
+    Async list / retrieve for students and groups (ASGI deployments, ASYNC_READS=true).
+    Same paths and names as the router's, listed before it; writes still reach the sync viewsets.
+    """
+    urls = []
+    for prefix, viewset in (("students", StudentViewSet), ("groups", GroupViewSet)):
+        urls += [
+            path(
+                f"{BASE_URL}{prefix}/",
+                viewset.as_async_view(
+                    {"get": "list", "post": "create"}, basename=prefix, detail=False
+                ),
+                name=f"{prefix}-list",
+            ),
+            path(
+                f"{BASE_URL}{prefix}/<uuid:pk>/",
+                viewset.as_async_view(
+                    {
+                        "get": "retrieve",
+                        "put": "update",
+                        "patch": "partial_update",
+                        "delete": "destroy",
+                    },
+                    basename=prefix,
+                    detail=True,
+                ),
+                name=f"{prefix}-detail",
+            ),
+        ]
+    return urls
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     # JWT endpoints
-    path(BASE_URL + "token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path(
+        BASE_URL + "token/",
+        ThrottledTokenObtainPairView.as_view(),
+        name="token_obtain_pair",
+    ),
     path(
         BASE_URL + "token/refresh/",
-        TokenRefreshView.as_view(),
+        ThrottledTokenRefreshView.as_view(),
         name="token_refresh",
     ),
+    # change feed (users.outbox)
+    path(BASE_URL + "changes/", ChangeFeedView.as_view(), name="changes"),
+    # health / metrics
+    path(BASE_URL + "health/db/", DatabaseHealthView.as_view(), name="health_db"),
+    path(BASE_URL + "metrics/", MetricsView.as_view(), name="metrics"),
     # API endpoints
+    *(async_read_urls() if settings.ASYNC_READS else []),
     path("", include(router.urls)),
 ]
@@ -0,0 +1,158 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404, HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import mixins, viewsets
+from rest_framework.response import Response
+
+# INFO: methods served by the async handlers, everything else goes to the sync viewset
+ASYNC_METHODS = {"get", "head"}
+
+
+class AsyncReadMixin(
+    mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    Async `list` / `retrieve` (`alist` / `aretrieve`) for ASGI, mounted with `as_async_view`.
+    - authentication: `aauthenticate` of the authenticators (StatelessJWTAuthentication)
+    - scoping / filtering: the viewset's own get_queryset() + filter_queryset(), queries run
+      through the async ORM (`aget`, async iteration, `aaggregate`)
+    - permissions: the regular permission classes, for safe methods they only look at
+      `request.user` and never touch the DB
+    Anything async-unaware the viewset still needs (scope lookups) is awaited in `aprepare`.
+    """
+
+    async def aprepare(self, request):
+        """
+        Hook to load, with awaits, what get_queryset() reads synchronously.
+        """
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except ObjectDoesNotExist:
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(  # pyright: ignore[reportAttributeAccessIssue]
+            queryset, self.request, view=self
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+    async def aperform_authentication(self, request):
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, "aauthenticate", None)
+            try:
+                if authenticate is None:
+                    result = await sync_to_async(authenticator.authenticate)(request)
+                else:
+                    result = await authenticate(request)
+            except Exception:
+                request._not_authenticated()
+                raise
+            if result is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = result
+                return
+        request._not_authenticated()
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        APIView.dispatch() with the awaiting parts awaited.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            self.format_kwarg = self.get_format_suffix(**kwargs)
+            negotiated = self.perform_content_negotiation(request)
+            request.accepted_renderer, request.accepted_media_type = negotiated
+            version, scheme = self.determine_version(request, *args, **kwargs)
+            request.version, request.versioning_scheme = version, scheme
+
+            await self.aperform_authentication(request)
+            self.check_permissions(request)
+            if self.get_throttles():
+                await sync_to_async(self.check_throttles)(request)
+            await self.aprepare(request)
+
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return _rendered(self.response)
+
+    @classmethod
+    def as_async_view(cls, actions, **initkwargs):
+        """
+        Like `as_view(actions)`, for ASGI: GET / HEAD run `a<action>` on the event loop,
+        other methods run the regular sync viewset in a worker thread.
+        """
+        if "get" in actions and "head" not in actions:
+            actions = {**actions, "head": actions["get"]}
+        sync_view = sync_to_async(cls.as_view(actions, **initkwargs))
+
+        async def view(request, *args, **kwargs):
+            method = request.method.lower()
+            if method not in ASYNC_METHODS:
+                return await sync_view(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            self.action_map = actions
+            self.request = request
+            return await self.adispatch(request, *args, **kwargs)
+
+        # INFO: what DRF puts on its views, read by the router / QueryBudgetMiddleware
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        return csrf_exempt(view)
+
+
+def _rendered(response):
+    """
+    A plain HttpResponse: Django would otherwise render a TemplateResponse in a thread.
+    """
+    if not isinstance(response, SimpleTemplateResponse):
+        return response
+
+    response.render()
+    plain = HttpResponse(
+        response.content,
+        status=response.status_code,
+        content_type=response["Content-Type"],
+    )
+    for header, value in response.items():
+        plain[header] = value
+    return plain
@@ -0,0 +1,132 @@
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import TOKEN_VERSION_CLAIM
+
+
+class ClaimsUser(TokenUser):
+    """
+    Stateless user built from access-token claims (`role`, `is_active`, `token_version`).
+    `id` / `pk` are UUIDs so they compare equal to model foreign keys.
+    """
+
+    @cached_property
+    def id(self):
+        return UUID(str(self.token[api_settings.USER_ID_CLAIM]))
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def role(self):
+        return self.token.get("role")
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+
+def token_version_cache_key(user_id):
+    return f"token-version:{user_id}"
+
+
+def get_token_version(user_id):
+    """
+    Current `(token_version, is_active)` of a user, or None if the user is gone.
+    Cached for TOKEN_VERSION_CACHE_TIMEOUT seconds; User.save() refreshes the entry.
+    """
+    key = token_version_cache_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = _token_version_query(user_id).first()
+        if state is None:
+            return None
+        cache.set(key, state, getattr(settings, "TOKEN_VERSION_CACHE_TIMEOUT", 300))
+    return state
+
+
+async def aget_token_version(user_id):
+    """
+    Async get_token_version().
+    """
+    key = token_version_cache_key(user_id)
+    state = await cache.aget(key)
+    if state is None:
+        state = await _token_version_query(user_id).afirst()
+        if state is None:
+            return None
+        await cache.aset(
+            key, state, getattr(settings, "TOKEN_VERSION_CACHE_TIMEOUT", 300)
+        )
+    return state
+
+
+def _token_version_query(user_id):
+    return (
+        get_user_model()
+        .objects.filter(pk=user_id)
+        .values_list("token_version", "is_active")
+    )
+
+
+def check_token_version(validated_token, state):
+    if state is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    version, is_active = state
+    if not is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if validated_token[TOKEN_VERSION_CLAIM] != version:
+        raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication without a per-request user query.
+    The user comes from token claims; revoked tokens are detected by comparing the
+    `token_version` claim with the cached current version of the user.
+    Tokens issued before the claims existed fall back to the regular DB lookup.
+    `aauthenticate` is the same check for the async read views.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return JWTAuthentication.get_user(self, validated_token)
+
+        user = super().get_user(validated_token)
+        check_token_version(validated_token, get_token_version(user.pk))
+        return user
+
+    async def aauthenticate(self, request):
+        # INFO: header parsing and signature checks are CPU only, just the version lookup awaits
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            user = await sync_to_async(JWTAuthentication.get_user)(
+                self, validated_token
+            )
+            return user, validated_token
+
+        user = super().get_user(validated_token)
+        check_token_version(validated_token, await aget_token_version(user.pk))
+        return user, validated_token
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.utils.crypto import salted_hmac
+
+VERIFICATION_KEY_SALT = "users.backends.VerificationCacheBackend"
+
+
+def verification_cache_timeout():
+    return getattr(settings, "LOGIN_VERIFICATION_CACHE_TIMEOUT", 0)
+
+
+def verification_cache_key(user, password):
+    """
+    HMAC (SECRET_KEY) of the password, salted with the user's stored hash:
+    a password change or hasher upgrade leaves old entries unreachable.
+    """
+    digest = salted_hmac(
+        VERIFICATION_KEY_SALT,
+        f"{user.pk}:{user.password}:{password}",
+        algorithm="sha256",
+    )
+    return f"login-verified:{digest.hexdigest()}"
+
+
+class VerificationCacheBackend(ModelBackend):
+    """
+    ModelBackend that remembers successful password checks for LOGIN_VERIFICATION_CACHE_TIMEOUT
+    seconds in the process-local cache, so repeated logins skip the password hash.
+    Failed checks are never cached, each wrong password still pays the full hash.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        timeout = verification_cache_timeout()
+        if not timeout:
+            return super().authenticate(request, username, password, **kwargs)
+
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # INFO: hash anyway, unknown emails answer as slowly as wrong passwords
+            UserModel().set_password(password)
+            return None
+
+        cache = caches["local"]
+        verified = bool(cache.get(verification_cache_key(user, password)))
+        if not verified and user.check_password(password):
+            # INFO: keyed after check_password(), which may have upgraded the stored hash
+            cache.set(verification_cache_key(user, password), True, timeout)
+            verified = True
+        return user if verified and self.user_can_authenticate(user) else None
@@ -0,0 +1,180 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, viewsets
+from rest_framework.response import Response
+
+from .models import RoleType
+
+
+def _timestamp(value):
+    return int(value.timestamp()) if value else None
+
+
+def _attr_path(obj, path):
+    for name in path.split("__"):
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
+
+
+class ConditionalGetMixin(
+    mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    ETag / Last-Modified for `list` and `retrieve`.
+    - retrieve: validators from the object's (and nested objects') `updated_at`, no serialization on 304
+    - list: one aggregate query, MAX(updated_at) of every serialized relation + COUNT(*) of the scoped queryset
+    Serialized payloads are kept in the cache under their ETag, so a repeated read
+    without If-None-Match skips serialization too.
+    `updated_at_fields` lists the `updated_at` paths that end up in the representation.
+    Last-Modified has one-second resolution and misses deletes, the ETag is the reliable validator.
+    `alist` / `aretrieve` are the same for the async read views (users.async_views).
+    """
+
+    updated_at_fields = ("updated_at",)
+
+    def _scope_key(self, request):
+        user = request.user
+        if getattr(user, "role", None) == RoleType.ADMIN:
+            return RoleType.ADMIN
+        return f"{getattr(user, 'role', None)}:{user.pk}"
+
+    def _etag(self, request, *parts):
+        raw = "|".join(
+            str(part)
+            for part in (
+                self.basename,
+                self._scope_key(request),
+                request.get_full_path(),
+                request.headers.get("Accept", ""),
+                *parts,
+            )
+        )
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+    def _conditional(self, request, etag, last_modified, render):
+        response = self._not_modified(request, etag, last_modified)
+        if response is None:
+            key = f"conditional:{etag}"
+            data = cache.get(key)
+            if data is None:
+                data = render()
+                cache.set(key, data, self._cache_timeout())
+            response = Response(data)
+        return self._with_validators(response, etag, last_modified)
+
+    async def _aconditional(self, request, etag, last_modified, arender):
+        response = self._not_modified(request, etag, last_modified)
+        if response is None:
+            key = f"conditional:{etag}"
+            data = await cache.aget(key)
+            if data is None:
+                data = await arender()
+                await cache.aset(key, data, self._cache_timeout())
+            response = Response(data)
+        return self._with_validators(response, etag, last_modified)
+
+    def _cache_timeout(self):
+        return getattr(settings, "CONDITIONAL_CACHE_TIMEOUT", 300)
+
+    def _not_modified(self, request, etag, last_modified):
+        return get_conditional_response(
+            request._request, etag=etag, last_modified=_timestamp(last_modified)
+        )
+
+    def _with_validators(self, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(_timestamp(last_modified))
+        # INFO: payloads are per user, clients may keep them but must revalidate
+        response["Cache-Control"] = "private, no-cache"
+        patch_vary_headers(response, ("Authorization", "Accept"))
+        return response
+
+    def _list_validators(self, request, stats):
+        last_modified = max(
+            (value for key, value in stats.items() if key != "count" and value),
+            default=None,
+        )
+        etag = self._etag(
+            request, stats["count"], last_modified and last_modified.isoformat()
+        )
+        return etag, last_modified
+
+    def get_updated_at_fields(self):
+        """
+        The `updated_at` paths of a list's validators, narrowed by SparseFieldsMixin.
+        """
+        return self.updated_at_fields
+
+    def _list_aggregates(self):
+        return {
+            "count": Count("pk"),
+            **{
+                f"max_{i}": Max(path)
+                for i, path in enumerate(self.get_updated_at_fields())
+            },
+        }
+
+    def _retrieve_validators(self, request, instance):
+        last_modified = max(
+            (
+                value
+                for path in self.updated_at_fields
+                if (value := _attr_path(instance, path))
+            ),
+            default=None,
+        )
+        etag = self._etag(
+            request, instance.pk, last_modified and last_modified.isoformat()
+        )
+        return etag, last_modified
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.order_by().aggregate(**self._list_aggregates())
+        etag, last_modified = self._list_validators(request, stats)
+
+        def render():
+            return super(ConditionalGetMixin, self).list(request, *args, **kwargs).data
+
+        return self._conditional(request, etag, last_modified, render)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = await queryset.order_by().aaggregate(**self._list_aggregates())
+        etag, last_modified = self._list_validators(request, stats)
+
+        async def arender():
+            response = await super(ConditionalGetMixin, self).alist(
+                request, *args, **kwargs
+            )
+            return response.data
+
+        return await self._aconditional(request, etag, last_modified, arender)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self._retrieve_validators(request, instance)
+
+        return self._conditional(
+            request,
+            etag,
+            last_modified,
+            lambda: self.get_serializer(instance).data,
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        etag, last_modified = self._retrieve_validators(request, instance)
+
+        async def arender():
+            return self.get_serializer(instance).data
+
+        return await self._aconditional(request, etag, last_modified, arender)
@@ -0,0 +1,33 @@
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def database_stats(alias=DEFAULT_DB_ALIAS):
+    """
+    Connection settings of `alias` and, with DB_POOL, the psycopg pool counters of this process:
+    - pool_size / pool_available: open / idle connections, requests_waiting: queued checkouts
+    - requests_wait_ms, connections_lost, returns_bad...: cumulative since the pool was opened
+    """
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    # INFO: only the postgresql backend has `pool`, None when pooling is off
+    pool = getattr(connection, "pool", None)
+    return {
+        "alias": alias,
+        "vendor": connection.vendor,
+        "conn_max_age": settings_dict["CONN_MAX_AGE"],
+        "health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+        "pool": pool.get_stats() if pool is not None else None,
+    }
+
+
+def ping(alias=DEFAULT_DB_ALIAS):
+    """
+    Round trip of a `SELECT 1` in milliseconds, raises the driver's error when the DB is down.
+    """
+    started = time.perf_counter()
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return round((time.perf_counter() - started) * 1000, 2)
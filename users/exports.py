@@ -0,0 +1,56 @@
+import csv
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from rest_framework.utils.encoders import JSONEncoder
+
+EXPORT_CHUNK_SIZE = 2_000
+
+
+class Echo:
+    """
+    File-like object for csv.writer: returns the line instead of buffering it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, serializer, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields one representation per row, reading the queryset through a server-side cursor.
+    The serializer is built once and reused for every row.
+    """
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(obj)
+
+
+def stream_ndjson(queryset, serializer):
+    encoder = JSONEncoder()
+    for row in iter_rows(queryset, serializer):
+        yield encoder.encode(row) + "\n"
+
+
+def stream_csv(queryset, serializer):
+    fields = [name for name, field in serializer.fields.items() if not field.write_only]
+    writer = csv.DictWriter(Echo(), fieldnames=fields)
+    yield writer.writeheader()
+    for row in iter_rows(queryset, serializer):
+        yield writer.writerow(row)
+
+
+async def aiter_batches(chunks, batch_size=EXPORT_CHUNK_SIZE):
+    """
+    Async iterator over a sync stream, for ASGI: Django reads a sync iterator into a list
+    before sending anything. Each batch of `batch_size` chunks is produced in the ORM's
+    thread (thread-sensitive sync_to_async), where the server-side cursor lives.
+    """
+    next_batch = sync_to_async(lambda: "".join(islice(chunks, batch_size)))
+    while batch := await next_batch():
+        yield batch
+
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", stream_ndjson),
+    "csv": ("text/csv", stream_csv),
+}
@@ -0,0 +1,105 @@
+from django.db.models import Q
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+from rest_framework.settings import api_settings
+
+from .models import Group, Student, Teacher
+
+
+class StudentFilter(filters.FilterSet):
+    # INFO: plain UUID filters, a ModelChoiceFilter would load the group / teacher to validate it
+    group = filters.UUIDFilter(field_name="group_id")
+    teacher = filters.UUIDFilter(field_name="group__teacher_id")
+
+    class Meta:
+        model = Student
+        fields = {
+            "status": ["exact"],
+            "enrollment_date": ["exact", "gte", "lte"],
+        }
+
+
+class TeacherFilter(filters.FilterSet):
+    subject = filters.CharFilter(field_name="groups__subject", distinct=True)
+
+    class Meta:
+        model = Teacher
+        fields = {
+            "specialization": ["exact"],
+            "hired_date": ["exact", "gte", "lte"],
+        }
+
+
+class GroupFilter(filters.FilterSet):
+    teacher = filters.UUIDFilter(field_name="teacher_id")
+
+    class Meta:
+        model = Group
+        fields = {
+            "status": ["exact"],
+            "subject": ["exact"],
+        }
+
+
+class PrefixSearchFilter(BaseFilterBackend):
+    """
+    `?search=jo sm`: every word must be a case-insensitive prefix of one of `view.search_fields`.
+    Prefix-only on purpose: `istartswith` is served by the trigram (PostgreSQL) / NOCASE (SQLite)
+    indexes of migration 0009, a `%term%` search would not be on SQLite.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+    min_length = 2
+
+    def filter_queryset(self, request, queryset, view):
+        fields = getattr(view, "search_fields", None)
+        words = request.query_params.get(self.search_param, "").split()
+        if not fields or not words:
+            return queryset
+
+        if any(len(word) < self.min_length for word in words):
+            raise ValidationError(
+                {self.search_param: [f"Use at least {self.min_length} characters."]}
+            )
+
+        for word in words:
+            match = Q()
+            for field in fields:
+                match |= Q(**{f"{field}__istartswith": word})
+            queryset = queryset.filter(match)
+        return queryset
+
+
+class IndexedOrderingFilter(OrderingFilter):
+    """
+    `?ordering=field` / `?ordering=-field`, one field out of `view.ordering_fields`.
+    - every allowed field has an index ending in the pk, the pk breaks ties
+    - anything else (unknown or unindexed fields, several fields) is a 400, never a silent
+      sort on another column; without `?ordering` the view's `ordering` applies
+    KeysetPagination reads the same ordering and seeks on `(field, pk)`.
+    """
+
+    ordering_fields = ()  # INFO: never the serializer fields, only what the view lists
+
+    def get_ordering(self, request, queryset, view):
+        param = request.query_params.get(self.ordering_param, "").strip()
+        if not param:
+            ordering = self.get_default_ordering(view)
+            return (ordering[0],) if ordering else ("pk",)
+
+        allowed = getattr(view, "ordering_fields", None) or ()
+        if param.removeprefix("-") not in allowed:
+            choices = ", ".join(allowed)
+            raise ValidationError(
+                {
+                    self.ordering_param: [
+                        f"Order by one of: {choices} (prefix - for descending)."
+                    ]
+                }
+            )
+        return (param,)
+
+    def filter_queryset(self, request, queryset, view):
+        (ordering,) = self.get_ordering(request, queryset, view)
+        return queryset.order_by(ordering, "-pk" if ordering.startswith("-") else "pk")
@@ -0,0 +1,101 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    get_hashers_by_algorithm,
+    make_password,
+)
+
+
+class MachinePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Cheaper PBKDF2 profile for machine-created accounts (bulk enrollment / imports).
+    It is listed after the default hasher in PASSWORD_HASHERS, so Django re-hashes
+    the password with the default profile on the user's first successful login.
+    """
+
+    algorithm = "pbkdf2_sha256_machine"
+    iterations = 100_000
+
+
+# INFO: below this many passwords the pool start-up/IPC cost is bigger than the win
+POOL_MIN_BATCH = 8
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _hashing_settings():
+    return getattr(settings, "PASSWORD_HASHING", {})
+
+
+def machine_hasher():
+    """
+    Algorithm name of the machine profile, or "default" when it is not in PASSWORD_HASHERS.
+    """
+    algorithm = _hashing_settings().get("MACHINE_HASHER")
+    if algorithm and algorithm in get_hashers_by_algorithm():
+        return algorithm
+    return "default"
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _hash(args):
+    password, hasher = args
+    return make_password(password, hasher=hasher)
+
+
+def get_pool(workers=None):
+    """
+    Lazily creates the process pool shared by all hashing calls of this process.
+    `spawn` is used so forking a threaded server never copies held locks.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            workers = workers or _hashing_settings().get("WORKERS") or os.cpu_count()
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            atexit.register(shutdown_pool)
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def hash_passwords(passwords, hasher=None, pool=None):
+    """
+    Returns encoded hashes for `passwords` (same order), spreading `make_password` over a process pool.
+    - `hasher`: algorithm name, defaults to the machine profile (PASSWORD_HASHING["MACHINE_HASHER"])
+    - `pool`: executor to use instead of the shared one (benchmarks)
+    """
+    hasher = hasher or machine_hasher()
+    passwords = list(passwords)
+
+    if pool is None and len(passwords) < POOL_MIN_BATCH:
+        return [make_password(password, hasher=hasher) for password in passwords]
+
+    pool = pool or get_pool()
+    workers = pool._max_workers  # pyright: ignore[reportAttributeAccessIssue]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(pool.map(_hash, [(p, hasher) for p in passwords], chunksize=chunksize))
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+IDENTITY_FIELDS = {
+    "email": "Email must be unique.",
+    "phone_number": "Phone number must be unique.",
+}
+
+
+def taken_identities(emails=(), phone_numbers=(), exclude_user_id=None):
+    """
+    Which of `emails` / `phone_numbers` already belong to a user, in one query:
+    `{"email": {...}, "phone_number": {...}}`
+    """
+    emails, phone_numbers = set(filter(None, emails)), set(filter(None, phone_numbers))
+    taken = {"email": set(), "phone_number": set()}
+    if not emails and not phone_numbers:
+        return taken
+
+    User = get_user_model()
+    qs = User.objects.filter(Q(email__in=emails) | Q(phone_number__in=phone_numbers))
+    if exclude_user_id:
+        qs = qs.exclude(pk=exclude_user_id)
+
+    for email, phone_number in qs.values_list("email", "phone_number"):
+        if email in emails:
+            taken["email"].add(email)
+        if phone_number in phone_numbers:
+            taken["phone_number"].add(phone_number)
+    return taken
+
+
+def identity_errors(email=None, phone_number=None, exclude_user_id=None):
+    """
+    Field errors for an email / phone pair that collides with another user, `{}` when free.
+    """
+    # INFO: create_user stores the normalized email, updates store it as sent, check both
+    emails = (
+        {email, get_user_model().objects.normalize_email(email)} if email else set()
+    )
+    phone_numbers = {phone_number} if phone_number else set()
+    taken = taken_identities(emails, phone_numbers, exclude_user_id)
+    return {
+        field: [IDENTITY_FIELDS[field]]
+        for field, values in (("email", emails), ("phone_number", phone_numbers))
+        if values & taken[field]
+    }
+
+
+def taken_fields(email, phone_number, taken):
+    """
+    Field errors for the values of an email / phone pair that are in `taken` (see taken_identities).
+    """
+    values = {"email": email, "phone_number": phone_number}
+    return {
+        field: [IDENTITY_FIELDS[field]]
+        for field, value in values.items()
+        if value in taken[field]
+    }
+
+
+class IdentityValidationMixin:
+    """
+    Serializer side of the identity checks, for serializers with `user.email` / `user.phone_number`.
+    - `validate_identity`: email + phone collisions in a single query
+    - `save`: runs in a transaction; a concurrent insert that slips past the check hits the
+      unique constraints, the check runs again and reports the same field errors instead of a 500
+    """
+
+    def identity_clashes(self, attrs):
+        user_data = attrs.get("user", {})
+        instance = getattr(self, "instance", None)
+        return identity_errors(
+            email=user_data.get("email"),
+            phone_number=user_data.get("phone_number"),
+            exclude_user_id=instance.pk if instance else None,
+        )
+
+    def validate_identity(self, attrs):
+        errors = self.identity_clashes(attrs)
+        if errors:
+            raise serializers.ValidationError(errors)
+
+    def save(self, **kwargs):
+        try:
+            # INFO: user + profile rows are written together or not at all
+            with transaction.atomic():
+                save = super().save  # pyright: ignore[reportAttributeAccessIssue]
+                return save(**kwargs)
+        except IntegrityError:
+            # INFO: the rows now in the DB tell which field clashed, whatever the backend's message
+            errors = self.identity_clashes(
+                self.validated_data  # pyright: ignore[reportAttributeAccessIssue]
+            )
+            if not errors:
+                raise
+            raise serializers.ValidationError(errors)
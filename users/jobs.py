@@ -0,0 +1,236 @@
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from uuid import UUID
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Group, Job, JobStatus, RoleType
+from .sealing import SealError, seal, unseal
+from .services import bulk_enroll_students, bulk_move_students, complete_group
+
+logger = logging.getLogger(__name__)
+
+# INFO: a job found RUNNING past the stale timeout this many times (worker killed each time) fails
+MAX_ATTEMPTS = 3
+
+BULK_ROWS_PURPOSE = "users.jobs.bulk_enroll.rows"
+
+JOB_HANDLERS = {}
+
+
+class JobFailed(Exception):
+    """
+    Expected failure of a job (e.g. validation errors), `result` is kept on the job.
+    """
+
+    def __init__(self, result):
+        super().__init__(result)
+        self.result = result
+
+
+def job_handler(kind):
+    """
+    Registers `func(job) -> result` as the handler of `kind` jobs.
+    """
+
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def seal_bulk_rows(rows):
+    """
+    Bulk enrollment rows as stored in a job: they hold new users' passwords, which must
+    not be readable from the table while the job waits (see users.sealing).
+    """
+    return seal(rows, BULK_ROWS_PURPOSE)
+
+
+def submit_job(kind, payload, user):
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind {kind!r}")
+    return Job.objects.create(kind=kind, payload=payload, created_by_id=user.pk)
+
+
+def claim_job(worker):
+    """
+    Marks the oldest QUEUED job RUNNING and returns it, None when the queue is empty.
+    - PostgreSQL: `FOR UPDATE SKIP LOCKED`, concurrent workers skip each other's rows
+    - SQLite: no row locks, the claim transaction starts IMMEDIATE (settings) and holds
+      the database write lock, so claims run one at a time
+    """
+    with transaction.atomic():
+        queued = Job.objects.filter(status=JobStatus.QUEUED).order_by("created_at")
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        job = queued.first()
+        if job is None:
+            return None
+
+        job.status = JobStatus.RUNNING
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.attempts += 1
+        job.worker = worker
+        job.save(
+            update_fields=["status", "started_at", "heartbeat_at", "attempts", "worker"]
+        )
+    return job
+
+
+def _owned(job):
+    """
+    The row of `job` as long as it is still this run's: RUNNING, same worker, same attempt.
+    A job requeued (and maybe claimed again) meanwhile is no longer.
+    """
+    return Job.objects.filter(
+        pk=job.pk,
+        status=JobStatus.RUNNING,
+        worker=job.worker,
+        attempts=job.attempts,
+    )
+
+
+@contextmanager
+def heartbeat(job, interval):
+    """
+    Refreshes `job.heartbeat_at` every `interval` seconds while the block runs, from a thread
+    with its own connection: a job running longer than the stale timeout is not requeued.
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                try:
+                    _owned(job).update(heartbeat_at=timezone.now())
+                except DatabaseError:
+                    # INFO: e.g. SQLite's write lock held by the job itself, next beat retries
+                    logger.warning("Heartbeat of job %s failed", job.pk, exc_info=True)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{job.pk}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def requeue_stale_jobs(stale_after):
+    """
+    RUNNING jobs without a heartbeat for more than `stale_after` seconds lost their worker:
+    queued again, or FAILED after MAX_ATTEMPTS. Returns `(requeued, failed)`.
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = Job.objects.filter(
+        # INFO: rows claimed before heartbeats existed only have started_at
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at=None, started_at__lt=cutoff),
+        status=JobStatus.RUNNING,
+    )
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=JobStatus.FAILED,
+        error="Worker lost while running the job.",
+        payload=None,
+        finished_at=timezone.now(),
+    )
+    requeued = stale.update(status=JobStatus.QUEUED, worker="")
+    return requeued, failed
+
+
+def run_job(job, heartbeat_interval=None):
+    """
+    Runs a claimed job and stores its outcome. Handler exceptions fail the job, they do not propagate.
+    - `heartbeat_interval`: seconds between heartbeats (see heartbeat), None for none
+    - the outcome is only stored while the run still owns the row: a run that was taken for
+      abandoned and requeued leaves the row to the newer attempt
+    """
+    result, error = None, ""
+    status = JobStatus.SUCCEEDED
+    try:
+        handler = JOB_HANDLERS.get(job.kind)
+        if handler is None:
+            raise LookupError(f"Unknown job kind {job.kind!r}")
+        if heartbeat_interval:
+            with heartbeat(job, heartbeat_interval):
+                result = handler(job)
+        else:
+            result = handler(job)
+    except JobFailed as exc:
+        status, result = JobStatus.FAILED, exc.result
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed", job.pk, job.kind)
+        status, error = JobStatus.FAILED, f"{type(exc).__name__}: {exc}"
+
+    job.status, job.result, job.error = status, result, error
+    job.payload = None
+    job.finished_at = timezone.now()
+    # INFO: save() would write the row whoever owns it now
+    stored = _owned(job).update(
+        status=status,
+        result=result,
+        error=error,
+        payload=None,
+        finished_at=job.finished_at,
+    )
+    if not stored:
+        logger.warning(
+            "Job %s (%s) was requeued while %s ran it, its outcome is dropped",
+            job.pk,
+            job.kind,
+            job.worker,
+        )
+        job.refresh_from_db()
+    return job
+
+
+def _submitter(job):
+    # INFO: the job runs with the permissions its submitter has now, not at submit time
+    return get_user_model().objects.get(pk=job.created_by_id, is_active=True)
+
+
+@job_handler("students.bulk_enroll")
+def bulk_enroll_job(job):
+    rows = job.payload["rows"]
+    if isinstance(rows, str):
+        try:
+            rows = unseal(rows, BULK_ROWS_PURPOSE)
+        except SealError:
+            raise JobFailed({"detail": "The rows cannot be decrypted."})
+    students, errors = bulk_enroll_students(rows, _submitter(job))
+    if errors:
+        raise JobFailed({"errors": errors})
+    return {"created": len(students), "ids": [student.pk for student in students]}
+
+
+@job_handler("students.bulk_move")
+def bulk_move_job(job):
+    summary, errors = bulk_move_students(
+        [UUID(pk) for pk in job.payload["student_ids"]],
+        UUID(job.payload["group_id"]),
+        _submitter(job),
+    )
+    if errors:
+        raise JobFailed(errors)
+    return summary
+
+
+@job_handler("groups.complete")
+def complete_group_job(job):
+    group = Group.objects.get(pk=job.payload["group_id"])
+    user = _submitter(job)
+    if user.role == RoleType.TEACHER and group.teacher_id != user.pk:
+        raise JobFailed({"detail": "You can only complete groups you teach."})
+
+    summary = complete_group(group)
+    if summary is None:
+        raise JobFailed({"detail": "A terminated group cannot be completed."})
+    return summary
@@ -0,0 +1,170 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from users.models import Group, RoleType, Student, StudentStatus, Teacher, User
+from users.uuids import uuid7
+
+ID_FACTORIES = {"4": uuid.uuid4, "7": uuid7}
+STATUSES = [StudentStatus.STUDYING] * 8 + [
+    StudentStatus.EXPELLED,
+    StudentStatus.GRADUATED,
+]
+
+
+def access_paths(teacher_id, group_id, student_id):
+    """
+    The role-scoped queries of users.views, keyed by a short label.
+    """
+    return {
+        "teacher: my students": Student.objects.filter(
+            group__teacher_id=teacher_id
+        ).order_by("created_at", "pk")[:20],
+        "teacher: my groups": Group.objects.filter(teacher_id=teacher_id),
+        "teacher: active groups": Group.objects.filter(
+            teacher_id=teacher_id, status="STUDYING"
+        ),
+        "group: students by status": Student.objects.filter(
+            group_id=group_id, status=StudentStatus.EXPELLED
+        ),
+        "student: self": Student.objects.filter(user_id=student_id),
+        "admin: newest students": User.objects.filter(role=RoleType.STUDENT).order_by(
+            "-created_at"
+        )[:20],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the role-scoped access paths, optionally on a seeded dataset "
+        "that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--students", type=int, default=0, help="Seed this many students first"
+        )
+        parser.add_argument("--groups", type=int, default=200)
+        parser.add_argument(
+            "--uuid",
+            choices=ID_FACTORIES,
+            default="4",
+            help="UUID version of the seeded primary keys",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--keep", action="store_true", help="Commit the seeded rows"
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["students"]:
+                self._seed(options)
+
+            group_id, teacher_id = Group.objects.values_list(
+                "pk", "teacher_id"
+            ).last() or (None, None)
+            student_id = Student.objects.values_list("pk", flat=True).last()
+            if not (teacher_id and group_id and student_id):
+                raise CommandError("No data to explain, use --students to seed some.")
+
+            analyze = connection.vendor == "postgresql"
+            for label, queryset in access_paths(
+                teacher_id, group_id, student_id
+            ).items():
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    list(queryset.all())
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                self.stdout.write(
+                    self.style.MIGRATE_HEADING(
+                        f"{label}: median {statistics.median(timings):.2f} ms"
+                    )
+                )
+                self.stdout.write(
+                    queryset.explain(analyze=analyze) if analyze else queryset.explain()
+                )
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    def _seed(self, options):
+        new_id = ID_FACTORIES[options["uuid"]]
+        students = options["students"]
+        groups = max(1, min(options["groups"], students))
+        teachers = max(1, groups // 4)
+
+        def users(count, role, prefix):
+            # INFO: unusable passwords, hashing is not what is measured here
+            return [
+                User(
+                    id=new_id(),
+                    email=f"{prefix}{i}-{uuid.uuid4().hex[:8]}@bench.local",
+                    phone_number=f"{prefix}-{uuid.uuid4().hex[:12]}",
+                    first_name=prefix,
+                    role=role,
+                    password="!",
+                )
+                for i in range(count)
+            ]
+
+        started = time.perf_counter()
+        teacher_users = User.objects.bulk_create(
+            users(teachers, RoleType.TEACHER, "t"), batch_size=1000
+        )
+        teacher_rows = Teacher.objects.bulk_create(
+            [Teacher(user=user) for user in teacher_users], batch_size=1000
+        )
+        group_rows = Group.objects.bulk_create(
+            [
+                Group(
+                    id=new_id(),
+                    name=f"bench-{uuid.uuid4().hex[:12]}",
+                    subject="bench",
+                    teacher=teacher_rows[i % teachers],
+                )
+                for i in range(groups)
+            ],
+            batch_size=1000,
+        )
+        student_users = User.objects.bulk_create(
+            users(students, RoleType.STUDENT, "s"), batch_size=1000
+        )
+        Student.objects.bulk_create(
+            [
+                Student(
+                    user=user,
+                    date_of_birth="2000-01-01",
+                    group=group_rows[i % groups],
+                    status=STATUSES[i % len(STATUSES)],
+                )
+                for i, user in enumerate(student_users)
+            ],
+            batch_size=1000,
+        )
+        elapsed = time.perf_counter() - started
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.stdout.write(
+            f"seeded {students} students, {groups} groups, {teachers} teachers "
+            f"with uuid{options['uuid']} keys in {elapsed:.2f} s"
+        )
+        if connection.vendor == "postgresql":
+            self._index_sizes()
+
+    def _index_sizes(self):
+        # INFO: random (v4) keys split pages all over the pk index, v7 keys fill it left to right
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexrelname, pg_size_pretty(pg_relation_size(indexrelid)) "
+                "FROM pg_stat_user_indexes WHERE relname IN ('users_user', 'users_group') "
+                "ORDER BY indexrelname"
+            )
+            for name, size in cursor.fetchall():
+                self.stdout.write(f"  {name}: {size}")
@@ -0,0 +1,286 @@
+import json
+import statistics
+import time
+import tracemalloc
+from itertools import count
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.models import Group, RoleType, Student, Teacher, User
+
+from .seed_data import SEED_EMAIL_DOMAIN, SEED_PASSWORD
+
+API = "/api/v1"
+
+
+def percentile(samples, pct):
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def bench_users():
+    """
+    `{"admin": user, "teacher": user, "student": user}`, seeded users preferred.
+    """
+    users = {}
+    for role in (RoleType.ADMIN, RoleType.TEACHER, RoleType.STUDENT):
+        queryset = User.objects.filter(role=role, is_active=True)
+        if role == RoleType.TEACHER:
+            # INFO: a teacher with groups and students, so lists are not empty
+            queryset = queryset.filter(teacher__groups__students__isnull=False)
+        if role == RoleType.STUDENT:
+            queryset = queryset.filter(student__isnull=False)
+        user = (
+            queryset.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").first()
+            or queryset.first()
+        )
+        if user is None:
+            raise CommandError(f"No {role} user, run `manage.py seed_data` first.")
+        users[role.lower()] = user
+    return users
+
+
+def obtain_token(user, password):
+    response = APIClient(HTTP_HOST="localhost").post(
+        f"{API}/token/", {"email": user.email, "password": password}
+    )
+    if response.status_code != 200:
+        raise CommandError(
+            f"Cannot log in as {user.email}, pass the seed password with --password"
+        )
+    return response.data["access"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive list / retrieve / create / token endpoints with each role's credentials and "
+        "report p50/p95/p99 latency, queries and allocations per request. "
+        "Run `manage.py seed_data` first; writes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Per scenario")
+        parser.add_argument(
+            "--trace",
+            type=int,
+            default=5,
+            help="Extra requests per scenario measured with tracemalloc",
+        )
+        parser.add_argument("--password", default=SEED_PASSWORD)
+        parser.add_argument(
+            "--only", default="", help="Comma separated scenario name filter"
+        )
+        parser.add_argument(
+            "--baseline", type=Path, help="JSON file to compare against / save to"
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Write this run's results to --baseline",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=20.0,
+            help="Fail when p95 grows by more than this percentage over the baseline",
+        )
+
+    def handle(self, *args, **options):
+        # INFO: measures the endpoints themselves, the login throttles would answer 429
+        rates = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+        with override_settings(REST_FRAMEWORK=rates):
+            self._bench(options)
+
+    def _bench(self, options):
+        self.password = options["password"]
+        self.emails = count()
+        users = bench_users()
+        tokens = {
+            role: obtain_token(user, self.password) for role, user in users.items()
+        }
+
+        scenarios = self._scenarios(users)
+        if options["only"]:
+            wanted = options["only"].split(",")
+            scenarios = {
+                name: scenario
+                for name, scenario in scenarios.items()
+                if any(part in name for part in wanted)
+            }
+
+        baseline = {}
+        if options["baseline"] and options["baseline"].exists():
+            baseline = json.loads(options["baseline"].read_text())["results"]
+
+        self.stdout.write(
+            f"{'scenario':<28} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'queries':>8} {'KiB':>8} {'p95 vs base':>12}"
+        )
+        results, regressions = {}, []
+        for name, (role, request) in scenarios.items():
+            client = APIClient(HTTP_HOST="localhost")
+            if role != "anonymous":
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[role]}")
+
+            result = self._run(client, request, options["requests"], options["trace"])
+            results[name] = result
+
+            delta = ""
+            if name in baseline:
+                base = baseline[name]
+                change = (result["p95"] - base["p95"]) / base["p95"] * 100
+                delta = f"{change:+.0f}%"
+                if change > options["max_regression"]:
+                    regressions.append(
+                        f"{name}: p95 {base['p95']} -> {result['p95']} ms"
+                    )
+                if result["queries"] > base["queries"]:
+                    regressions.append(
+                        f"{name}: queries {base['queries']} -> {result['queries']}"
+                    )
+
+            self.stdout.write(
+                f"{name:<28} {result['p50']:>8.2f} {result['p95']:>8.2f} "
+                f"{result['p99']:>8.2f} {result['queries']:>8} "
+                f"{result['alloc_kib']:>8.0f} {delta:>12}"
+            )
+
+        if options["save_baseline"]:
+            if not options["baseline"]:
+                raise CommandError("--save-baseline needs --baseline PATH")
+            options["baseline"].write_text(
+                json.dumps(
+                    {"database": connection.vendor, "results": results}, indent=2
+                )
+                + "\n"
+            )
+            self.stdout.write(f"baseline saved to {options['baseline']}")
+
+        if regressions:
+            raise CommandError("Regressions:\n" + "\n".join(regressions))
+
+    def _scenarios(self, users):
+        """
+        `{name: (role, request)}`, `request(client)` sends one request and returns the response.
+        """
+        teacher, student = users["teacher"], users["student"]
+        own_group = Group.objects.filter(teacher_id=teacher.pk).first()
+        any_student = Student.objects.filter(group__teacher_id=teacher.pk).first()
+        any_teacher = Teacher.objects.first()
+
+        def get(path):
+            return lambda client: client.get(path)
+
+        def create_student(group):
+            def request(client):
+                n = next(self.emails)
+                return client.post(
+                    f"{API}/students/",
+                    {
+                        "email": f"bench{n}@bench.local",
+                        "password": "bench-password",
+                        "first_name": "Bench",
+                        "last_name": "Student",
+                        "phone_number": f"bench-{n}",
+                        "date_of_birth": "2005-01-01",
+                        "group_id": str(group.pk),
+                    },
+                    format="json",
+                )
+
+            return request
+
+        login = {"email": student.email, "password": self.password}
+        return {
+            "token obtain": (
+                "anonymous",
+                lambda client: client.post(f"{API}/token/", login),
+            ),
+            "students list (admin)": ("admin", get(f"{API}/students/")),
+            "students list (teacher)": ("teacher", get(f"{API}/students/")),
+            "students list (student)": ("student", get(f"{API}/students/")),
+            "students compact (admin)": ("admin", get(f"{API}/students/?view=compact")),
+            "student retrieve (admin)": (
+                "admin",
+                get(f"{API}/students/{any_student.pk}/"),
+            ),
+            "student retrieve (teacher)": (
+                "teacher",
+                get(f"{API}/students/{any_student.pk}/"),
+            ),
+            "student retrieve (self)": (
+                "student",
+                get(f"{API}/students/{student.pk}/"),
+            ),
+            "groups list (admin)": ("admin", get(f"{API}/groups/")),
+            "groups list (teacher)": ("teacher", get(f"{API}/groups/")),
+            "group retrieve (teacher)": (
+                "teacher",
+                get(f"{API}/groups/{own_group.pk}/"),
+            ),
+            "teachers list (admin)": ("admin", get(f"{API}/teachers/")),
+            "teacher retrieve (admin)": (
+                "admin",
+                get(f"{API}/teachers/{any_teacher.pk}/"),
+            ),
+            "student create (admin)": ("admin", create_student(own_group)),
+            "student create (teacher)": ("teacher", create_student(own_group)),
+        }
+
+    def _send(self, client, request):
+        # INFO: writes are rolled back so the dataset stays the same between runs
+        with transaction.atomic():
+            response = request(client)
+            transaction.set_rollback(True)
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{response.status_code} from {response.request['PATH_INFO']}: "
+                f"{getattr(response, 'data', '')}"
+            )
+        return response
+
+    def _run(self, client, request, requests, trace):
+        for _ in range(3):  # warm-up: caches, connections, imports
+            self._send(client, request)
+
+        timings, queries = [], []
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                self._send(client, request)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(
+                sum(
+                    1
+                    for query in ctx.captured_queries
+                    if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+                )
+            )
+
+        # INFO: separate pass, tracemalloc slows everything down
+        allocated = []
+        tracemalloc.start()
+        try:
+            for _ in range(trace):
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                self._send(client, request)
+                _, peak = tracemalloc.get_traced_memory()
+                allocated.append((peak - before) / 1024)
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "p50": round(percentile(timings, 50), 2),
+            "p95": round(percentile(timings, 95), 2),
+            "p99": round(percentile(timings, 99), 2),
+            "queries": max(queries),
+            "alloc_kib": round(statistics.median(allocated), 1) if allocated else 0,
+        }
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext, iscoroutinefunction
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+
+import config.urls
+
+from .bench_api import API, bench_users, obtain_token, percentile
+from .seed_data import SEED_PASSWORD
+
+
+def urlconf(async_reads):
+    """
+    A urlconf module with or without the async student / group read views.
+    """
+    module = types.ModuleType(f"bench_urls_{'async' if async_reads else 'sync'}")
+    sync_patterns = [
+        pattern
+        for pattern in config.urls.urlpatterns
+        if not iscoroutinefunction(getattr(pattern, "callback", None))
+    ]
+    module.urlpatterns = (
+        [*config.urls.async_read_urls(), *sync_patterns]
+        if async_reads
+        else sync_patterns
+    )
+    return module
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent GETs against one endpoint on three stacks: WSGI with a thread pool, "
+        "ASGI with the sync views, ASGI with the async read views (ASYNC_READS). "
+        "Reports requests/s and p50/p95/p99 per concurrency level. Run `manage.py seed_data` first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path", default=f"{API}/students/", help="GET path to request"
+        )
+        parser.add_argument(
+            "--role", choices=["admin", "teacher", "student"], default="teacher"
+        )
+        parser.add_argument(
+            "--concurrency",
+            default="1,8,32",
+            help="Comma separated in-flight request counts",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Per stack and concurrency"
+        )
+        parser.add_argument("--password", default=SEED_PASSWORD)
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options["concurrency"].split(",")]
+        except ValueError:
+            raise CommandError("--concurrency takes numbers, e.g. 1,8,32")
+
+        user = bench_users()[options["role"]]
+        headers = {"Authorization": f"Bearer {obtain_token(user, options['password'])}"}
+        path, requests = options["path"], options["requests"]
+
+        stacks = {
+            "wsgi + threads": (False, self._wsgi),
+            "asgi + sync views": (False, self._asgi),
+            "asgi + async views": (True, self._asgi),
+        }
+        self.stdout.write(
+            f"GET {path} as {options['role']}, {requests} requests per run\n"
+            f"{'stack':<20} {'conc':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for stack, (async_reads, run) in stacks.items():
+            # INFO: the test clients send Host: testserver
+            with override_settings(
+                ROOT_URLCONF=urlconf(async_reads),
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            ):
+                for level in levels:
+                    run(path, headers, min(3, requests), level)  # warm-up
+                    started = time.perf_counter()
+                    timings = run(path, headers, requests, level)
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"{stack:<20} {level:>5} {requests / elapsed:>8.0f} "
+                        f"{percentile(timings, 50):>8.2f} {percentile(timings, 95):>8.2f} "
+                        f"{percentile(timings, 99):>8.2f}"
+                    )
+
+    def _wsgi(self, path, headers, requests, concurrency):
+        local = threading.local()
+
+        def send(_):
+            if not hasattr(local, "client"):
+                local.client = Client(headers=headers)
+            started = time.perf_counter()
+            response = local.client.get(path)
+            return self._timed(response, started)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(send, range(requests)))
+
+    def _asgi(self, path, headers, requests, concurrency):
+        async def run():
+            client = AsyncClient()
+            in_flight = asyncio.Semaphore(concurrency)
+
+            async def send():
+                # INFO: like ASGIHandler, every request gets its own thread-sensitive context
+                async with in_flight, ThreadSensitiveContext():
+                    started = time.perf_counter()
+                    response = await client.get(path, headers=headers)
+                    return self._timed(response, started)
+
+            return await asyncio.gather(*(send() for _ in range(requests)))
+
+        return asyncio.run(run())
+
+    def _timed(self, response, started):
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            raise CommandError(f"{response.status_code}: {response.content[:200]!r}")
+        return elapsed
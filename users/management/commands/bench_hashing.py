@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+
+from users.hashers import _init_worker, hash_passwords, machine_hasher
+
+
+class Command(BaseCommand):
+    help = "Benchmark password hashing throughput against the number of pool workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=64, help="Passwords per run")
+        parser.add_argument(
+            "--workers",
+            default=",".join(str(n) for n in _default_workers()),
+            help="Comma separated pool sizes, e.g. 1,2,4,8",
+        )
+        parser.add_argument(
+            "--hasher",
+            default=None,
+            help='Algorithm name, "default" or empty for the machine profile',
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        hasher = options["hasher"] or machine_hasher()
+        passwords = [f"bench-password-{i}" for i in range(count)]
+
+        self.stdout.write(f"hasher={hasher} passwords={count}")
+        self.stdout.write(f"{'workers':>8} {'seconds':>9} {'hash/s':>9} {'speedup':>8}")
+
+        started = time.perf_counter()
+        for password in passwords:
+            make_password(password, hasher=hasher)
+        inline = time.perf_counter() - started
+        self._row("inline", inline, count, inline)
+
+        for workers in (int(n) for n in options["workers"].split(",")):
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            ) as pool:
+                # INFO: warm up so worker start-up is not part of the measurement
+                hash_passwords(passwords[:workers], hasher=hasher, pool=pool)
+
+                started = time.perf_counter()
+                hash_passwords(passwords, hasher=hasher, pool=pool)
+                elapsed = time.perf_counter() - started
+            self._row(str(workers), elapsed, count, inline)
+
+    def _row(self, label, elapsed, count, baseline):
+        self.stdout.write(
+            f"{label:>8} {elapsed:>9.3f} {count / elapsed:>9.1f} {baseline / elapsed:>7.2f}x"
+        )
+
+
+def _default_workers():
+    cpus = os.cpu_count() or 1
+    sizes = [1]
+    while sizes[-1] * 2 <= cpus:
+        sizes.append(sizes[-1] * 2)
+    return sizes
@@ -0,0 +1,169 @@
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from users.models import RoleType, User
+
+from .bench_api import API, obtain_token, percentile
+from .seed_data import SEED_EMAIL_DOMAIN, SEED_PASSWORD
+
+# INFO: name -> (throttles on, verification cache on)
+PROFILES = {
+    "unprotected": (False, False),
+    "throttled": (True, False),
+    "throttled + cache": (True, True),
+}
+
+
+def login(client, email, password):
+    return client.post(
+        f"{API}/token/", {"email": email, "password": password}, format="json"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Login throughput under an attacker-style burst: --attackers threads post wrong "
+        "passwords for one account while seeded users keep logging in, once per protection "
+        "profile (none, throttles, throttles + verification cache). Reports CPU per request, "
+        "attacker status codes and the legitimate logins' latency. Run `manage.py seed_data` first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--attempts", type=int, default=200, help="Wrong-password requests"
+        )
+        parser.add_argument("--attackers", type=int, default=4, help="Attacker threads")
+        parser.add_argument(
+            "--ips", type=int, default=1, help="Client IPs the attack is spread over"
+        )
+        parser.add_argument(
+            "--logins", type=int, default=40, help="Legitimate logins during the burst"
+        )
+        parser.add_argument(
+            "--users", type=int, default=8, help="Accounts the logins rotate through"
+        )
+        parser.add_argument(
+            "--cache-timeout",
+            type=int,
+            default=60,
+            help="LOGIN_VERIFICATION_CACHE_TIMEOUT of the cached profile",
+        )
+        parser.add_argument("--password", default=SEED_PASSWORD)
+
+    def handle(self, *args, **options):
+        for option in ("ips", "users"):
+            if not 1 <= options[option] <= 254:
+                raise CommandError(f"--{option} must be between 1 and 254")
+        accounts = list(
+            User.objects.filter(
+                role=RoleType.STUDENT,
+                is_active=True,
+                email__endswith=f"@{SEED_EMAIL_DOMAIN}",
+            ).order_by("email")[: options["users"] + 1]
+        )
+        if len(accounts) < 2:
+            raise CommandError(
+                "Not enough seeded students, run `manage.py seed_data` first."
+            )
+        victim, users = accounts[0], accounts[1:]
+        # INFO: one warning per 401 / 429 would drown the table
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        obtain_token(users[0], options["password"])
+
+        self.stdout.write(
+            f"{options['attempts']} wrong passwords for {victim.email} from "
+            f"{options['ips']} IP(s) on {options['attackers']} threads, "
+            f"{options['logins']} logins by {len(users)} users"
+        )
+        self.stdout.write(
+            f"{'profile':<20} {'seconds':>8} {'cpu ms/req':>11} {'401':>6} {'429':>6} "
+            f"{'logins ok':>10} {'p50 ms':>8} {'p95 ms':>8}"
+        )
+        for name, (throttled, cached) in PROFILES.items():
+            rates = settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {})
+            with override_settings(
+                REST_FRAMEWORK={
+                    **settings.REST_FRAMEWORK,
+                    "DEFAULT_THROTTLE_RATES": rates if throttled else {},
+                },
+                LOGIN_VERIFICATION_CACHE_TIMEOUT=(
+                    options["cache_timeout"] if cached else 0
+                ),
+            ):
+                caches["local"].clear()
+                result = self._run(victim, users, options)
+
+            requests = options["attempts"] + options["logins"]
+            self.stdout.write(
+                f"{name:<20} {result['seconds']:>8.2f} "
+                f"{result['cpu'] * 1000 / requests:>11.2f} "
+                f"{result['attacks'][401]:>6} {result['attacks'][429]:>6} "
+                f"{result['ok']:>5}/{options['logins']:<4} "
+                f"{percentile(result['latencies'], 50):>8.1f} "
+                f"{percentile(result['latencies'], 95):>8.1f}"
+            )
+
+    def _run(self, victim, users, options):
+        cpu = time.process_time()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["attackers"] + 1) as pool:
+            attacks = [
+                pool.submit(self._attack, victim, n, options)
+                for n in range(options["attackers"])
+            ]
+            logins = pool.submit(self._login, users, options)
+            statuses = Counter()
+            for attack in attacks:
+                statuses.update(attack.result())
+            latencies, ok = logins.result()
+        return {
+            "seconds": time.perf_counter() - started,
+            # INFO: all threads of the process, hashing included
+            "cpu": time.process_time() - cpu,
+            "attacks": statuses,
+            "latencies": latencies,
+            "ok": ok,
+        }
+
+    def _attack(self, victim, n, options):
+        clients = [
+            APIClient(HTTP_HOST="localhost", REMOTE_ADDR=f"203.0.113.{ip + 1}")
+            for ip in range(options["ips"])
+        ]
+        statuses = Counter()
+        try:
+            for i in range(n, options["attempts"], options["attackers"]):
+                response = login(
+                    clients[i % len(clients)], victim.email, f"wrong-password-{i}"
+                )
+                statuses[response.status_code] += 1
+        finally:
+            connection.close()
+        return statuses
+
+    def _login(self, users, options):
+        # INFO: every user logs in from its own IP, as separate clients would
+        clients = [
+            (user, APIClient(HTTP_HOST="localhost", REMOTE_ADDR=f"198.51.100.{i + 1}"))
+            for i, user in enumerate(users)
+        ]
+        latencies, ok = [], 0
+        try:
+            for i in range(options["logins"]):
+                user, client = clients[i % len(clients)]
+                started = time.perf_counter()
+                response = login(client, user.email, options["password"])
+                latencies.append((time.perf_counter() - started) * 1000)
+                ok += response.status_code == 200
+        finally:
+            connection.close()
+        return latencies, ok
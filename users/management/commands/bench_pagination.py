@@ -0,0 +1,94 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from users.models import Group, Student, Teacher
+from users.pagination import KeysetPagination
+
+QUERYSETS = {
+    "students": lambda: Student.objects.select_related(
+        "user", "group", "group__teacher", "group__teacher__user"
+    ),
+    "teachers": lambda: Teacher.objects.select_related("user"),
+    "groups": lambda: Group.objects.select_related("teacher", "teacher__user"),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare page 1 with a deep page under page-number and keyset pagination."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=QUERYSETS, default="students")
+        parser.add_argument("--page", type=int, default=5000, help="Deep page number")
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        queryset = QUERYSETS[options["model"]]()
+        size = options["page_size"]
+        total = queryset.count()
+        if total == 0:
+            raise CommandError("No rows to paginate, seed the database first.")
+
+        last_page = max(1, (total + size - 1) // size)
+        deep = min(options["page"], last_page)
+        if deep < options["page"]:
+            self.stdout.write(f"only {total} rows: using page {deep} instead")
+
+        self.stdout.write(f"{options['model']}: {total} rows, page size {size}")
+        self.stdout.write(
+            f"{'scheme':>8} {'page':>6} {'median ms':>10} {'p95 ms':>8} {'queries':>8}"
+        )
+
+        for page in (1, deep):
+            self._row(
+                "page", page, options["repeat"], self._page_number(queryset, page, size)
+            )
+            self._row(
+                "keyset", page, options["repeat"], self._keyset(queryset, page, size)
+            )
+
+    def _page_number(self, queryset, page, size):
+        paginator = PageNumberPagination()
+        paginator.page_size = size
+        request = _request({"page": page})
+        # INFO: PageNumberPagination needs a stable order, same one keyset uses
+        ordered = queryset.order_by("created_at", "pk")
+        return lambda: paginator.paginate_queryset(ordered, request)
+
+    def _keyset(self, queryset, page, size):
+        paginator = KeysetPagination()
+        params = {"page_size": size}
+        if page > 1:
+            # INFO: the cursor a client would get from page - 1 (not timed)
+            boundary = queryset.order_by("created_at", "pk")[(page - 1) * size - 1]
+            params["cursor"] = paginator.encode_cursor(boundary)
+        request = _request(params)
+        return lambda: paginator.paginate_queryset(queryset, request)
+
+    def _row(self, scheme, page, repeat, run):
+        timings = []
+        queries = 0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = len(ctx.captured_queries)
+
+        p95 = (
+            statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        )
+        self.stdout.write(
+            f"{scheme:>8} {page:>6} {statistics.median(timings):>10.2f} {p95:>8.2f} {queries:>8}"
+        )
+
+
+def _request(params):
+    return Request(APIRequestFactory().get("/", params, HTTP_HOST="localhost"))
@@ -0,0 +1,91 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from users.models import Group, Student, Teacher
+from users.projections import get_projection
+from users.renderers import FastJSONRenderer, orjson
+from users.serializers import GroupSerializer, StudentSerializer, TeacherSerializer
+
+SERIALIZERS = {
+    "students": (
+        StudentSerializer,
+        lambda: Student.objects.select_related("user", "group__teacher__user"),
+    ),
+    "teachers": (TeacherSerializer, lambda: Teacher.objects.select_related("user")),
+    "groups": (GroupSerializer, lambda: Group.objects.select_related("teacher__user")),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rows/s of the serializer path (model instances + serializer + JSONRenderer) against "
+        "the fast read path (values_list() + projection mapper + FastJSONRenderer), "
+        "fetch, map and render timed separately. Run `manage.py seed_data` first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=SERIALIZERS, default="students")
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        serializer_class, queryset = SERIALIZERS[options["model"]]
+        queryset = queryset().order_by("pk")[: options["rows"]]
+        projection = get_projection(serializer_class)
+        if projection is None:
+            raise CommandError(f"{serializer_class.__name__} has no projection")
+
+        rows = len(queryset)
+        if rows == 0:
+            raise CommandError("No rows to serialize, seed the database first.")
+
+        slow = self._measure(
+            options["repeat"],
+            lambda: list(queryset.all()),
+            lambda objs: serializer_class(objs, many=True).data,
+            JSONRenderer().render,
+        )
+        fast = self._measure(
+            options["repeat"],
+            lambda: list(projection.values(queryset.all())),
+            lambda values: [projection.map_row(row) for row in values],
+            FastJSONRenderer().render,
+        )
+        if slow.pop("body") != fast.pop("body"):
+            raise CommandError("The two paths rendered different bytes")
+
+        self.stdout.write(
+            f"{options['model']}: {rows} rows, median of {options['repeat']} runs, "
+            f"renderer: {'orjson' if orjson else 'json (orjson not installed)'}"
+        )
+        self.stdout.write(
+            f"{'path':>10} {'fetch ms':>9} {'map ms':>9} {'render ms':>10} "
+            f"{'total ms':>9} {'rows/s':>10}"
+        )
+        for name, result in (("serializer", slow), ("projection", fast)):
+            total = sum(result.values())
+            self.stdout.write(
+                f"{name:>10} {result['fetch']:>9.2f} {result['map']:>9.2f} "
+                f"{result['render']:>10.2f} {total:>9.2f} {rows / total * 1000:>10.0f}"
+            )
+
+    def _measure(self, repeat, fetch, to_data, render):
+        timings = {"fetch": [], "map": [], "render": []}
+        for _ in range(repeat):
+            started = time.perf_counter()
+            values = fetch()
+            fetched = time.perf_counter()
+            data = to_data(values)
+            mapped = time.perf_counter()
+            body = render(data)
+            rendered = time.perf_counter()
+            timings["fetch"].append((fetched - started) * 1000)
+            timings["map"].append((mapped - fetched) * 1000)
+            timings["render"].append((rendered - mapped) * 1000)
+
+        result = {key: statistics.median(samples) for key, samples in timings.items()}
+        result["body"] = body
+        return result
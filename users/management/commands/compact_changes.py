@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from users.models import ChangeAction, ChangeEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact the change feed: keep only the latest event per object, and drop "
+        "DELETED events (tombstones) older than --tombstone-days. Consumers further "
+        "behind than that must resync from a full read."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tombstone-days", type=int, default=30)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only count what would be deleted"
+        )
+
+    def handle(self, *args, **options):
+        superseded = ChangeEvent.objects.filter(
+            Exists(
+                ChangeEvent.objects.filter(
+                    entity=OuterRef("entity"),
+                    entity_id=OuterRef("entity_id"),
+                    pk__gt=OuterRef("pk"),
+                )
+            )
+        )
+        tombstones = ChangeEvent.objects.filter(
+            action=ChangeAction.DELETED,
+            created_at__lt=timezone.now() - timedelta(days=options["tombstone_days"]),
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"would delete {superseded.count()} superseded events "
+                f"and {tombstones.count()} old tombstones"
+            )
+            return
+
+        # INFO: superseded first, so a tombstone is only dropped once it is the object's last event
+        superseded_count = superseded.delete()[0]
+        tombstone_count = tombstones.delete()[0]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {superseded_count} superseded events "
+                f"and {tombstone_count} old tombstones, "
+                f"{ChangeEvent.objects.count()} left"
+            )
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete revoked refresh tokens that have expired: signature checks already "
+        "refuse them, so the table only has to hold the still-valid ones. "
+        "Run it periodically (cron), e.g. hourly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only count what would be deleted"
+        )
+
+    def handle(self, *args, **options):
+        expired = RevokedToken.objects.filter(expires_at__lte=timezone.now())
+
+        if options["dry_run"]:
+            self.stdout.write(f"would delete {expired.count()} expired revoked tokens")
+            return
+
+        deleted = expired.delete()[0]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted} expired revoked tokens, "
+                f"{RevokedToken.objects.count()} left"
+            )
+        )
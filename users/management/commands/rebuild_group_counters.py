@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from users.models import STUDENT_COUNTER_FIELDS, Group, Student
+
+
+class Command(BaseCommand):
+    help = "Recompute Group.students_* counters from the Student table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report groups whose counters are off, do not write",
+        )
+
+    def handle(self, *args, **options):
+        fields = list(STUDENT_COUNTER_FIELDS.values())
+
+        with transaction.atomic():
+            groups = list(Group.objects.select_for_update().only("id", "name", *fields))
+
+            actual = {}
+            for row in Student.objects.values("group_id", "status").annotate(
+                n=Count("pk")
+            ):
+                field = STUDENT_COUNTER_FIELDS[row["status"]]
+                actual.setdefault(row["group_id"], {})[field] = row["n"]
+
+            stale = []
+            for group in groups:
+                counts = actual.get(group.pk, {})
+                diff = {
+                    field: (getattr(group, field), counts.get(field, 0))
+                    for field in fields
+                    if getattr(group, field) != counts.get(field, 0)
+                }
+                if diff:
+                    stale.append(group)
+                    changes = ", ".join(
+                        f"{f}: {old} -> {new}" for f, (old, new) in diff.items()
+                    )
+                    self.stdout.write(f"{group.name}: {changes}")
+                    for field, (_, new) in diff.items():
+                        setattr(group, field, new)
+
+            if options["check"]:
+                if stale:
+                    raise CommandError(
+                        f"{len(stale)} of {len(groups)} groups out of sync"
+                    )
+                self.stdout.write(self.style.SUCCESS("Counters are in sync"))
+                return
+
+            Group.objects.bulk_update(stale, fields, batch_size=500)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt counters, {len(stale)} of {len(groups)} groups fixed"
+            )
+        )
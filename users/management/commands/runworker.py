@@ -0,0 +1,77 @@
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from users.jobs import claim_job, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (bulk enrollment, bulk moves, group completion) "
+        "on a thread pool. Any number of workers can run against the same database. "
+        "SIGINT / SIGTERM: finish the running jobs, then exit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=2)
+        parser.add_argument(
+            "--poll", type=float, default=1.0, help="Seconds between empty-queue polls"
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help="Seconds without a heartbeat after which a RUNNING job is considered abandoned",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit when the queue is empty"
+        )
+
+    def handle(self, *args, **options):
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        stop = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: stop.set())
+
+        self._requeue(options["stale_after"])
+        self.stdout.write(f"worker {name}: {options['threads']} threads")
+        with ThreadPoolExecutor(options["threads"]) as pool:
+            loops = [
+                pool.submit(self._loop, f"{name}:{i}", stop, options)
+                for i in range(options["threads"])
+            ]
+            # INFO: the main thread only watches for jobs abandoned by dead workers
+            while wait(loops, timeout=min(options["stale_after"], 60)).not_done:
+                if not stop.is_set():
+                    self._requeue(options["stale_after"])
+        for loop in loops:
+            loop.result()  # INFO: re-raises what a loop died of
+
+    def _loop(self, worker, stop, options):
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                job = claim_job(worker)
+                if job is None:
+                    if options["once"]:
+                        return
+                    stop.wait(options["poll"])
+                    continue
+
+                # INFO: a few beats per stale timeout, a slow one does not get the job requeued
+                job = run_job(job, heartbeat_interval=options["stale_after"] / 4)
+                self.stdout.write(f"{worker}: {job.kind} {job.pk} {job.status}")
+        finally:
+            connection.close()
+
+    def _requeue(self, stale_after):
+        requeued, failed = requeue_stale_jobs(stale_after)
+        if requeued or failed:
+            self.stdout.write(f"stale jobs: {requeued} requeued, {failed} failed")
+        close_old_connections()
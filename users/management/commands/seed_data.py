@@ -0,0 +1,183 @@
+import datetime
+import random
+import secrets
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import (
+    Group,
+    GroupStatus,
+    RoleType,
+    Student,
+    StudentStatus,
+    Teacher,
+    User,
+    group_counters_enabled,
+)
+
+SEED_EMAIL_DOMAIN = "seed.local"
+SEED_PASSWORD = "seed-password"
+
+FIRST_NAMES = [
+    "Aziz", "Bekzod", "Dilnoza", "Elena", "Farrukh", "Gulnora", "Hasan", "Iroda",
+    "Jasur", "Kamila", "Laylo", "Madina", "Nodir", "Olga", "Rustam", "Sardor",
+    "Shahlo", "Timur", "Umid", "Zarina", "Anna", "David", "Maria", "Omar",
+]  # fmt: skip
+LAST_NAMES = [
+    "Abdullaev", "Karimova", "Rakhimov", "Yusupova", "Tursunov", "Ismoilova",
+    "Nazarov", "Saidova", "Qodirov", "Ergasheva", "Petrov", "Kim", "Aliev",
+    "Xolmatova", "Usmonov", "Mirzaeva",
+]  # fmt: skip
+SUBJECTS = [
+    "Mathematics", "Physics", "Chemistry", "Biology", "English", "History",
+    "Computer Science", "Economics",
+]  # fmt: skip
+
+# INFO: (value, weight) distributions
+GROUP_STATUSES = [
+    (GroupStatus.STUDYING, 70),
+    (GroupStatus.COMPLETED, 25),
+    (GroupStatus.TERMINATED, 5),
+]
+STUDENT_STATUSES = {
+    GroupStatus.STUDYING: [
+        (StudentStatus.STUDYING, 90),
+        (StudentStatus.EXPELLED, 8),
+        (StudentStatus.GRADUATED, 2),
+    ],
+    GroupStatus.COMPLETED: [
+        (StudentStatus.GRADUATED, 85),
+        (StudentStatus.EXPELLED, 15),
+    ],
+    GroupStatus.TERMINATED: [
+        (StudentStatus.EXPELLED, 60),
+        (StudentStatus.STUDYING, 40),
+    ],
+}
+
+
+def pick(rng, distribution):
+    values, weights = zip(*distribution)
+    return rng.choices(values, weights)[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed teachers, groups and students with bulk inserts. "
+        f"Every seeded user (plus one admin) gets the password {SEED_PASSWORD!r}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teachers", type=int, default=50)
+        parser.add_argument("--groups", type=int, default=200)
+        parser.add_argument("--students", type=int, default=5000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Random seed, for repeatable data"
+        )
+        parser.add_argument("--password", default=SEED_PASSWORD)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        # INFO: a per-run tag keeps emails / phones / group names unique across runs
+        tag = secrets.token_hex(3)
+        batch_size = options["batch_size"]
+        # INFO: hashed once, every seeded user shares it
+        password = make_password(options["password"])
+        today = timezone.localdate()
+        serial = iter(range(10**7))
+
+        def new_user(role, **extra):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            n = next(serial)
+            return User(
+                email=f"{first}.{last}.{tag}{n}@{SEED_EMAIL_DOMAIN}".lower(),
+                phone_number=f"+998-{tag}-{n:07d}",
+                first_name=first,
+                last_name=last,
+                role=role,
+                password=password,
+                **extra,
+            )
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            admin = new_user(RoleType.ADMIN, is_staff=True, is_superuser=True)
+            admin.save()
+
+            teacher_users = User.objects.bulk_create(
+                [
+                    new_user(RoleType.TEACHER, is_staff=True)
+                    for _ in range(options["teachers"])
+                ],
+                batch_size=batch_size,
+            )
+            teachers = Teacher.objects.bulk_create(
+                [
+                    Teacher(
+                        user=user,
+                        specialization=rng.choice(SUBJECTS),
+                        hired_date=today
+                        - datetime.timedelta(days=rng.randint(0, 3650)),
+                    )
+                    for user in teacher_users
+                ],
+                batch_size=batch_size,
+            )
+
+            # INFO: a few teachers carry many groups (long tail), group sizes vary around ~25
+            teacher_weights = [1 / (rank + 1) for rank in range(len(teachers))]
+            groups = []
+            for i in range(options["groups"] if teachers else 0):
+                teacher = rng.choices(teachers, teacher_weights)[0]
+                subject = (
+                    teacher.specialization
+                    if rng.random() < 0.8
+                    else rng.choice(SUBJECTS)
+                )
+                groups.append(
+                    Group(
+                        name=f"{subject} {tag}-{i}",
+                        subject=subject,
+                        status=pick(rng, GROUP_STATUSES),
+                        teacher=teacher,
+                    )
+                )
+            Group.objects.bulk_create(groups, batch_size=batch_size)
+            group_weights = [rng.lognormvariate(3, 0.5) for _ in groups]
+
+            students = []
+            for _ in range(options["students"] if groups else 0):
+                group = rng.choices(groups, group_weights)[0]
+                students.append(
+                    Student(
+                        user=new_user(RoleType.STUDENT),
+                        group=group,
+                        status=pick(rng, STUDENT_STATUSES[group.status]),
+                        date_of_birth=today
+                        - datetime.timedelta(days=rng.randint(15 * 365, 30 * 365)),
+                        enrollment_date=today
+                        - datetime.timedelta(days=rng.randint(0, 3 * 365)),
+                    )
+                )
+            User.objects.bulk_create(
+                [student.user for student in students], batch_size=batch_size
+            )
+            Student.objects.bulk_create(students, batch_size=batch_size)
+
+            if group_counters_enabled():
+                Group.adjust_counters(Counter((s.group_id, s.status) for s in students))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(teachers)} teachers, {len(groups)} groups and "
+                f"{len(students)} students in {elapsed:.1f} s (tag {tag})"
+            )
+        )
+        self.stdout.write(f"admin: {admin.email} / {options['password']}")
@@ -0,0 +1,210 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from rest_framework import serializers
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class RequestSample:
+    """
+    What a sampled request spent in the DB and in serializers, filled while it runs.
+    """
+
+    __slots__ = ("db_seconds", "queries", "serializer_seconds")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.serializer_seconds = 0.0
+
+
+class Counter:
+    def __init__(self, name, help_text, labels):
+        self.name, self.help_text, self.labels = name, help_text, labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{_labels(self.labels, label_values)} {value}"
+
+
+class Histogram:
+    """
+    Prometheus histogram, per label set: a count per bucket (not cumulative until rendered),
+    the sum and the count of the observed values.
+    """
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name, self.help_text, self.labels = name, help_text, labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # INFO: one slot per bucket + the +Inf bucket, then sum and count
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1)
+                series += [0.0, 0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = sorted((key, list(value)) for key, value in self._series.items())
+        for label_values, values in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), values):
+                cumulative += count
+                labels = _labels((*self.labels, "le"), (*label_values, bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {values[-2]:.6g}"
+            yield f"{self.name}_count{labels} {values[-1]}"
+
+
+def _labels(names, values):
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+ROUTE_LABELS = ("route", "method")
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests by route, method and status.",
+    (*ROUTE_LABELS, "status"),
+)
+DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Wall time of the request.",
+    ROUTE_LABELS,
+    DURATION_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Response body size (streamed responses excluded).",
+    ROUTE_LABELS,
+    SIZE_BUCKETS,
+)
+# INFO: the three below only see sampled requests (METRICS["SAMPLE_RATE"])
+DB_DURATION = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL, sampled requests.",
+    ROUTE_LABELS,
+    DURATION_BUCKETS,
+)
+QUERIES = Histogram(
+    "http_request_queries",
+    "SQL queries per request, sampled requests.",
+    ROUTE_LABELS,
+    QUERY_BUCKETS,
+)
+SERIALIZER_DURATION = Histogram(
+    "http_request_serializer_seconds",
+    "Time spent in top-level serializers' to_representation, sampled requests.",
+    ROUTE_LABELS,
+    DURATION_BUCKETS,
+)
+
+REGISTRY = (
+    REQUESTS,
+    DURATION,
+    RESPONSE_SIZE,
+    DB_DURATION,
+    QUERIES,
+    SERIALIZER_DURATION,
+)
+
+
+def record(route, method, status, seconds, size, sample):
+    REQUESTS.inc(route, method, status)
+    DURATION.observe(seconds, route, method)
+    if size is not None:
+        RESPONSE_SIZE.observe(size, route, method)
+    if sample is not None:
+        DB_DURATION.observe(sample.db_seconds, route, method)
+        QUERIES.observe(sample.queries, route, method)
+        SERIALIZER_DURATION.observe(sample.serializer_seconds, route, method)
+
+
+def render_metrics(pool_stats=None):
+    """
+    The registry in the Prometheus text format, plus `db_pool_*` gauges from the psycopg pool.
+    """
+    lines = [line for metric in REGISTRY for line in metric.render()]
+    for key, value in sorted((pool_stats or {}).items()):
+        lines += [f"# TYPE db_pool_{key} gauge", f"db_pool_{key} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def db_timer(sample):
+    """
+    `connection.execute_wrapper` that adds query time and count to `sample`.
+    """
+
+    def timer(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            sample.db_seconds += time.perf_counter() - started
+            sample.queries += 1
+
+    return timer
+
+
+@contextmanager
+def serializer_timer(request):
+    sample = getattr(request, "metrics_sample", None)
+    if sample is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample.serializer_seconds += time.perf_counter() - started
+
+
+class TimedSerializerMixin(serializers.BaseSerializer):
+    """
+    Adds the top-level to_representation() time to the request's metrics sample.
+    Nested / child serializers are part of their parent's time.
+    """
+
+    def to_representation(self, instance):
+        if self.parent is not None:
+            return super().to_representation(instance)
+
+        with serializer_timer(self.context.get("request")):
+            return super().to_representation(instance)
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    `Meta.list_serializer_class` of the timed serializers, for `many=True`.
+    """
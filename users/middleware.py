@@ -0,0 +1,192 @@
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from .metrics import RequestSample, db_timer, record
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@asynccontextmanager
+async def aexecute_wrapper(wrapper):
+    """
+    `connection.execute_wrapper()` for async requests.
+    The ORM of an async request runs in the request's thread-sensitive executor thread,
+    with that thread's connection, so the wrapper is installed from there.
+    """
+    context = await sync_to_async(lambda: connection.execute_wrapper(wrapper))()
+    await sync_to_async(context.__enter__)()
+    try:
+        yield
+    finally:
+        await sync_to_async(context.__exit__)(None, None, None)
+
+
+def get_query_budget(request):
+    """
+    Returns `(view_name, action, budget)` for the DRF viewset action that served `request`.
+    Viewsets declare budgets as `query_budget = {"list": 3, "retrieve": 3, ...}`.
+    """
+    match = getattr(request, "resolver_match", None)
+    view = getattr(getattr(match, "func", None), "cls", None)
+    actions = getattr(getattr(match, "func", None), "actions", None)
+    if view is None or not actions:
+        return None, None, None
+
+    method = request.method.lower()
+    action = actions.get(method) or (actions.get("get") if method == "head" else None)
+    return view.__name__, action, getattr(view, "query_budget", {}).get(action)
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts SQL queries per request and compares them with the viewset's `query_budget`.
+    Settings (QUERY_BUDGET): ENABLED - count at all, RAISE - raise instead of logging a warning.
+    Works in both sync and async (ASGI) middleware chains.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, "QUERY_BUDGET", {})
+        self.enabled = config.get("ENABLED", settings.DEBUG)
+        self.raise_on_exceed = config.get("RAISE", False)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        queries = []
+        with connection.execute_wrapper(_counter(queries)):
+            response = self.get_response(request)
+
+        self.check_budget(request, queries)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        queries = []
+        async with aexecute_wrapper(_counter(queries)):
+            response = await self.get_response(request)
+
+        self.check_budget(request, queries)
+        return response
+
+    def check_budget(self, request, queries):
+        view, action, budget = get_query_budget(request)
+        if budget is not None and len(queries) > budget:
+            message = (
+                f"{view}.{action} ran {len(queries)} queries, budget is {budget} "
+                f"({request.method} {request.path})"
+            )
+            if self.raise_on_exceed:
+                raise QueryBudgetExceeded(message + "\n" + "\n".join(queries))
+            logger.warning(message)
+
+
+# INFO: transaction bookkeeping, not queries. SQLite's `BEGIN IMMEDIATE` goes through the
+# cursor where PostgreSQL's BEGIN does not, savepoints come from nested atomic() blocks and
+# the change feed lock (users.outbox) is only taken on PostgreSQL: budgets are the same on both
+NOT_COUNTED = (
+    "BEGIN",
+    "SAVEPOINT",
+    "RELEASE SAVEPOINT",
+    "ROLLBACK TO",
+    "SELECT pg_advisory_xact_lock",
+)
+
+
+def counts_toward_budget(sql):
+    return not sql.startswith(NOT_COUNTED)
+
+
+def _counter(queries):
+    def counter(execute, sql, params, many, context):
+        if counts_toward_budget(sql):
+            queries.append(sql)
+        return execute(sql, params, many, context)
+
+    return counter
+
+
+class MetricsMiddleware:
+    """
+    Per-route request metrics (users.metrics), served at /api/v1/metrics/.
+    - every request: count by status, wall time, response size
+    - sampled requests (METRICS SAMPLE_RATE): DB time, query count, serializer time
+    Settings (METRICS): ENABLED, SAMPLE_RATE (0..1).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, "METRICS", {})
+        self.enabled = config.get("ENABLED", True)
+        self.sample_rate = config.get("SAMPLE_RATE", 0.1)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        sample = self.start_sample(request)
+        if sample is None:
+            response = self.get_response(request)
+        else:
+            with connection.execute_wrapper(db_timer(sample)):
+                response = self.get_response(request)
+
+        self.record(request, response, time.perf_counter() - started, sample)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        sample = self.start_sample(request)
+        if sample is None:
+            response = await self.get_response(request)
+        else:
+            async with aexecute_wrapper(db_timer(sample)):
+                response = await self.get_response(request)
+
+        self.record(request, response, time.perf_counter() - started, sample)
+        return response
+
+    def start_sample(self, request):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        # INFO: read by TimedSerializerMixin through the DRF request
+        request.metrics_sample = RequestSample()
+        return request.metrics_sample
+
+    def record(self, request, response, seconds, sample):
+        match = getattr(request, "resolver_match", None)
+        # INFO: route names keep the label set small, raw paths would not (ids)
+        route = (match.url_name or match.route) if match else "unmatched"
+        size = None if response.streaming else len(response.content)
+        record(route, request.method, response.status_code, seconds, size, sample)
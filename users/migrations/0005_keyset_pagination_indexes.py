@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_alter_student_enrollment_date_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="group",
+            index=models.Index(
+                fields=["created_at", "id"], name="group_created_pk_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["created_at", "user"], name="student_created_pk_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="teacher",
+            index=models.Index(
+                fields=["created_at", "user"], name="teacher_created_pk_idx"
+            ),
+        ),
+    ]
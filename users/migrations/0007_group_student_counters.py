@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_user_token_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="group",
+            name="students_expelled",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="group",
+            name="students_graduated",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="group",
+            name="students_studying",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
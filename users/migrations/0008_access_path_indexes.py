@@ -0,0 +1,75 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:41
+
+import django.db.models.deletion
+import users.uuids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0007_group_student_counters"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="group",
+            name="id",
+            field=models.UUIDField(
+                default=users.uuids.new_uuid,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        # INFO: composite indexes first, the single-column FK indexes they replace are dropped after
+        migrations.AddIndex(
+            model_name="group",
+            index=models.Index(
+                fields=["teacher", "status"], name="group_teacher_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["group", "status"], name="student_group_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["role", "created_at"], name="user_role_created_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="group",
+            name="teacher",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="groups",
+                to="users.teacher",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="group",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="students",
+                to="users.group",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=users.uuids.new_uuid,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
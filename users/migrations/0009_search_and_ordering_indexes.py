@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:44
+
+from django.db import migrations, models
+
+# INFO: prefix search (`istartswith`) indexes, not expressible as portable model indexes:
+# PostgreSQL matches UPPER(col) LIKE 'TERM%' with a pg_trgm GIN index on UPPER(col),
+# SQLite's LIKE is case-insensitive and can range-scan an index with COLLATE NOCASE.
+SEARCH_INDEXES = [
+    ("users_user", "email", "user_email_search_idx"),
+    ("users_user", "first_name", "user_first_name_search_idx"),
+    ("users_user", "last_name", "user_last_name_search_idx"),
+    ("users_group", "name", "group_name_search_idx"),
+    ("users_group", "subject", "group_subject_search_idx"),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        template = "CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (UPPER({column}) gin_trgm_ops)"
+    elif vendor == "sqlite":
+        template = (
+            "CREATE INDEX IF NOT EXISTS {name} ON {table} ({column} COLLATE NOCASE)"
+        )
+    else:
+        return
+
+    for table, column, name in SEARCH_INDEXES:
+        schema_editor.execute(template.format(name=name, table=table, column=column))
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor not in ("postgresql", "sqlite"):
+        return
+    for _, _, name in SEARCH_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["enrollment_date", "user"], name="student_enrolled_pk_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="teacher",
+            index=models.Index(
+                fields=["hired_date", "user"], name="teacher_hired_pk_idx"
+            ),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0009_search_and_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("entity", models.CharField(max_length=20)),
+                ("entity_id", models.UUIDField()),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("CREATED", "Created"),
+                            ("UPDATED", "Updated"),
+                            ("DELETED", "Deleted"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["entity", "entity_id", "id"],
+                        name="change_entity_seq_idx",
+                    )
+                ],
+            },
+        ),
+    ]
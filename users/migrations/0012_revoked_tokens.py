@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0011_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RevokedToken",
+            fields=[
+                (
+                    "jti",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("expires_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["expires_at"], name="revoked_token_expiry_idx")
+                ],
+            },
+        ),
+    ]
@@ -1,8 +1,14 @@
+from collections import Counter
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models.functions import Greatest
 from django.utils import timezone
-import uuid
+
+from .uuids import new_uuid
 
 
 class CustomUserManager(UserManager):
@@ -49,10 +55,14 @@ class GroupStatus(models.TextChoices):
     TERMINATED = "TERMINATED", "Terminated"
 
 
+# INFO: what a token is allowed to do follows from these, see User.save()
+PRIVILEGE_FIELDS = ("role", "is_staff", "is_superuser")
+
+
 class User(AbstractUser):
     # INFO: AbstractUser already has: username, password, first_name, last_name, email etc
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_uuid, editable=False)
     username = None  # INFO: not to use in auth & not to create column in db table
     first_name = models.CharField(max_length=50, null=False, blank=False)
     last_name = models.CharField(max_length=50)
@@ -61,6 +71,9 @@ class User(AbstractUser):
     role = models.CharField(
         max_length=20, choices=RoleType.choices, default=RoleType.STUDENT
     )
+    # INFO: bumped on password / privilege change and deactivation, tokens carrying an older
+    # value are rejected
+    token_version = models.PositiveIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -70,6 +83,56 @@ class User(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # INFO: users of one role, newest / oldest first
+            models.Index(fields=["role", "created_at"], name="user_role_created_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # INFO: the privileges and activity the row had in the DB, see save()
+        instance._loaded_access = instance.access()
+        return instance
+
+    def access(self):
+        """
+        The loaded (not deferred) values of PRIVILEGE_FIELDS and `is_active`.
+        """
+        return {
+            name: self.__dict__[name]
+            for name in (*PRIVILEGE_FIELDS, "is_active")
+            if name in self.__dict__
+        }
+
+    def access_revoked(self):
+        """
+        Whether saving ends what issued tokens may do: a privilege changed or the user was
+        deactivated since loading. Reactivating revokes nothing, deactivating already did.
+        """
+        current = self.access()
+        changed = {
+            name
+            for name, value in getattr(self, "_loaded_access", {}).items()
+            if current.get(name, value) != value
+        }
+        return bool(changed & {*PRIVILEGE_FIELDS}) or (
+            "is_active" in changed and not current["is_active"]
+        )
+
+    def save(self, *args, **kwargs):
+        # INFO: `_password` is only set by set_password(), not by hasher upgrades on login
+        if not self._state.adding and (
+            self._password is not None or self.access_revoked()
+        ):
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_access = self.access()
+
     def __str__(self):
         return f"{self.email} ({self.role})"
 
@@ -83,22 +146,63 @@ class Student(models.Model):
         choices=StudentStatus.choices,
         default=StudentStatus.STUDYING,
     )
+    # INFO: no single-column index, student_group_status_idx starts with group_id
     group = models.ForeignKey(
-        "Group", on_delete=models.PROTECT, related_name="students"
+        "Group", on_delete=models.PROTECT, related_name="students", db_index=False
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def clean(self):
-        if self.user.role != RoleType.STUDENT:
-            raise ValidationError("Linked user must have role=STUDENT")
+    class Meta:
+        indexes = [
+            # INFO: keyset pagination order, see users.pagination.KeysetPagination
+            models.Index(fields=["created_at", "user"], name="student_created_pk_idx"),
+            # INFO: teacher scope (join on group_id), group stats / dashboards by status
+            models.Index(fields=["group", "status"], name="student_group_status_idx"),
+            # INFO: ?ordering=enrollment_date, see users.filters.IndexedOrderingFilter
+            models.Index(
+                fields=["enrollment_date", "user"], name="student_enrolled_pk_idx"
+            ),
+        ]
 
-        if Teacher.objects.filter(user=self.user).exists():
-            raise ValidationError("A user cannot be both a Teacher and a Student")
+    def clean(self):
+        check_profile_user(self, RoleType.STUDENT, Teacher)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # INFO: the (group, status) the row had in the DB, for the group counters
+        instance._loaded_counter_key = (
+            instance.__dict__.get("group_id"),
+            instance.__dict__.get("status"),
+        )
+        return instance
 
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        if not group_counters_enabled():
+            super().save(*args, **kwargs)
+            return
+
+        old_key = None
+        if not self._state.adding:
+            old_key = getattr(self, "_loaded_counter_key", (None, None))
+            if None in old_key:  # deferred fields, read what is stored
+                old_key = (
+                    Student.objects.filter(pk=self.pk)
+                    .values_list("group_id", "status")
+                    .first()
+                )
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            new_key = (self.group_id, self.status)
+            if old_key != new_key:
+                deltas = Counter({new_key: 1})
+                if old_key:
+                    deltas[old_key] -= 1
+                Group.adjust_counters(deltas)
+        self._loaded_counter_key = new_key
 
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name} ({self.status})"
@@ -112,12 +216,14 @@ class Teacher(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def clean(self):
-        if self.user.role != RoleType.TEACHER:
-            raise ValidationError("Linked user must have role=TEACHER")
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "user"], name="teacher_created_pk_idx"),
+            models.Index(fields=["hired_date", "user"], name="teacher_hired_pk_idx"),
+        ]
 
-        if Student.objects.filter(user=self.user).exists():
-            raise ValidationError("A user cannot be both a Teacher and a Student")
+    def clean(self):
+        check_profile_user(self, RoleType.TEACHER, Student)
 
     def save(self, *args, **kwargs):
         self.clean()
@@ -128,16 +234,171 @@ class Teacher(models.Model):
 
 
 class Group(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_uuid, editable=False)
     name = models.CharField(max_length=100, unique=True, blank=False, null=False)
     description = models.TextField(blank=True)
     subject = models.CharField(max_length=100, null=False, blank=False)
     status = models.CharField(
         max_length=20, choices=GroupStatus.choices, default=GroupStatus.STUDYING
     )
+    # INFO: no single-column index, group_teacher_status_idx starts with teacher_id
     teacher = models.ForeignKey(
-        Teacher, on_delete=models.PROTECT, related_name="groups"
+        Teacher, on_delete=models.PROTECT, related_name="groups", db_index=False
     )
 
+    # INFO: denormalized student counts, maintained only when settings.GROUP_COUNTERS is on
+    students_studying = models.PositiveIntegerField(default=0)
+    students_expelled = models.PositiveIntegerField(default=0)
+    students_graduated = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="group_created_pk_idx"),
+            # INFO: "my groups" of a teacher, optionally by status
+            models.Index(fields=["teacher", "status"], name="group_teacher_status_idx"),
+        ]
+
+    @classmethod
+    def adjust_counters(cls, deltas):
+        """
+        Applies `{(group_id, status): delta}` to the counters, one UPDATE per group.
+        """
+        per_group = {}
+        for (group_id, status), delta in deltas.items():
+            if group_id and delta:
+                field = STUDENT_COUNTER_FIELDS[status]
+                per_group.setdefault(group_id, Counter())[field] += delta
+
+        for group_id, fields in per_group.items():
+            changes = {
+                field: Greatest(models.F(field) + delta, 0)
+                for field, delta in fields.items()
+                if delta
+            }
+            if changes:
+                cls.objects.filter(pk=group_id).update(**changes)
+
+
+class ChangeAction(models.TextChoices):
+    CREATED = "CREATED", "Created"
+    UPDATED = "UPDATED", "Updated"
+    DELETED = "DELETED", "Deleted"
+
+
+class ChangeEvent(models.Model):
+    """
+    Outbox row written in the same transaction as a student / teacher / group mutation.
+    The auto-increment `id` is the change feed cursor, see users.outbox.
+    """
+
+    entity = models.CharField(max_length=20)  # model_name: student, teacher, group
+    entity_id = models.UUIDField()
+    action = models.CharField(max_length=10, choices=ChangeAction.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # INFO: latest event per object, for compact_changes
+            models.Index(
+                fields=["entity", "entity_id", "id"], name="change_entity_seq_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.entity} {self.entity_id}"
+
+
+class JobStatus(models.TextChoices):
+    QUEUED = "QUEUED", "Queued"
+    RUNNING = "RUNNING", "Running"
+    SUCCEEDED = "SUCCEEDED", "Succeeded"
+    FAILED = "FAILED", "Failed"
+
+
+class Job(models.Model):
+    """
+    Background job run by `manage.py runworker`, see users.jobs.
+    `payload` is cleared once the job has run. Bulk enrollment rows hold new users' passwords,
+    they are stored sealed (users.jobs.seal_bulk_rows).
+    """
+
+    id = models.UUIDField(primary_key=True, default=new_uuid, editable=False)
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(
+        max_length=10, choices=JobStatus.choices, default=JobStatus.QUEUED
+    )
+    result = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    created_by = models.ForeignKey(
+        User, null=True, on_delete=models.SET_NULL, related_name="+", db_index=False
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    # INFO: refreshed by the running worker, a RUNNING job whose heartbeat stops was abandoned
+    heartbeat_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            # INFO: workers claim the oldest QUEUED job and look for stale RUNNING ones
+            models.Index(
+                fields=["status", "created_at"], name="job_status_created_idx"
+            ),
+            # INFO: "my jobs", newest first
+            models.Index(fields=["created_by", "created_at"], name="job_owner_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.pk} ({self.status})"
+
+
+class RevokedToken(models.Model):
+    """
+    Refresh token (by `jti`) that must not be accepted again, kept until it expires
+    anyway. See users.revocation.
+    """
+
+    jti = models.CharField(primary_key=True, max_length=64)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # INFO: prune_revoked_tokens deletes by expiry, the filter loads the unexpired ones
+            models.Index(fields=["expires_at"], name="revoked_token_expiry_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.jti} (until {self.expires_at:%Y-%m-%d %H:%M})"
+
+
+def check_profile_user(profile, role, other_profile):
+    """
+    Shared `clean()` of Student / Teacher.
+    - the linked user has the profile's role (no query when `user` is loaded)
+    - the user has no `other_profile` row: one query, on insert only, the user of a profile never changes
+    """
+    if profile.user.role != role:
+        raise ValidationError(f"Linked user must have role={role}")
+
+    if (
+        profile._state.adding
+        and other_profile.objects.filter(user_id=profile.user_id).exists()
+    ):
+        raise ValidationError("A user cannot be both a Teacher and a Student")
+
+
+STUDENT_COUNTER_FIELDS = {
+    StudentStatus.STUDYING: "students_studying",
+    StudentStatus.EXPELLED: "students_expelled",
+    StudentStatus.GRADUATED: "students_graduated",
+}
+
+
+def group_counters_enabled():
+    return getattr(settings, "GROUP_COUNTERS", False)
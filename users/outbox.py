@@ -0,0 +1,79 @@
+from django.db import connections, router, transaction
+from rest_framework import serializers
+
+from .models import ChangeAction, ChangeEvent
+
+# INFO: any constant, it only has to be the same in every process
+FEED_LOCK_KEY = 0x6F7574626F78  # "outbox"
+
+
+def _lock_feed(using):
+    """
+    Makes event ids commit in order: a writer takes the lock before its INSERT takes an id
+    and keeps it until commit, so no lower id can become visible after a higher one was
+    served. SQLite needs nothing, it already runs one write transaction at a time.
+
+    Cost on PostgreSQL: the key is global, so every transaction that records events runs
+    one at a time app-wide, from its first record_changes() to its commit. Write throughput
+    is bounded by 1 / (that stretch of the slowest transactions); record events last in a
+    transaction to keep it short. A lock per model would not do: the ids come from one
+    sequence, two models' writers could then commit them out of order.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [FEED_LOCK_KEY])
+
+
+def record_changes(model, action, pks):
+    """
+    Writes one ChangeEvent per pk, to be called inside the mutation's transaction.
+    """
+    pks = list(pks)
+    if not pks:
+        return
+
+    using = router.db_for_write(ChangeEvent)
+    if not transaction.get_connection(using).in_atomic_block:
+        raise transaction.TransactionManagementError(
+            "Change events must be written in the mutation's transaction."
+        )
+    _lock_feed(using)
+    entity = model._meta.model_name
+    ChangeEvent.objects.using(using).bulk_create(
+        [ChangeEvent(entity=entity, entity_id=pk, action=action) for pk in pks]
+    )
+
+
+def record_change(instance, action):
+    record_changes(type(instance), action, [instance.pk])
+
+
+class OutboxSerializerMixin(serializers.BaseSerializer):
+    """
+    save() (create or update) runs in a transaction together with its ChangeEvent.
+    """
+
+    def save(self, **kwargs):
+        action = ChangeAction.CREATED if self.instance is None else ChangeAction.UPDATED
+        with transaction.atomic():
+            instance = super().save(**kwargs)
+            record_change(instance, action)
+        return instance
+
+
+def changes_since(cursor, limit):
+    """
+    Up to `limit` events after `cursor` (an event id, 0 for the start), oldest first,
+    plus whether more are waiting.
+    """
+    rows = list(
+        ChangeEvent.objects.filter(pk__gt=cursor)
+        .order_by("pk")
+        .values_list("pk", "entity", "entity_id", "action", "created_at")[: limit + 1]
+    )
+    events = [
+        {"seq": pk, "entity": entity, "id": entity_id, "action": action, "at": at}
+        for pk, entity, entity_id, action, at in rows[:limit]
+    ]
+    return events, len(rows) > limit
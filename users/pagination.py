@@ -0,0 +1,176 @@
+import hashlib
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from uuid import UUID
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination ordered by `(field, pk)`, `field` is `created_at` unless the
+    view's IndexedOrderingFilter picks another indexed column (`?ordering=-hired_date`).
+    - No OFFSET: a page is `WHERE (field, pk) > cursor ORDER BY field, pk LIMIT n`
+    - No COUNT(*) unless `?count=true`; the total is then cached for `count_cache_timeout` seconds
+    """
+
+    page_size = api_settings.PAGE_SIZE or 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    count_cache_timeout = 60
+    invalid_cursor_message = "Invalid cursor"
+    ordering = "created_at"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count = self.get_count(queryset) if self.wants_count(request) else None
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(page_queryset), count)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset() for the async read views.
+        """
+        count = await self.aget_count(queryset) if self.wants_count(request) else None
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([obj async for obj in page_queryset], count)
+
+    def get_page_queryset(self, queryset, request, view):
+        """
+        The query for one page (+1 row to see if there is more), nothing is fetched yet.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        field = self.ordering.lstrip("-")
+        self.cursor = self.decode_cursor(request, queryset.model._meta.get_field(field))
+        self.reverse = bool(self.cursor and self.cursor[0])
+        # INFO: the direction rows are read in, a `previous` page reads backwards
+        ascending = self.ordering.startswith("-") == self.reverse
+
+        if ascending:
+            queryset = queryset.order_by(field, "pk")
+        else:
+            queryset = queryset.order_by(f"-{field}", "-pk")
+
+        if self.cursor:
+            _, value, pk = self.cursor
+            op = "gt" if ascending else "lt"
+            # INFO: the redundant range bound lets the (field, pk) index do a range scan
+            queryset = queryset.filter(**{f"{field}__{op}e": value}).filter(
+                Q(**{f"{field}__{op}": value}) | Q(**{f"pk__{op}": pk})
+            )
+
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, rows, count):
+        self.count = count
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = {}
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["next"] = self.get_next_link()
+        payload["previous"] = self.get_previous_link()
+        payload["results"] = data
+        return Response(payload)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request, queryset, view):
+        """
+        The single ordering term of the view's OrderingFilter, `created_at` without one.
+        """
+        for backend in getattr(view, "filter_backends", ()):
+            if issubclass(backend, OrderingFilter):
+                return backend().get_ordering(request, queryset, view)[0]
+        return type(self).ordering
+
+    def wants_count(self, request):
+        value = request.query_params.get(self.count_query_param, "")
+        return value.lower() in {"1", "true", "yes"}
+
+    def count_cache_key(self, queryset):
+        return "keyset-count:" + hashlib.md5(str(queryset.query).encode()).hexdigest()
+
+    def get_count(self, queryset):
+        key = self.count_cache_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    async def aget_count(self, queryset):
+        key = self.count_cache_key(queryset)
+        count = await cache.aget(key)
+        if count is None:
+            count = await queryset.acount()
+            await cache.aset(key, count, self.count_cache_timeout)
+        return count
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.encode_cursor(self.page[-1])
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        cursor = self.encode_cursor(self.page[0], reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, obj, reverse=False):
+        value = getattr(obj, self.ordering.lstrip("-"))
+        value = value.isoformat() if hasattr(value, "isoformat") else value
+        # INFO: the value goes last, it is the only part that may contain "|"
+        raw = f"{int(reverse)}|{self.ordering}|{obj.pk}|{value}"
+        return urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request, field):
+        """
+        Returns `(reverse, value, pk)` or None when no cursor was sent.
+        A cursor from another `?ordering=` is rejected.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            reverse, ordering, pk, value = (
+                urlsafe_b64decode(encoded.encode()).decode().split("|", 3)
+            )
+            if ordering != self.ordering:
+                raise ValueError
+            return reverse == "1", field.to_python(value), UUID(pk)
+        except (TypeError, ValueError, UnicodeDecodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
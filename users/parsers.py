@@ -0,0 +1,35 @@
+import csv
+import io
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class CSVParser(BaseParser):
+    """
+    Parses a `text/csv` body into a list of dicts (one per row).
+    The first line is the header; empty cells are dropped so optional fields fall back to defaults.
+    """
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        if stream is None:
+            return []
+
+        try:
+            reader = csv.DictReader(io.StringIO(stream.read().decode(encoding)))
+            return [
+                {
+                    key.strip(): value.strip()
+                    for key, value in row.items()
+                    if key and value
+                }
+                for row in reader
+            ]
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise ParseError(f"CSV parse error - {exc}")
@@ -16,6 +16,19 @@ class IsAdmin(BasePermission):
         )
 
 
+class IsTeacher(BasePermission):
+    """
+    Allows access only to users with role = TEACHER
+    """
+
+    def has_permission(self, request, _):  # 3rd was view
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and request.user.role == RoleType.TEACHER
+        )
+
+
 class IsAdminOrReadOnly(BasePermission):
     """
     Admins can do everything.
@@ -51,7 +64,8 @@ class IsAdminOrTeacherCanWrite(BasePermission):
         # TEACHER: allow only for objects that belong to the teacher
         if getattr(request.user, "role", None) == RoleType.TEACHER:
             if isinstance(obj, Group):
-                return obj.teacher.user.id == request.user.id
+                return obj.teacher_id == request.user.id
             if isinstance(obj, Student):
-                return obj.group.teacher.user.id == request.user.id
+                # INFO: from the row itself, the cached scope may lag behind a reassignment
+                return obj.group.teacher_id == request.user.id
         return False
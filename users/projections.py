@@ -0,0 +1,175 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+TEXT_FIELDS = {"CharField", "EmailField", "TextField", "SlugField", "URLField"}
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+class Projection:
+    """
+    Read-only fast path for a serializer: its representation built from one `values_list()` row.
+    - `columns`: the ORM paths the representation needs, nested serializers included
+    - `map_row(row)`: row tuple -> dict, generated once per serializer class, equal to
+      `serializer.to_representation(instance)` (checked by the conformance test in users/tests.py)
+    - `fields`: a sparse fieldset, only these top-level fields are read and rendered
+    Only plain fields through non-null forward relations are supported, anything else
+    (method fields, related fields, `source="*"`, nullable joins) raises UnsupportedField.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        self.columns = []
+        # INFO: `columns` as `only()` takes them (`teacher`, not `teacher_id`)
+        self.model_fields = []
+        self._converters = {}
+        serializer = serializer_class(context={"fields": fields})
+        body = self._compile(serializer, serializer_class.Meta.model, "")
+        source = f"def map_row(row):\n    return {body}\n"
+        namespace = dict(self._converters)
+        exec(
+            compile(source, f"<projection {serializer_class.__name__}>", "exec"),
+            namespace,
+        )
+        self.source = source
+        self.map_row = namespace["map_row"]
+        # INFO: every relation path the columns go through: `group`, `group__teacher`...
+        self.relations = {
+            "__".join(parts[:i])
+            for parts in (path.split("__") for path in self.model_fields)
+            for i in range(1, len(parts))
+        }
+
+    def values(self, queryset, *extra):
+        """
+        The queryset as named rows of `columns` (+ `extra` columns, e.g. what a cursor reads).
+        """
+        columns = [*self.columns, *(name for name in extra if name not in self.columns)]
+        return queryset.values_list(*columns, named=True)
+
+    def prune(self, queryset, *extra):
+        """
+        The queryset loading only `columns` (+ `extra` fields), joined only to the relations
+        they go through: for a serializer reading model instances from a sparse fieldset.
+        """
+        queryset = queryset.select_related(None)
+        if self.relations:  # INFO: select_related() without names would follow every FK
+            queryset = queryset.select_related(*self.relations)
+        return queryset.only(*self.model_fields, *extra)
+
+    def _compile(self, serializer, model, prefix):
+        items = []
+        for field in serializer._readable_fields:
+            if field.source == "*":
+                raise UnsupportedField(field.field_name)
+            related_model, path = _resolve(model, field.source_attrs)
+            if isinstance(field, serializers.BaseSerializer):
+                if (
+                    isinstance(field, serializers.ListSerializer)
+                    or related_model is None
+                ):
+                    raise UnsupportedField(field.field_name)
+                value = self._compile(field, related_model, f"{prefix}{path}__")
+            else:
+                if related_model is not None:
+                    raise UnsupportedField(field.field_name)
+                value = self._column(field, model, field.source_attrs, prefix + path)
+            items.append(f"{field.field_name!r}: {value}")
+        return "{" + ", ".join(items) + "}"
+
+    def _column(self, field, model, source_attrs, path):
+        index = len(self.columns)
+        self.columns.append(path)
+        model_field = _model_field(model, source_attrs)
+        relation = path.rpartition("__")[0]
+        self.model_fields.append(
+            f"{relation}__{model_field.name}" if relation else model_field.name
+        )
+        value = f"row[{index}]"
+        convert = _converter(field, model_field)
+        if convert is None:
+            return value
+        name = f"convert_{index}"
+        self._converters[name] = convert
+        # INFO: None is rendered as None without calling the field, like Serializer.to_representation
+        return f"(None if {value} is None else {name}({value}))"
+
+
+def _resolve(model, source_attrs):
+    """
+    `(related model or None, ORM path)` of a dotted source, only through non-null forward FKs.
+    """
+    for i, attr in enumerate(source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise UnsupportedField(".".join(source_attrs))
+
+        if model_field.is_relation and not model_field.concrete:  # INFO: reverse side
+            raise UnsupportedField(".".join(source_attrs))
+        # INFO: `teacher_id` (the FK column itself) is a plain column
+        if (
+            not model_field.is_relation
+            or attr == model_field.attname != model_field.name
+        ):
+            if i != len(source_attrs) - 1:
+                raise UnsupportedField(".".join(source_attrs))
+            return None, "__".join(source_attrs)
+        if model_field.null or not (model_field.many_to_one or model_field.one_to_one):
+            raise UnsupportedField(".".join(source_attrs))
+        if i == len(source_attrs) - 1:
+            return model_field.related_model, "__".join(source_attrs)
+        model = model_field.related_model
+    raise UnsupportedField(".".join(source_attrs))
+
+
+def _model_field(model, source_attrs):
+    for attr in source_attrs[:-1]:
+        model = model._meta.get_field(attr).related_model
+    return model._meta.get_field(source_attrs[-1])
+
+
+def _converter(field, model_field):
+    """
+    What `field.to_representation(value)` does to a non-None DB value, None when it is a no-op.
+    """
+    if isinstance(field, serializers.RelatedField):
+        raise UnsupportedField(field.field_name)
+
+    db_is_text = model_field.get_internal_type() in TEXT_FIELDS
+    if isinstance(field, serializers.ChoiceField):
+        if db_is_text and all(isinstance(key, str) for key in field.choices):
+            return None
+        return field.to_representation
+    if isinstance(field, serializers.CharField):  # INFO: EmailField, SlugField... too
+        return None if db_is_text else str
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+        return str
+    if isinstance(field, serializers.DateField) and not isinstance(
+        field, serializers.DateTimeField
+    ):
+        if getattr(field, "format", api_settings.DATE_FORMAT) == ISO_8601:
+            return _isoformat
+    # INFO: DateTimeField included: it converts to the current time zone on every call
+    return field.to_representation
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+# INFO: keyed by sparse fieldset too, those are validated subsets of the serializer's fields
+@lru_cache(maxsize=512)
+def get_projection(serializer_class, fields=None):
+    """
+    The serializer's Projection (of the top-level `fields` only, when given),
+    None when a field cannot be projected.
+    """
+    try:
+        return Projection(serializer_class, fields)
+    except UnsupportedField:
+        return None
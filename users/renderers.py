@@ -0,0 +1,42 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # INFO: optional, JSONRenderer output either way
+    orjson = None
+
+# INFO: orjson formats datetimes itself ("+00:00"), DRF's encoder writes "Z"
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer with the same bytes, encoded by orjson when it is installed.
+    - types orjson does not know (lazy strings, Decimal, datetimes...) go through DRF's JSONEncoder
+    - `; indent=` requests, non-compact / ASCII-only settings and what orjson rejects
+      (ints over 64 bits, non-str keys) are left to JSONRenderer
+    NaN / infinity become null instead of an error (STRICT_JSON), the API has no float fields.
+    """
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder.default, option=ORJSON_OPTIONS
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # INFO: JSONRenderer escapes these two, they break JavaScript string literals
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
@@ -0,0 +1,113 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedToken
+
+
+class BloomFilter:
+    """
+    Set of strings with false positives (at most `error_rate` up to `capacity` items)
+    but no false negatives. Items cannot be removed, a filter is rebuilt instead.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # INFO: double hashing, k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * step) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+_filter: BloomFilter | None = None
+_filter_built = 0.0
+_filter_lock = threading.Lock()
+
+
+def _revocation_settings():
+    return getattr(settings, "REVOKED_TOKENS", {})
+
+
+def _build_filter():
+    config = _revocation_settings()
+    unexpired = RevokedToken.objects.filter(expires_at__gt=timezone.now())
+    # INFO: room for twice today's rows, revocations of this process are added as they happen
+    capacity = max(config.get("FILTER_MIN_CAPACITY", 10_000), 2 * unexpired.count())
+    bloom = BloomFilter(capacity, config.get("FILTER_ERROR_RATE", 0.001))
+    for jti in unexpired.values_list("jti", flat=True).iterator(chunk_size=5000):
+        bloom.add(jti)
+    return bloom
+
+
+def revocation_filter():
+    """
+    This process's BloomFilter of revoked jtis, rebuilt from the table every
+    REVOKED_TOKENS["FILTER_TTL"] seconds or when it is full.
+    """
+    global _filter, _filter_built
+
+    with _filter_lock:
+        ttl = _revocation_settings().get("FILTER_TTL", 300)
+        if (
+            _filter is None
+            or time.monotonic() - _filter_built > ttl
+            or _filter.count >= _filter.capacity
+        ):
+            _filter = _build_filter()
+            _filter_built = time.monotonic()
+        return _filter
+
+
+def is_revoked(jti):
+    """
+    The common "not revoked" answer comes from the filter, only filter hits
+    (revoked, or a false positive) query the table.
+    """
+    if jti not in revocation_filter():
+        return False
+    return RevokedToken.objects.filter(jti=jti).exists()
+
+
+def revoke_token(token):
+    """
+    Revokes `token` until it expires. Returns False when it already was, also when
+    another request revoked it concurrently (the jti is the primary key), so a
+    refresh token is rotated at most once even where this process's filter lags behind.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime_from_epoch(token["exp"])
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        return False
+
+    bloom = revocation_filter()
+    with _filter_lock:
+        bloom.add(jti)
+    return True
@@ -0,0 +1,108 @@
+from typing import NamedTuple
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import RoleType, Student
+
+
+class UserScope(NamedTuple):
+    role: str | None
+    student_group_id: UUID | None  # group of the student
+
+
+EMPTY_SCOPE = UserScope(None, None)
+
+
+def scope_cache_key(user_id):
+    # INFO: v2, scopes no longer carry a teacher's groups
+    return f"user-scope:v2:{user_id}"
+
+
+def load_user_scope(user):
+    """
+    Loads a student's group with one query. The other roles need no lookup: admins see
+    everything and teachers are scoped in the queries themselves (`teacher_id` filters).
+    """
+    group_id = (
+        Student.objects.filter(user_id=user.pk)
+        .values_list("group_id", flat=True)
+        .first()
+    )
+    return UserScope(RoleType.STUDENT, group_id)
+
+
+async def aload_user_scope(user):
+    """
+    Async load_user_scope().
+    """
+    group_id = (
+        await Student.objects.filter(user_id=user.pk)
+        .values_list("group_id", flat=True)
+        .afirst()
+    )
+    return UserScope(RoleType.STUDENT, group_id)
+
+
+def _uncached_scope(user):
+    """
+    The scope of a user that is not a student (None for a student), no query needed.
+    """
+    if not user or not user.is_authenticated:
+        return EMPTY_SCOPE
+    role = getattr(user, "role", None)
+    return None if role == RoleType.STUDENT else UserScope(role, None)
+
+
+def get_user_scope(request):
+    """
+    Scope of `request.user`, memoized on the request; a student's is cached for
+    SCOPE_CACHE_TIMEOUT seconds. Cache entries are dropped by the signals in users.signals
+    when memberships change.
+    """
+    scope = getattr(request, "_user_scope", None)
+    if scope is not None:
+        return scope
+
+    scope = _uncached_scope(request.user)
+    if scope is None:
+        scope = cache.get_or_set(
+            scope_cache_key(request.user.pk),
+            lambda: load_user_scope(request.user),
+            getattr(settings, "SCOPE_CACHE_TIMEOUT", 30),
+        )
+
+    request._user_scope = scope
+    return scope
+
+
+async def aget_user_scope(request):
+    """
+    Async get_user_scope(), shares the request memo and the cache entries.
+    """
+    scope = getattr(request, "_user_scope", None)
+    if scope is not None:
+        return scope
+
+    scope = _uncached_scope(request.user)
+    if scope is None:
+        key = scope_cache_key(request.user.pk)
+        scope = await cache.aget(key)
+        if scope is None:
+            scope = await aload_user_scope(request.user)
+            await cache.aset(key, scope, getattr(settings, "SCOPE_CACHE_TIMEOUT", 30))
+
+    request._user_scope = scope
+    return scope
+
+
+def invalidate_user_scope(*user_ids):
+    """
+    Drops the users' cached scopes once the current transaction commits (right away outside
+    one): dropped earlier, a concurrent request could cache the not yet committed old scope again.
+    """
+    keys = [scope_cache_key(user_id) for user_id in user_ids if user_id]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
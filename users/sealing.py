@@ -0,0 +1,93 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+# INFO: version byte + nonce + ciphertext + tag
+VERSION = b"\x01"
+NONCE_SIZE = 16
+TAG_SIZE = 32
+BLOCK_SIZE = 64  # blake2b digest
+
+
+class SealError(Exception):
+    """
+    A sealed value that was tampered with, sealed for another purpose or with a key no
+    longer in SECRET_KEY / SECRET_KEY_FALLBACKS.
+    """
+
+
+def _keys(secret, purpose):
+    """
+    (encryption key, MAC key) derived from `secret`, one pair per purpose.
+    """
+    root = hashlib.sha512(secret.encode()).digest()
+    return tuple(
+        hashlib.blake2b(
+            f"{purpose}:{use}".encode(), key=root, person=b"users.sealing"
+        ).digest()
+        for use in ("encrypt", "mac")
+    )
+
+
+def _keystream(key, nonce, size):
+    # INFO: keyed blake2b as a PRF in counter mode, one 64-byte block per call
+    blocks = (size + BLOCK_SIZE - 1) // BLOCK_SIZE
+    return b"".join(
+        hashlib.blake2b(nonce + counter.to_bytes(8, "big"), key=key).digest()
+        for counter in range(blocks)
+    )[:size]
+
+
+def _xor(data, stream):
+    return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(
+        len(data), "big"
+    )
+
+
+def _tag(key, message):
+    return hashlib.blake2b(message, key=key, digest_size=TAG_SIZE).digest()
+
+
+def seal(value, purpose):
+    """
+    Encrypts and authenticates the JSON of `value` with a key derived from SECRET_KEY:
+    what is stored can be neither read nor altered without it. Returns a str.
+    """
+    encrypt_key, mac_key = _keys(settings.SECRET_KEY, purpose)
+    plaintext = json.dumps(value, cls=DjangoJSONEncoder).encode()
+    nonce = secrets.token_bytes(NONCE_SIZE)
+    body = (
+        VERSION
+        + nonce
+        + _xor(plaintext, _keystream(encrypt_key, nonce, len(plaintext)))
+    )
+    return base64.urlsafe_b64encode(body + _tag(mac_key, body)).decode()
+
+
+def unseal(sealed, purpose):
+    """
+    The value given to `seal(value, purpose)`. Raises SealError when `sealed` does not
+    authenticate under SECRET_KEY or one of the SECRET_KEY_FALLBACKS.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(sealed.encode())
+    except (AttributeError, ValueError) as exc:
+        raise SealError("Not a sealed value.") from exc
+    if len(raw) < len(VERSION) + NONCE_SIZE + TAG_SIZE or raw[:1] != VERSION:
+        raise SealError("Not a sealed value.")
+
+    body, tag = raw[:-TAG_SIZE], raw[-TAG_SIZE:]
+    nonce, ciphertext = body[1 : 1 + NONCE_SIZE], body[1 + NONCE_SIZE :]
+    for secret in [settings.SECRET_KEY, *getattr(settings, "SECRET_KEY_FALLBACKS", [])]:
+        encrypt_key, mac_key = _keys(secret, purpose)
+        if hmac.compare_digest(tag, _tag(mac_key, body)):
+            plaintext = _xor(
+                ciphertext, _keystream(encrypt_key, nonce, len(ciphertext))
+            )
+            return json.loads(plaintext)
+    raise SealError("The sealed value does not authenticate.")
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import cast
 
 from django.contrib.auth import get_user_model
@@ -5,33 +6,60 @@ from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
-from .models import CustomUserManager, Group, Student, StudentStatus, Teacher, RoleType
-
-
-class TeacherSerializer(serializers.ModelSerializer):
+from .identity import IdentityValidationMixin
+from .metrics import TimedListSerializer, TimedSerializerMixin
+from .models import (
+    CustomUserManager,
+    Group,
+    Job,
+    RoleType,
+    Student,
+    StudentStatus,
+    Teacher,
+)
+from .outbox import OutboxSerializerMixin
+
+
+class FieldsetMixin(serializers.BaseSerializer):
+    """
+    Renders only the top-level fields named in `context["fields"]` (sparse fieldsets,
+    see users.views.SparseFieldsMixin). Nested serializers are kept or dropped whole.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()  # pyright: ignore[reportAttributeAccessIssue]
+        kept = self.context.get("fields")
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if kept is None or parent is not None:
+            return fields
+        return {name: field for name, field in fields.items() if name in kept}
+
+
+@lru_cache(maxsize=None)
+def readable_field_names(serializer_class):
+    """
+    Names a sparse fieldset can pick from, in rendering order.
+    """
+    return tuple(field.field_name for field in serializer_class()._readable_fields)
+
+
+class TeacherSerializer(
+    TimedSerializerMixin,
+    FieldsetMixin,
+    OutboxSerializerMixin,
+    IdentityValidationMixin,
+    serializers.ModelSerializer,
+):
     # User-specific fields
     id = serializers.UUIDField(source="user.id", read_only=True)
-    email = serializers.EmailField(
-        source="user.email",
-        validators=[
-            UniqueValidator(
-                queryset=get_user_model().objects.all(),
-                message="Email must be unique.",
-            )
-        ],
-    )
+    # INFO: email / phone uniqueness is checked in one query by IdentityValidationMixin
+    email = serializers.EmailField(source="user.email")
     password = serializers.CharField(source="user.password", write_only=True)
     first_name = serializers.CharField(source="user.first_name")
     last_name = serializers.CharField(source="user.last_name")
-    phone_number = serializers.CharField(
-        source="user.phone_number",
-        validators=[
-            UniqueValidator(
-                queryset=get_user_model().objects.all(),
-                message="Phone number must be unique.",
-            )
-        ],
-    )
+    phone_number = serializers.CharField(source="user.phone_number")
     role = serializers.CharField(source="user.role", read_only=True)
 
     # Teacher-specific fields
@@ -47,6 +75,7 @@ class TeacherSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Teacher
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "email",
@@ -100,25 +129,24 @@ class TeacherSerializer(serializers.ModelSerializer):
         return instance
 
     def validate(self, attrs):
-        User = get_user_model()
-        user_data = attrs.get("user", {})
-        email = user_data.get("email")
-
-        if User.objects.filter(email=email).exists():
-            raise serializers.ValidationError("A user with this email already exists")
-
-        if User.objects.filter(email=email, role=RoleType.STUDENT).exists():
-            raise serializers.ValidationError(
-                "A user cannot be both a Teacher and a Student"
-            )
-
+        # INFO: the Student/Teacher overlap is checked by Teacher.clean() on insert
+        self.validate_identity(attrs)
         return attrs
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(
+    TimedSerializerMixin,
+    FieldsetMixin,
+    OutboxSerializerMixin,
+    serializers.ModelSerializer,
+):
     teacher = TeacherSerializer(read_only=True)
+    # INFO: the user comes along for the response's nested teacher
     teacher_id = serializers.PrimaryKeyRelatedField(
-        queryset=Teacher.objects.all(), source="teacher", write_only=True, required=True
+        queryset=Teacher.objects.select_related("user"),
+        source="teacher",
+        write_only=True,
+        required=True,
     )
     name = serializers.CharField(
         validators=[
@@ -130,6 +158,7 @@ class GroupSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Group
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "name",
@@ -152,30 +181,21 @@ class GroupSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(
+    TimedSerializerMixin,
+    FieldsetMixin,
+    OutboxSerializerMixin,
+    IdentityValidationMixin,
+    serializers.ModelSerializer,
+):
     # User-specific fields
     id = serializers.UUIDField(source="user.id", read_only=True)
-    email = serializers.EmailField(
-        source="user.email",
-        validators=[
-            UniqueValidator(
-                queryset=get_user_model().objects.all(),
-                message="Email must be unique.",
-            )
-        ],
-    )
+    # INFO: email / phone uniqueness is checked in one query by IdentityValidationMixin
+    email = serializers.EmailField(source="user.email")
     password = serializers.CharField(source="user.password", write_only=True)
     first_name = serializers.CharField(source="user.first_name")
     last_name = serializers.CharField(source="user.last_name")
-    phone_number = serializers.CharField(
-        source="user.phone_number",
-        validators=[
-            UniqueValidator(
-                queryset=get_user_model().objects.all(),
-                message="Phone number must be unique.",
-            )
-        ],
-    )
+    phone_number = serializers.CharField(source="user.phone_number")
     role = serializers.CharField(source="user.role", read_only=True)
 
     # User-specific fields
@@ -185,12 +205,16 @@ class StudentSerializer(serializers.ModelSerializer):
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
     group = GroupSerializer(read_only=True)
+    # INFO: the teacher comes along for the response's nested group
     group_id = serializers.PrimaryKeyRelatedField(
-        queryset=Group.objects.all(), source="group", write_only=True
+        queryset=Group.objects.select_related("teacher__user"),
+        source="group",
+        write_only=True,
     )
 
     class Meta:
         model = Student
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "email",
@@ -210,33 +234,21 @@ class StudentSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         """
-        - Email uniqueness (create + update)
+        - Email / phone uniqueness (create + update), one query
         - Teacher can only assign to their own groups (create + update when group changes)
-        - No overlap with Teacher account
+        - No overlap with Teacher account: Student.clean() on insert
         """
         request = self.context.get("request")
-        User = get_user_model()
-        user_data = attrs.get("user", {})
-        email = user_data.get("email")
-
         group = attrs.get("group")
         instance = getattr(self, "instance", None)
 
-        # check Email uniqueness
-        if email:
-            qs = User.objects.filter(email=email)
-            if instance:
-                qs = qs.exclude(pk=instance.user.id)
-            if qs.exists():
-                raise serializers.ValidationError(
-                    {"email": "This email is already in use."}
-                )
+        self.validate_identity(attrs)
 
         # Group ownership restriction for TEACHER
         if request and getattr(request.user, "role", None) == RoleType.TEACHER:
             # On create, `group` must be present; on update, it might or might not be provided
             target_group = group or (instance.group if instance else None)
-            if target_group and target_group.teacher.user != request.user:
+            if target_group and target_group.teacher_id != request.user.pk:
                 raise serializers.ValidationError(
                     "You can only assign students to groups you teach."
                 )
@@ -278,3 +290,166 @@ class StudentSerializer(serializers.ModelSerializer):
         instance.save()
 
         return instance
+
+
+class StudentBulkSerializer(serializers.Serializer):
+    """
+    One row of a bulk enrollment.
+    No per-row DB validators here: uniqueness and group checks are done set-based for the whole batch.
+    """
+
+    email = serializers.EmailField()
+    password = serializers.CharField(write_only=True)
+    first_name = serializers.CharField(max_length=50)
+    last_name = serializers.CharField(max_length=50, required=False, default="")
+    phone_number = serializers.CharField(max_length=32)
+    date_of_birth = serializers.DateField()
+    enrollment_date = serializers.DateField(required=False, default=timezone.localdate)
+    status = serializers.ChoiceField(
+        choices=StudentStatus.choices, required=False, default=StudentStatus.STUDYING
+    )
+    group_id = serializers.UUIDField()
+
+
+class StudentBulkMoveSerializer(serializers.Serializer):
+    """
+    Body of `students/bulk-move`: the students to move and their new group.
+    """
+
+    student_ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False
+    )
+    group_id = serializers.UUIDField()
+
+
+class ChangeFeedParamsSerializer(serializers.Serializer):
+    """
+    Query parameters of `changes/`.
+    """
+
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=500)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "result",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class GroupCompactSerializer(GroupSerializer):
+    """
+    List-mode group: `teacher_id` instead of the nested teacher (side-loaded in `included`).
+    """
+
+    teacher_id = serializers.UUIDField(read_only=True)
+
+    class Meta(GroupSerializer.Meta):
+        fields = [
+            "id",
+            "name",
+            "description",
+            "subject",
+            "status",
+            "teacher_id",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class StudentCompactSerializer(StudentSerializer):
+    """
+    List-mode student: `group_id` / `teacher_id` instead of the nested group and teacher.
+    """
+
+    group_id = serializers.UUIDField(read_only=True)
+    teacher_id = serializers.UUIDField(source="group.teacher_id", read_only=True)
+
+    class Meta(StudentSerializer.Meta):
+        fields = [
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "phone_number",
+            "role",
+            "date_of_birth",
+            "enrollment_date",
+            "status",
+            "created_at",
+            "updated_at",
+            "group_id",
+            "teacher_id",
+        ]
+
+
+class RosterStudentSerializer(StudentSerializer):
+    """
+    Student inside its group's roster: no nested group / teacher.
+    """
+
+    class Meta(StudentSerializer.Meta):
+        fields = [
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "phone_number",
+            "date_of_birth",
+            "enrollment_date",
+            "status",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class GroupDashboardSerializer(GroupSerializer):
+    """
+    Teacher dashboard group: the group once, with its roster, without the teacher.
+    Expects `students` prefetched (users.views.TeacherViewSet.dashboard).
+    """
+
+    students = RosterStudentSerializer(many=True, read_only=True)
+
+    class Meta(GroupSerializer.Meta):
+        fields = [
+            "id",
+            "name",
+            "description",
+            "subject",
+            "status",
+            "created_at",
+            "updated_at",
+            "students",
+        ]
+
+
+def build_included(groups=(), teachers=()):
+    """
+    Side-loaded objects for compact lists, each group / teacher serialized once:
+    `{"groups": {id: group}, "teachers": {id: teacher}}`
+    """
+    groups = {group.pk: group for group in groups}
+    teachers = {teacher.pk: teacher for teacher in teachers}
+    teachers.update((group.teacher_id, group.teacher) for group in groups.values())
+
+    included = {}
+    if groups:
+        data = GroupCompactSerializer(groups.values(), many=True).data
+        included["groups"] = {item["id"]: item for item in data}
+    included["teachers"] = {
+        item["id"]: item
+        for item in TeacherSerializer(teachers.values(), many=True).data
+    }
+    return included
@@ -0,0 +1,306 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .hashers import hash_passwords
+from .identity import IDENTITY_FIELDS, taken_fields, taken_identities
+from .models import (
+    STUDENT_COUNTER_FIELDS,
+    ChangeAction,
+    Group,
+    GroupStatus,
+    RoleType,
+    Student,
+    StudentStatus,
+    group_counters_enabled,
+)
+from .outbox import record_changes
+from .scopes import invalidate_user_scope
+from .serializers import StudentBulkSerializer
+
+BULK_MAX_ROWS = 10_000
+BULK_BATCH_SIZE = 1_000
+
+
+def check_bulk_rows(rows, request_user):
+    """
+    The checks of a bulk enrollment, without hashing or writing anything:
+    - Row shape is validated without touching the DB
+    - Email / phone uniqueness: one `IN` query for both (+ duplicates inside the batch)
+    - Group existence + teacher ownership: one query
+
+    Returns `(valid, errors)`: `{row index: validated data}` and a list of
+    `{"row": i, "errors": {...}}`, empty when every row passed.
+    """
+    User = get_user_model()
+    errors: dict[int, dict[str, list[str]]] = {}
+    valid: dict[int, dict] = {}
+
+    for index, row in enumerate(rows):
+        serializer = StudentBulkSerializer(data=row)
+        if serializer.is_valid():
+            data = dict(serializer.validated_data)
+            data["email"] = User.objects.normalize_email(data["email"])
+            valid[index] = data
+        else:
+            errors[index] = {
+                field: list(msgs) for field, msgs in serializer.errors.items()
+            }
+
+    def add_error(index, field, message):
+        errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+    emails = Counter(data["email"] for data in valid.values())
+    phones = Counter(data["phone_number"] for data in valid.values())
+    group_ids = {data["group_id"] for data in valid.values()}
+
+    taken = taken_identities(emails.keys(), phones.keys())
+    taken_emails, taken_phones = taken["email"], taken["phone_number"]
+    group_teachers = dict(
+        Group.objects.filter(pk__in=group_ids).values_list("pk", "teacher_id")
+    )
+
+    is_teacher = getattr(request_user, "role", None) == RoleType.TEACHER
+    for index, data in valid.items():
+        email = data["email"]
+        if email in taken_emails:
+            add_error(index, "email", IDENTITY_FIELDS["email"])
+        elif emails[email] > 1:
+            add_error(index, "email", "Duplicate email in this batch.")
+
+        phone = data["phone_number"]
+        if phone in taken_phones:
+            add_error(index, "phone_number", IDENTITY_FIELDS["phone_number"])
+        elif phones[phone] > 1:
+            add_error(index, "phone_number", "Duplicate phone number in this batch.")
+
+        group_id = data["group_id"]
+        if group_id not in group_teachers:
+            add_error(
+                index, "group_id", f'Invalid pk "{group_id}" - object does not exist.'
+            )
+        elif is_teacher and group_teachers[group_id] != request_user.pk:
+            add_error(
+                index, "group_id", "You can only assign students to groups you teach."
+            )
+
+    return valid, [{"row": index, "errors": errors[index]} for index in sorted(errors)]
+
+
+def bulk_enroll_students(rows, request_user):
+    """
+    Validates (see check_bulk_rows) and inserts a batch of students.
+    All-or-nothing: one `bulk_create` for users, one for students and one for their
+    change events in a single transaction.
+
+    Returns `(created_students, errors)` where `errors` is a list of `{"row": i, "errors": {...}}`.
+    """
+    valid, errors = check_bulk_rows(rows, request_user)
+    if errors:
+        return [], errors
+
+    User = get_user_model()
+    users = []
+    students = []
+    # INFO: hashing dominates the cost of a batch, so it runs on the process pool with the machine profile
+    hashes = hash_passwords(data["password"] for data in valid.values())
+    for data, password in zip(valid.values(), hashes):
+        # INFO: bulk_create skips Student.save()/clean(); role=STUDENT on a fresh user keeps the same invariants
+        user = User(
+            email=data["email"],
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            phone_number=data["phone_number"],
+            role=RoleType.STUDENT,
+            password=password,
+        )
+        users.append(user)
+        students.append(
+            Student(
+                user=user,
+                date_of_birth=data["date_of_birth"],
+                enrollment_date=data["enrollment_date"],
+                status=data["status"],
+                group_id=data["group_id"],
+            )
+        )
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=BULK_BATCH_SIZE)
+            Student.objects.bulk_create(students, batch_size=BULK_BATCH_SIZE)
+            record_changes(Student, ChangeAction.CREATED, [s.pk for s in students])
+            if group_counters_enabled():
+                Group.adjust_counters(Counter((s.group_id, s.status) for s in students))
+    except IntegrityError:
+        # INFO: a concurrent write took an email/phone between the checks and the insert,
+        # checked again to tell which rows
+        taken = taken_identities(
+            [data["email"] for data in valid.values()],
+            [data["phone_number"] for data in valid.values()],
+        )
+        clashes = [
+            {"row": index, "errors": row_errors}
+            for index, data in valid.items()
+            if (row_errors := taken_fields(data["email"], data["phone_number"], taken))
+        ]
+        return [], clashes or [
+            {
+                "row": None,
+                "errors": {
+                    "non_field_errors": ["Batch conflicts with existing users, retry."]
+                },
+            }
+        ]
+
+    return students, []
+
+
+def complete_group(group):
+    """
+    Marks `group` COMPLETED and its STUDYING students GRADUATED: one UPDATE each, one transaction.
+    - a TERMINATED group is left as it is (checked in the UPDATE itself), returns None
+    - `updated_at` is set explicitly (UPDATE skips auto_now), so list / detail ETags change
+    - no scope cache to drop: memberships do not change
+    - change events for the group and every graduated student (whose ids are read first)
+    `Student.clean()` is not needed: it only checks the linked user, which a status change keeps.
+
+    Returns `{"group_id", "status", "graduated"}`.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        updated = (
+            Group.objects.filter(pk=group.pk)
+            .exclude(status=GroupStatus.TERMINATED)
+            .update(status=GroupStatus.COMPLETED, updated_at=now)
+        )
+        if not updated:
+            return None
+
+        # INFO: the ids are needed for the change events, read and locked first
+        graduating = list(
+            Student.objects.filter(group_id=group.pk, status=StudentStatus.STUDYING)
+            .select_for_update()
+            .values_list("pk", flat=True)
+        )
+        graduated = Student.objects.filter(pk__in=graduating).update(
+            status=StudentStatus.GRADUATED, updated_at=now
+        )
+        record_changes(Group, ChangeAction.UPDATED, [group.pk])
+        record_changes(Student, ChangeAction.UPDATED, graduating)
+        if group_counters_enabled() and graduated:
+            Group.adjust_counters(
+                {
+                    (group.pk, StudentStatus.STUDYING): -graduated,
+                    (group.pk, StudentStatus.GRADUATED): graduated,
+                }
+            )
+
+    return {
+        "group_id": group.pk,
+        "status": GroupStatus.COMPLETED.value,
+        "graduated": graduated,
+    }
+
+
+def bulk_move_students(student_ids, group_id, request_user):
+    """
+    Moves students to another group with one UPDATE.
+    - target group: must exist, a teacher must teach it (one query)
+    - students: read and locked in one query, within the user's scope (a teacher's own groups);
+      any id outside it fails the whole request, without telling "missing" from "not yours"
+    - change events, group counters and the moved students' scope cache entries follow the move
+    `Student.clean()` is not needed: it only checks the linked user, which a move keeps.
+
+    Returns `(summary, errors)`, `summary` is `{"group_id", "moved", "unchanged"}`.
+    """
+    student_ids = set(student_ids)
+    teacher_id = (
+        Group.objects.filter(pk=group_id).values_list("teacher_id", flat=True).first()
+    )
+    if teacher_id is None:
+        return None, {"group_id": [f'Invalid pk "{group_id}" - object does not exist.']}
+
+    is_teacher = getattr(request_user, "role", None) == RoleType.TEACHER
+    if is_teacher and teacher_id != request_user.pk:
+        return None, {"group_id": ["You can only assign students to groups you teach."]}
+
+    students = Student.objects.filter(pk__in=student_ids)
+    if is_teacher:
+        students = students.filter(group__teacher_id=request_user.pk)
+
+    with transaction.atomic():
+        # INFO: `of` keeps the lock on student rows only, not on the joined groups
+        rows = list(
+            students.select_for_update(of=("self",)).values_list(
+                "pk", "group_id", "status"
+            )
+        )
+        unknown = student_ids - {pk for pk, _, _ in rows}
+        if unknown:
+            return None, {
+                "student_ids": [
+                    f'Invalid pk "{pk}" - object does not exist.'
+                    for pk in sorted(unknown, key=str)
+                ]
+            }
+
+        moving = [
+            (pk, group, status) for pk, group, status in rows if group != group_id
+        ]
+        if moving:
+            Student.objects.filter(pk__in=[pk for pk, _, _ in moving]).update(
+                group_id=group_id, updated_at=timezone.now()
+            )
+        record_changes(Student, ChangeAction.UPDATED, [pk for pk, _, _ in moving])
+        if group_counters_enabled() and moving:
+            deltas = Counter()
+            for _, group, status in moving:
+                deltas[(group, status)] -= 1
+                deltas[(group_id, status)] += 1
+            Group.adjust_counters(deltas)
+
+    # INFO: UPDATE sends no post_save, drop what users.signals would have dropped
+    invalidate_user_scope(*(pk for pk, _, _ in moving))
+    return {
+        "group_id": group_id,
+        "moved": len(moving),
+        "unchanged": len(rows) - len(moving),
+    }, {}
+
+
+def group_stats(groups):
+    """
+    Per-group student counts by status for `groups` (a Group queryset), in one query.
+    Reads the denormalized counters when GROUP_COUNTERS is on, otherwise
+    aggregates with `COUNT(...) FILTER (WHERE status = ...)` grouped by group.
+    """
+    fields = list(STUDENT_COUNTER_FIELDS.values())
+    if not group_counters_enabled():
+        groups = groups.annotate(
+            **{
+                f"live_{field}": Count("students", filter=Q(students__status=status))
+                for status, field in STUDENT_COUNTER_FIELDS.items()
+            }
+        )
+        fields = [f"live_{field}" for field in fields]
+
+    rows = []
+    for group in groups.order_by("name").values("id", "name", "status", *fields):
+        counts = {
+            status.value: group[field]
+            for status, field in zip(STUDENT_COUNTER_FIELDS, fields)
+        }
+        counts["total"] = sum(counts.values())
+        rows.append(
+            {
+                "id": group["id"],
+                "name": group["name"],
+                "status": group["status"],
+                "students": counts,
+            }
+        )
+    return rows
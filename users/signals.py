@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import token_version_cache_key
+from .models import Group, Student, User, group_counters_enabled
+from .scopes import invalidate_user_scope
+
+
+def invalidate_token_version(user_id):
+    # INFO: after commit, like the scopes: earlier, a concurrent request could cache the old version
+    key = token_version_cache_key(user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(post_save, sender=User)
+def user_token_version_changed(sender, instance, **kwargs):
+    invalidate_token_version(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    invalidate_token_version(instance.pk)
+    invalidate_user_scope(instance.pk)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def student_scope_changed(sender, instance, **kwargs):
+    invalidate_user_scope(instance.user_id)
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, **kwargs):
+    # INFO: runs inside the delete transaction, also for cascades from User
+    if group_counters_enabled():
+        Group.adjust_counters({(instance.group_id, instance.status): -1})
@@ -1,3 +1,1800 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import decimal
+import io
+import json
+import threading
+import uuid
+from itertools import count
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from config.urls import async_read_urls, urlpatterns
+
+from . import revocation
+from .hashers import MachinePBKDF2PasswordHasher
+from .identity import taken_identities
+from .jobs import (
+    JOB_HANDLERS,
+    claim_job,
+    heartbeat,
+    requeue_stale_jobs,
+    run_job,
+    submit_job,
+)
+from .middleware import counts_toward_budget
+from .models import (
+    ChangeAction,
+    ChangeEvent,
+    Group,
+    GroupStatus,
+    Job,
+    JobStatus,
+    RevokedToken,
+    RoleType,
+    Student,
+    StudentStatus,
+    Teacher,
+    User,
+)
+from .permissions import IsAdminOrTeacherCanWrite
+from .projections import get_projection
+from .renderers import FastJSONRenderer
+from .scopes import get_user_scope, scope_cache_key
+from .serializers import (
+    GroupCompactSerializer,
+    GroupSerializer,
+    StudentCompactSerializer,
+    StudentSerializer,
+    TeacherSerializer,
+)
+from .services import bulk_move_students, complete_group
+from .tokens import ClaimsTokenObtainPairSerializer, ClaimsTokenRefreshSerializer
+from .views import GroupViewSet, JobViewSet, StudentViewSet, TeacherViewSet
+
+API = "/api/v1"
+
+_phones = count()
+
+# INFO: quotes, backslashes, control characters, non-ASCII and the two JavaScript line breaks
+AWKWARD_TEXT = 'Zoë "Q" \\ O\'Neil\t\n\x01 \u2028\u2029 😀'
+
+
+@override_settings(
+    # INFO: ConditionalGetMixin would otherwise serve the second request from the first one's cache
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+    QUERY_BUDGET={"ENABLED": False},
+)
+class FastReadConformanceTests(TestCase):
+    """
+    The values() fast read path (FAST_READS) and FastJSONRenderer must give the exact bytes
+    of the serializers + JSONRenderer.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="x",
+            phone_number="+1000",
+            role=RoleType.ADMIN,
+        )
+        teachers = []
+        for i, (first_name, specialization) in enumerate(
+            [(AWKWARD_TEXT, None), ("Ann", "Math"), ("Bob", "")]
+        ):
+            user = User.objects.create_user(
+                email=f"teacher{i}@example.com",
+                password="x",
+                first_name=first_name,
+                last_name=f"Teacher {i}",
+                phone_number=f"+2000{i}",
+                role=RoleType.TEACHER,
+            )
+            teachers.append(
+                Teacher.objects.create(
+                    user=user,
+                    specialization=specialization,
+                    hired_date=datetime.date(2020, 1, i + 1),
+                )
+            )
+        cls.teacher = teachers[0].user
+
+        groups = [
+            Group.objects.create(
+                name=f"Group {i} {AWKWARD_TEXT if i == 0 else ''}",
+                description="" if i % 2 else f"Description {i}",
+                subject=["Math", "Physics"][i % 2],
+                status=[GroupStatus.STUDYING, GroupStatus.COMPLETED][i % 2],
+                teacher=teachers[i % len(teachers)],
+            )
+            for i in range(5)
+        ]
+        for i in range(25):
+            user = User.objects.create_user(
+                email=f"student{i}@example.com",
+                password="x",
+                first_name=AWKWARD_TEXT if i == 3 else f"Student {i}",
+                last_name=f"Last {i}",
+                phone_number=f"+3000{i}",
+                role=RoleType.STUDENT,
+            )
+            Student.objects.create(
+                user=user,
+                group=groups[i % len(groups)],
+                date_of_birth=datetime.date(2000, 1, 1) + datetime.timedelta(days=i),
+                enrollment_date=datetime.date(2024, 9, 1)
+                + datetime.timedelta(days=i % 3),
+                status=[StudentStatus.STUDYING, StudentStatus.EXPELLED][i % 2],
+            )
+        cls.student = user
+
+    def get_both(self, user, path):
+        client = APIClient()
+        client.force_authenticate(user)
+        with self.settings(FAST_READS=False):
+            slow = client.get(path)
+        with self.settings(FAST_READS=True):
+            fast = client.get(path)
+        self.assertEqual(slow.status_code, 200, slow.content)
+        self.assertEqual(fast.status_code, 200, fast.content)
+        return slow, fast
+
+    def assertSameBytes(self, user, path):
+        slow, fast = self.get_both(user, path)
+        self.assertEqual(fast.content, slow.content, path)
+        self.assertEqual(fast["Content-Type"], slow["Content-Type"])
+        return fast
+
+    def test_lists_are_byte_identical(self):
+        paths = [
+            "/api/v1/students/",
+            "/api/v1/students/?page_size=100",
+            "/api/v1/students/?ordering=-enrollment_date&page_size=7",
+            "/api/v1/students/?status=EXPELLED&search=st",
+            "/api/v1/students/?count=true",
+            "/api/v1/groups/?page_size=100",
+            "/api/v1/groups/?ordering=-name",
+            "/api/v1/teachers/?page_size=100",
+            "/api/v1/teachers/?subject=Math",
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                self.assertSameBytes(self.admin, path)
+
+        for user in (self.teacher, self.student):
+            for path in ("/api/v1/students/", "/api/v1/groups/"):
+                with self.subTest(user=user.role, path=path):
+                    self.assertSameBytes(user, path)
+
+    def test_following_pages_are_byte_identical(self):
+        path = "/api/v1/students/?ordering=-enrollment_date&page_size=4"
+        pages = 0
+        while path:
+            response = self.assertSameBytes(self.admin, path)
+            path = response.json()["next"]
+            pages += 1
+        self.assertEqual(pages, 7)
+
+    def test_mapper_matches_serializer(self):
+        cases = [
+            (StudentSerializer, Student.objects.select_related("group__teacher__user")),
+            (StudentCompactSerializer, Student.objects.select_related("user", "group")),
+            (GroupSerializer, Group.objects.select_related("teacher__user")),
+            (GroupCompactSerializer, Group.objects.all()),
+            (TeacherSerializer, Teacher.objects.select_related("user")),
+        ]
+        for serializer_class, queryset in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                projection = get_projection(serializer_class)
+                self.assertIsNotNone(projection)
+                queryset = queryset.order_by("pk")
+                expected = serializer_class(queryset, many=True).data
+                mapped = [
+                    projection.map_row(row) for row in projection.values(queryset)
+                ]
+                self.assertEqual(
+                    JSONRenderer().render(mapped), JSONRenderer().render(expected)
+                )
+
+    def test_renderer_bytes(self):
+        payloads = [
+            {"text": AWKWARD_TEXT, "none": None, "bool": True, "int": -(2**40)},
+            [
+                {"id": uuid.uuid4(), "at": timezone.now()},
+                {"date": datetime.date.today()},
+            ],
+            {"decimal": decimal.Decimal("1.10"), "time": datetime.time(10, 30)},
+            {"big": 2**80, "nested": {"list": [1, 2.5, "x"]}},
+            {"at": datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)},
+            [],
+            "",
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertEqual(
+                    FastJSONRenderer().render(payload), JSONRenderer().render(payload)
+                )
+
+
+def create_user(email, role=RoleType.STUDENT, **extra):
+    return User.objects.create_user(
+        email=email,
+        password="pw",
+        first_name=email.split("@")[0],
+        phone_number=f"+9{next(_phones):06d}",
+        role=role,
+        **extra,
+    )
+
+
+def api_client(user=None):
+    client = APIClient()
+    if user is not None:
+        client.force_authenticate(user)
+    return client
+
+
+@override_settings(
+    # INFO: no scope / token-version / payload entries left over from another test
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "local": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+    QUERY_BUDGET={"ENABLED": False},
+)
+class RosterTestCase(TestCase):
+    """
+    An admin, two teachers with a group each and a student in the first teacher's group.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user("admin@example.com", RoleType.ADMIN, is_staff=True)
+        cls.teacher = create_user("teacher@example.com", RoleType.TEACHER)
+        cls.other_teacher = create_user("other@example.com", RoleType.TEACHER)
+        cls.group = Group.objects.create(
+            name="Group A",
+            subject="Math",
+            teacher=Teacher.objects.create(user=cls.teacher),
+        )
+        cls.other_group = Group.objects.create(
+            name="Group B",
+            subject="Physics",
+            teacher=Teacher.objects.create(user=cls.other_teacher),
+        )
+        cls.student = create_user("student@example.com")
+        Student.objects.create(
+            user=cls.student, group=cls.group, date_of_birth=datetime.date(2005, 1, 1)
+        )
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "local": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+)
+class ScopeCacheTests(RosterTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_teacher_writes_are_authorized_from_the_student_row(self):
+        request = APIRequestFactory().patch(f"{API}/students/{self.student.pk}/")
+        request.user = self.other_teacher
+        student = Student.objects.select_related("group").get(pk=self.student.pk)
+
+        permission = IsAdminOrTeacherCanWrite()
+
+        self.assertFalse(permission.has_object_permission(request, None, student))
+        request.user = self.teacher
+        self.assertTrue(permission.has_object_permission(request, None, student))
+
+    def test_only_student_scopes_are_cached(self):
+        for user in (self.admin, self.teacher, self.student):
+            request = APIRequestFactory().get(f"{API}/groups/")
+            request.user = user
+            with self.subTest(role=user.role):
+                scope = get_user_scope(request)
+
+                self.assertEqual(scope.role, user.role)
+                cached = cache.get(scope_cache_key(user.pk))
+                self.assertEqual(cached, scope if user == self.student else None)
+        self.assertEqual(scope.student_group_id, self.group.pk)
+
+    def test_scopes_are_dropped_after_commit(self):
+        api_client(self.student).get(f"{API}/groups/")
+        key = scope_cache_key(self.student.pk)
+        self.assertIsNotNone(cache.get(key))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                student = Student.objects.get(pk=self.student.pk)
+                student.group = self.other_group
+                student.save()
+            # INFO: until the move is committed, its old scope is still the current one
+            self.assertIsNotNone(cache.get(key))
+
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(key))
+
+
+class TokenVersionTests(RosterTestCase):
+    path = f"{API}/teachers/"
+
+    def bearer_client(self, user):
+        client = APIClient()
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_demotion_revokes_issued_tokens(self):
+        client = self.bearer_client(self.admin)
+        self.assertEqual(client.get(self.path).status_code, 200)
+
+        admin = User.objects.get(pk=self.admin.pk)
+        admin.role = RoleType.TEACHER
+        admin.save()
+
+        self.assertEqual(client.get(self.path).status_code, 401)
+        self.assertEqual(self.bearer_client(admin).get(self.path).status_code, 403)
+
+    def test_staff_and_superuser_flags_revoke_issued_tokens(self):
+        for flag in ("is_staff", "is_superuser"):
+            user = User.objects.get(pk=self.admin.pk)
+            version = user.token_version
+            setattr(user, flag, not getattr(user, flag))
+            user.save(update_fields=[flag])
+
+            user.refresh_from_db()
+            self.assertEqual(user.token_version, version + 1, flag)
+
+    def test_other_changes_keep_issued_tokens(self):
+        client = self.bearer_client(self.admin)
+
+        admin = User.objects.get(pk=self.admin.pk)
+        admin.first_name = "Renamed"
+        admin.save()
+        admin.save()
+
+        self.assertEqual(client.get(self.path).status_code, 200)
+
+    def test_only_deactivation_bumps_for_inactive_users(self):
+        user = User.objects.get(pk=self.student.pk)
+        version = user.token_version
+
+        user.is_active = False
+        user.save()
+        user.first_name = "Renamed"
+        user.save()
+        User.objects.get(pk=user.pk).save()
+
+        user.refresh_from_db()
+        self.assertEqual(user.token_version, version + 1)
+        user.is_active = True
+        user.save()
+        user.refresh_from_db()
+        self.assertEqual(user.token_version, version + 1)
+
+
+def throttle_rates(**rates):
+    return {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+
+
+class LoginThrottleTests(RosterTestCase):
+    path = f"{API}/token/"
+
+    def setUp(self):
+        caches["local"].clear()
+
+    def login(self, email, password="pw", ip="192.0.2.1"):
+        return APIClient(REMOTE_ADDR=ip).post(
+            self.path, {"email": email, "password": password}, format="json"
+        )
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(login="3/min"))
+    def test_ip_bucket_exhaustion(self):
+        statuses = [
+            self.login(f"nobody{n}@example.com", "wrong").status_code for n in range(4)
+        ]
+
+        self.assertEqual(statuses, [401, 401, 401, 429])
+        response = self.login(self.student.email)
+        self.assertEqual(response.status_code, 429)
+        # INFO: one token back every 20 seconds
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 20)
+        self.assertEqual(
+            self.login(self.student.email, ip="192.0.2.2").status_code, 200
+        )
+
+    @override_settings(
+        REST_FRAMEWORK=throttle_rates(login="30/min", login_email="2/min")
+    )
+    def test_email_bucket_spans_ips(self):
+        statuses = [
+            self.login(self.student.email, "wrong", ip=f"192.0.2.{n}").status_code
+            for n in range(1, 4)
+        ]
+
+        self.assertEqual(statuses, [401, 401, 429])
+        self.assertEqual(
+            self.login(self.student.email.upper(), ip="192.0.2.9").status_code, 429
+        )
+        self.assertEqual(self.login(self.teacher.email).status_code, 200)
+
+    @override_settings(
+        REST_FRAMEWORK=throttle_rates(), LOGIN_VERIFICATION_CACHE_TIMEOUT=60
+    )
+    def test_password_change_invalidates_cached_verification(self):
+        with mock.patch.object(
+            User, "check_password", autospec=True, side_effect=User.check_password
+        ) as check_password:
+            self.assertEqual(self.login(self.student.email).status_code, 200)
+            self.assertEqual(self.login(self.student.email).status_code, 200)
+            self.assertEqual(check_password.call_count, 1)
+
+            student = User.objects.get(pk=self.student.pk)
+            student.set_password("new-pw")
+            student.save()
+
+            self.assertEqual(self.login(self.student.email).status_code, 401)
+            self.assertEqual(self.login(self.student.email, "new-pw").status_code, 200)
+            self.assertEqual(check_password.call_count, 3)
+
+
+class RefreshRotationTests(RosterTestCase):
+    path = f"{API}/token/refresh/"
+
+    def setUp(self):
+        caches["local"].clear()
+        # INFO: every test starts with this process's filter still to be built
+        patcher = mock.patch.object(revocation, "_filter", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def refresh_token(self):
+        return str(ClaimsTokenObtainPairSerializer.get_token(self.student))
+
+    def rotate(self, refresh):
+        return APIClient().post(self.path, {"refresh": refresh}, format="json")
+
+    def test_refresh_token_works_once(self):
+        refresh = self.refresh_token()
+
+        first = self.rotate(refresh)
+        self.assertEqual(first.status_code, 200, first.data)
+        self.assertEqual(self.rotate(refresh).status_code, 401)
+        self.assertEqual(self.rotate(first.data["refresh"]).status_code, 200)
+
+    def test_concurrent_rotation_fails(self):
+        refresh = RefreshToken(self.refresh_token())
+        revocation.revocation_filter()
+        # INFO: rotated by another process, this process's filter has not seen it yet
+        RevokedToken.objects.create(
+            jti=refresh["jti"], expires_at=datetime_from_epoch(refresh["exp"])
+        )
+        self.assertNotIn(refresh["jti"], revocation.revocation_filter())
+
+        serializer = ClaimsTokenRefreshSerializer(data={"refresh": str(refresh)})
+        with self.assertRaises(TokenError):
+            serializer.is_valid()
+
+    def test_prune_deletes_expired_tokens_only(self):
+        now = timezone.now()
+        RevokedToken.objects.create(
+            jti="expired", expires_at=now - datetime.timedelta(minutes=1)
+        )
+        RevokedToken.objects.create(
+            jti="valid", expires_at=now + datetime.timedelta(days=1)
+        )
+
+        out = io.StringIO()
+        call_command("prune_revoked_tokens", "--dry-run", stdout=out)
+        self.assertIn("would delete 1 ", out.getvalue())
+        self.assertEqual(RevokedToken.objects.count(), 2)
+
+        call_command("prune_revoked_tokens", stdout=io.StringIO())
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["valid"]
+        )
+
+
+class IdentityTests(RosterTestCase):
+    def teacher_payload(self, **extra):
+        return {
+            "email": "new.teacher@example.com",
+            "password": "teacher-password",
+            "first_name": "New",
+            "last_name": "Teacher",
+            "phone_number": "+15550000001",
+            **extra,
+        }
+
+    def create_teacher(self, **extra):
+        return api_client(self.admin).post(
+            f"{API}/teachers/", self.teacher_payload(**extra), format="json"
+        )
+
+    def test_create_with_taken_email(self):
+        # INFO: stored with the domain lower-cased
+        response = self.create_teacher(email="student@EXAMPLE.COM")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"email"})
+
+    def test_create_with_taken_phone_number(self):
+        response = self.create_teacher(phone_number=self.student.phone_number)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"phone_number"})
+
+    def test_update_keeping_own_email(self):
+        response = api_client(self.admin).patch(
+            f"{API}/students/{self.student.pk}/",
+            {"email": self.student.email, "first_name": "Renamed"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["first_name"], "Renamed")
+
+    def test_concurrent_insert_is_reported_as_field_errors(self):
+        # INFO: the pre-check passes, as it would for a user inserted right after it
+        with mock.patch("users.identity.IdentityValidationMixin.validate_identity"):
+            for field, value in (
+                ("email", self.student.email),
+                ("phone_number", self.student.phone_number),
+            ):
+                with self.subTest(field=field):
+                    response = self.create_teacher(**{field: value})
+
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(set(response.data), {field})
+
+        self.assertFalse(User.objects.filter(email="new.teacher@example.com").exists())
+
+
+class BulkEnrollmentTests(RosterTestCase):
+    path = f"{API}/students/bulk/"
+
+    def row(self, n, **extra):
+        return {
+            "email": f"bulk{n}@example.com",
+            "password": "bulk-password",
+            "first_name": f"Bulk {n}",
+            "phone_number": f"+5{n:06d}",
+            "date_of_birth": "2006-05-01",
+            "group_id": str(self.group.pk),
+            **extra,
+        }
+
+    def test_creates_students(self):
+        response = api_client(self.admin).post(
+            self.path, [self.row(1), self.row(2)], format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created"], 2)
+        student = Student.objects.select_related("user").get(
+            user__email="bulk1@example.com"
+        )
+        self.assertEqual(student.group_id, self.group.pk)
+        self.assertTrue(student.user.check_password("bulk-password"))
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "users.hashers.MachinePBKDF2PasswordHasher",
+        ]
+    )
+    def test_machine_hash_is_upgraded_on_first_login(self):
+        caches["local"].clear()
+        response = api_client(self.admin).post(self.path, [self.row(1)], format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+
+        def algorithm():
+            password = User.objects.get(email="bulk1@example.com").password
+            return password.partition("$")[0]
+
+        def login(password):
+            return APIClient().post(
+                f"{API}/token/",
+                {"email": "bulk1@example.com", "password": password},
+                format="json",
+            )
+
+        self.assertEqual(algorithm(), MachinePBKDF2PasswordHasher.algorithm)
+        self.assertEqual(login("wrong").status_code, 401)
+        self.assertEqual(algorithm(), MachinePBKDF2PasswordHasher.algorithm)
+
+        self.assertEqual(login("bulk-password").status_code, 200)
+        self.assertEqual(algorithm(), PBKDF2PasswordHasher.algorithm)
+        self.assertEqual(login("bulk-password").status_code, 200)
+
+    def test_background_enrollment_never_stores_plaintext_passwords(self):
+        with mock.patch("users.services.hash_passwords") as hash_passwords:
+            response = api_client(self.admin).post(
+                f"{self.path}?async=true", [self.row(1), self.row(2)], format="json"
+            )
+        self.assertEqual(response.status_code, 202, response.data)
+        # INFO: hashing is the worker's job
+        hash_passwords.assert_not_called()
+
+        job = Job.objects.get()
+        self.assertNotIn("bulk-password", json.dumps(job.payload))
+        self.assertNotIn("bulk1@example.com", json.dumps(job.payload))
+
+        job = run_job(claim_job("test"))
+        self.assertEqual(job.status, JobStatus.SUCCEEDED, job.result)
+        self.assertIsNone(job.payload)
+        student = Student.objects.select_related("user").get(
+            user__email="bulk2@example.com"
+        )
+        self.assertTrue(student.user.check_password("bulk-password"))
+
+    def test_background_enrollment_checks_rows_before_queueing(self):
+        rows = [
+            self.row(1, email=self.student.email),
+            self.row(2, email="not-an-email"),
+        ]
+        response = api_client(self.admin).post(
+            f"{self.path}?async=true", rows, format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [0, 1])
+        self.assertFalse(Job.objects.exists())
+
+    def test_tampered_rows_fail_the_job(self):
+        api_client(self.admin).post(
+            f"{self.path}?async=true", [self.row(1)], format="json"
+        )
+        job = Job.objects.get()
+        sealed = job.payload["rows"]
+        job.payload = {
+            "rows": sealed[:-4] + ("AAAA" if sealed[-4:] != "AAAA" else "BBBB")
+        }
+        job.save(update_fields=["payload"])
+
+        job = run_job(claim_job("test"))
+
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertEqual(job.result, {"detail": "The rows cannot be decrypted."})
+        self.assertFalse(User.objects.filter(email="bulk1@example.com").exists())
+
+    def test_duplicates_within_batch(self):
+        rows = [self.row(1), self.row(2, email="bulk1@example.com"), self.row(3)]
+        rows[2]["phone_number"] = rows[0]["phone_number"]
+        response = api_client(self.admin).post(self.path, rows, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(set(errors), {0, 1, 2})
+        self.assertEqual(errors[1]["email"], ["Duplicate email in this batch."])
+        self.assertEqual(
+            errors[2]["phone_number"], ["Duplicate phone number in this batch."]
+        )
+        self.assertFalse(User.objects.filter(email__startswith="bulk").exists())
+
+    def test_clash_with_existing_users(self):
+        rows = [
+            self.row(1, email=self.student.email),
+            self.row(2, phone_number=self.teacher.phone_number),
+            self.row(3),
+        ]
+        response = api_client(self.admin).post(self.path, rows, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["errors"],
+            [
+                {"row": 0, "errors": {"email": ["Email must be unique."]}},
+                {
+                    "row": 1,
+                    "errors": {"phone_number": ["Phone number must be unique."]},
+                },
+            ],
+        )
+        self.assertFalse(User.objects.filter(email="bulk3@example.com").exists())
+
+    def test_concurrent_insert_is_reported_per_row(self):
+        rows = [self.row(1), self.row(2, phone_number=self.teacher.phone_number)]
+        # INFO: the pre-check misses the user, as it would one inserted right after it
+        misses = iter([{"email": set(), "phone_number": set()}])
+
+        def stale_first(*args):
+            return next(misses, None) or taken_identities(*args)
+
+        with mock.patch("users.services.taken_identities", side_effect=stale_first):
+            response = api_client(self.admin).post(self.path, rows, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["errors"],
+            [{"row": 1, "errors": {"phone_number": ["Phone number must be unique."]}}],
+        )
+        self.assertFalse(User.objects.filter(email__startswith="bulk").exists())
+
+    def test_teacher_cannot_enroll_into_other_group(self):
+        rows = [self.row(1), self.row(2, group_id=str(self.other_group.pk))]
+        response = api_client(self.teacher).post(self.path, rows, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["errors"],
+            [
+                {
+                    "row": 1,
+                    "errors": {
+                        "group_id": [
+                            "You can only assign students to groups you teach."
+                        ]
+                    },
+                }
+            ],
+        )
+        self.assertEqual(Student.objects.count(), 1)
+
+    def test_csv_upload(self):
+        body = (
+            "email,password,first_name,phone_number,date_of_birth,group_id,status\n"
+            f"csv1@example.com,pw-1,Csv,+6000001,2006-01-02,{self.group.pk},\n"
+            f"csv2@example.com,pw-2,Csv,+6000002,2006-01-03,{self.group.pk},EXPELLED\n"
+        )
+        response = api_client(self.admin).post(self.path, body, content_type="text/csv")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        statuses = dict(
+            Student.objects.filter(user__email__startswith="csv").values_list(
+                "user__email", "status"
+            )
+        )
+        self.assertEqual(
+            statuses,
+            {
+                "csv1@example.com": StudentStatus.STUDYING,
+                "csv2@example.com": StudentStatus.EXPELLED,
+            },
+        )
+
+    def test_queries_do_not_grow_with_rows(self):
+        client = api_client(self.admin)
+
+        def queries(rows):
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.post(self.path, rows, format="json")
+            self.assertEqual(response.status_code, 201, response.data)
+            return len(ctx.captured_queries)
+
+        # INFO: hash inline, the process pool is not what is measured here
+        with mock.patch("users.hashers.POOL_MIN_BATCH", 10_000):
+            few = queries([self.row(n) for n in range(2)])
+            many = queries([self.row(n) for n in range(100, 150)])
+        self.assertEqual(few, many)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "local": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+)
+class ConditionalGetTests(RosterTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get(self, user, path, etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return api_client(user).get(path, headers=headers)
+
+    def etag(self, user, path):
+        response = self.get(user, path)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response["ETag"]
+
+    def test_if_none_match_on_list_and_retrieve(self):
+        for path in (
+            f"{API}/students/",
+            f"{API}/groups/",
+            f"{API}/students/{self.student.pk}/",
+            f"{API}/groups/{self.group.pk}/",
+        ):
+            with self.subTest(path=path):
+                etag = self.etag(self.admin, path)
+
+                response = self.get(self.admin, path, etag)
+
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response["ETag"], etag)
+                self.assertEqual(response.content, b"")
+
+    def test_etags_change_with_nested_teacher_user(self):
+        paths = [f"{API}/groups/{self.group.pk}/", f"{API}/students/"]
+        before = [self.etag(self.admin, path) for path in paths]
+
+        teacher = User.objects.get(pk=self.teacher.pk)
+        teacher.first_name = "Renamed"
+        teacher.save()
+
+        for path, etag in zip(paths, before):
+            with self.subTest(path=path):
+                response = self.get(self.admin, path, etag)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+                self.assertIn("Renamed", response.content.decode())
+
+    def test_etags_change_after_complete_group(self):
+        paths = [f"{API}/groups/{self.group.pk}/", f"{API}/students/{self.student.pk}/"]
+        before = [self.etag(self.teacher, path) for path in paths]
+
+        complete_group(self.group)
+
+        for path, etag in zip(paths, before):
+            with self.subTest(path=path):
+                response = self.get(self.teacher, path, etag)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(GroupStatus.COMPLETED.value, response.content.decode())
+
+    def test_etags_change_after_bulk_move(self):
+        path = f"{API}/students/{self.student.pk}/"
+        etag = self.etag(self.admin, path)
+        list_etag = self.etag(self.admin, f"{API}/students/")
+
+        bulk_move_students([self.student.pk], self.other_group.pk, self.admin)
+
+        response = self.get(self.admin, path, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["group"]["id"], str(self.other_group.pk))
+        self.assertEqual(
+            self.get(self.admin, f"{API}/students/", list_etag).status_code, 200
+        )
+
+    def test_validators_and_cached_payloads_are_per_user_for_non_admins(self):
+        classmate = create_user("classmate@example.com")
+        Student.objects.create(
+            user=classmate, group=self.group, date_of_birth=datetime.date(2005, 2, 2)
+        )
+        path = f"{API}/groups/"
+
+        etag = self.etag(self.student, path)
+
+        # INFO: the same rows, but a payload cached for one user is never served to another
+        self.assertNotEqual(self.etag(classmate, path), etag)
+        self.assertEqual(self.get(classmate, path, etag).status_code, 200)
+        self.assertEqual(self.get(self.student, path, etag).status_code, 304)
+        other_admin = create_user("admin2@example.com", RoleType.ADMIN)
+        self.assertEqual(self.etag(other_admin, path), self.etag(self.admin, path))
+
+
+class OrderingTests(RosterTestCase):
+    path = f"{API}/students/"
+
+    def setUp(self):
+        self.later = create_user("later@example.com")
+        Student.objects.create(
+            user=self.later,
+            group=self.group,
+            date_of_birth=datetime.date(2005, 1, 1),
+            enrollment_date=datetime.date(2020, 1, 1),
+        )
+
+    def emails(self, query):
+        response = api_client(self.admin).get(f"{self.path}?{query}")
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row["email"] for row in response.data["results"]]
+
+    def test_indexed_orderings(self):
+        self.assertEqual(
+            self.emails("ordering=enrollment_date"),
+            [self.later.email, self.student.email],
+        )
+        self.assertEqual(
+            self.emails("ordering=-enrollment_date"),
+            [self.student.email, self.later.email],
+        )
+        # INFO: the view's `ordering`, created_at
+        self.assertEqual(self.emails(""), [self.student.email, self.later.email])
+
+    def test_other_orderings_are_rejected(self):
+        for ordering in (
+            "status",
+            "-user__email",
+            "nope",
+            "created_at,enrollment_date",
+        ):
+            with self.subTest(ordering=ordering):
+                response = api_client(self.admin).get(self.path, {"ordering": ordering})
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("ordering", response.data)
+
+
+class JobRunTests(RosterTestCase):
+    def claim(self, handler):
+        self.enterContext(mock.patch.dict(JOB_HANDLERS, {"test.job": handler}))
+        submit_job("test.job", {}, self.admin)
+        return claim_job("worker-1")
+
+    def test_jobs_with_a_recent_heartbeat_are_not_requeued(self):
+        job = self.claim(lambda job: None)
+        long_ago = timezone.now() - datetime.timedelta(hours=1)
+        Job.objects.filter(pk=job.pk).update(started_at=long_ago)
+
+        self.assertEqual(requeue_stale_jobs(600), (0, 0))
+
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=long_ago)
+        self.assertEqual(requeue_stale_jobs(600), (1, 0))
+
+    def test_heartbeat_refreshes_the_owned_row(self):
+        job = self.claim(lambda job: None)
+        beats = threading.Event()
+        owned = mock.Mock()
+        owned.return_value.update.side_effect = lambda **fields: beats.set()
+
+        with mock.patch("users.jobs._owned", owned), heartbeat(job, 0.01):
+            self.assertTrue(beats.wait(5))
+
+        owned.assert_called_with(job)
+        self.assertIn("heartbeat_at", owned.return_value.update.call_args.kwargs)
+
+    def test_requeued_run_does_not_store_its_outcome(self):
+        def slow(job):
+            # INFO: taken for abandoned meanwhile, and claimed by another worker
+            Job.objects.filter(pk=job.pk).update(
+                heartbeat_at=timezone.now() - datetime.timedelta(hours=1)
+            )
+            requeue_stale_jobs(600)
+            claim_job("worker-2")
+            return {"done": True}
+
+        job = run_job(self.claim(slow))
+
+        self.assertEqual(job.status, JobStatus.RUNNING)
+        self.assertEqual(job.worker, "worker-2")
+        self.assertIsNone(job.result)
+
+    def test_owned_run_stores_its_outcome(self):
+        job = run_job(self.claim(lambda job: {"done": True}))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(job.result, {"done": True})
+        self.assertIsNone(job.payload)
+
+
+@override_settings(GROUP_COUNTERS=True)
+class GroupActionTests(RosterTestCase):
+    move_path = f"{API}/students/bulk-move/"
+
+    def complete_path(self, group):
+        return f"{API}/groups/{group.pk}/complete/"
+
+    def events(self, entity):
+        return set(
+            ChangeEvent.objects.filter(entity=entity).values_list("entity_id", "action")
+        )
+
+    def test_teacher_cannot_move_students_to_another_teachers_group(self):
+        response = api_client(self.teacher).post(
+            self.move_path,
+            {
+                "student_ids": [str(self.student.pk)],
+                "group_id": str(self.other_group.pk),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("group_id", response.data)
+        self.assertEqual(
+            Student.objects.get(pk=self.student.pk).group_id, self.group.pk
+        )
+
+    def test_move_writes_counters_and_events(self):
+        response = api_client(self.admin).post(
+            self.move_path,
+            {
+                "student_ids": [str(self.student.pk)],
+                "group_id": str(self.other_group.pk),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["moved"], 1)
+        self.group.refresh_from_db()
+        self.other_group.refresh_from_db()
+        self.assertEqual(
+            (self.group.students_studying, self.other_group.students_studying), (0, 1)
+        )
+        self.assertEqual(
+            self.events("student"), {(self.student.pk, ChangeAction.UPDATED)}
+        )
+
+    def test_complete_other_teachers_group(self):
+        response = api_client(self.teacher).post(self.complete_path(self.other_group))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_student_cannot_complete(self):
+        response = api_client(self.student).post(self.complete_path(self.group))
+
+        self.assertEqual(response.status_code, 403)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.status, GroupStatus.STUDYING)
+
+    def test_complete_writes_counters_and_events(self):
+        response = api_client(self.teacher).post(self.complete_path(self.group))
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["graduated"], 1)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.status, GroupStatus.COMPLETED)
+        self.assertEqual(
+            (self.group.students_studying, self.group.students_graduated), (0, 1)
+        )
+        self.assertEqual(
+            Student.objects.get(pk=self.student.pk).status, StudentStatus.GRADUATED
+        )
+        self.assertEqual(self.events("group"), {(self.group.pk, ChangeAction.UPDATED)})
+        self.assertEqual(
+            self.events("student"), {(self.student.pk, ChangeAction.UPDATED)}
+        )
+
+
+class ExportTests(RosterTestCase):
+    path = f"{API}/students/export/"
+
+    def test_streams_ndjson(self):
+        response = api_client(self.admin).get(self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.is_async)
+        rows = [json.loads(line) for line in response.getvalue().splitlines()]
+        self.assertEqual([row["email"] for row in rows], [self.student.email])
+
+    async def test_streams_asynchronously_under_asgi(self):
+        token = await sync_to_async(
+            lambda: str(
+                ClaimsTokenObtainPairSerializer.get_token(self.admin).access_token
+            )
+        )()
+        response = await self.async_client.get(
+            self.path, {"type": "csv"}, headers={"Authorization": f"Bearer {token}"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        # INFO: a sync iterator would be read into a list before the first byte goes out
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        header, *rows = content.decode().splitlines()
+        self.assertIn("email", header.split(","))
+        self.assertEqual(len(rows), 1)
+        self.assertIn(self.student.email, rows[0])
+
+
+class ChangeFeedTests(RosterTestCase):
+    path = f"{API}/changes/"
+
+    def setUp(self):
+        super().setUp()
+        ChangeEvent.objects.all().delete()
+        self.events = [
+            ChangeEvent.objects.create(
+                entity="student", entity_id=self.student.pk, action=action
+            )
+            for action in (ChangeAction.CREATED, ChangeAction.UPDATED)
+        ] + [
+            ChangeEvent.objects.create(
+                entity="group", entity_id=self.group.pk, action=ChangeAction.DELETED
+            )
+        ]
+
+    def test_admin_only(self):
+        response = api_client(self.teacher).get(self.path)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_pages_through_the_feed(self):
+        client = api_client(self.admin)
+        seen, since = [], 0
+        while True:
+            response = client.get(self.path, {"since": since, "limit": 2})
+            self.assertEqual(response.status_code, 200)
+            seen += [event["seq"] for event in response.data["results"]]
+            since = response.data["next"]
+            if not response.data["has_more"]:
+                break
+
+        self.assertEqual(seen, [event.pk for event in self.events])
+        self.assertEqual(since, self.events[-1].pk)
+
+        # INFO: caught up: nothing new, the cursor stays put
+        response = client.get(self.path, {"since": since})
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["next"], since)
+        self.assertFalse(response.data["has_more"])
+
+    def test_page_fields(self):
+        response = api_client(self.admin).get(self.path, {"limit": 1})
+
+        self.assertTrue(response.data["has_more"])
+        self.assertEqual(response.data["next"], self.events[0].pk)
+        (event,) = response.data["results"]
+        self.assertEqual(event["entity"], "student")
+        self.assertEqual(str(event["id"]), str(self.student.pk))
+        self.assertEqual(event["action"], ChangeAction.CREATED)
+
+    def test_compact_changes(self):
+        # INFO: one old tombstone, one recent one that must be kept
+        ChangeEvent.objects.filter(pk=self.events[2].pk).update(
+            created_at=timezone.now() - datetime.timedelta(days=31)
+        )
+        recent = ChangeEvent.objects.create(
+            entity="teacher", entity_id=self.teacher.pk, action=ChangeAction.DELETED
+        )
+
+        out = io.StringIO()
+        call_command("compact_changes", "--dry-run", stdout=out)
+        self.assertIn(
+            "would delete 1 superseded events and 1 old tombstones", out.getvalue()
+        )
+        self.assertEqual(ChangeEvent.objects.count(), 4)
+
+        out = io.StringIO()
+        call_command("compact_changes", stdout=out)
+        self.assertIn(
+            "Deleted 1 superseded events and 1 old tombstones, 2 left", out.getvalue()
+        )
+        self.assertEqual(
+            set(ChangeEvent.objects.values_list("pk", flat=True)),
+            {self.events[1].pk, recent.pk},
+        )
+
+
+class AsyncReadUrls:
+    """
+    config.urls as deployed with ASYNC_READS=true.
+    """
+
+    urlpatterns = [*async_read_urls(), *urlpatterns]
+
+
+@override_settings(ROOT_URLCONF=AsyncReadUrls)
+class AsyncReadTests(RosterTestCase):
+    """
+    The async list / retrieve views must answer exactly like the sync ones.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def paths(self):
+        return [
+            f"{API}/students/",
+            f"{API}/groups/",
+            f"{API}/students/{self.student.pk}/",
+            f"{API}/groups/{self.group.pk}/",
+            f"{API}/groups/{self.other_group.pk}/",
+            f"{API}/students/{uuid.uuid4()}/",
+        ]
+
+    def get_both(self, user, path, etag=None):
+        headers = {
+            "Authorization": "Bearer "
+            + str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+        }
+        if etag:
+            headers["If-None-Match"] = etag
+        with override_settings(ROOT_URLCONF="config.urls"):
+            sync = self.client.get(path, headers=headers)
+        self.assertTrue(asyncio.iscoroutinefunction(resolve(path).func))
+        return sync, async_to_sync(self.async_client.get)(path, headers=headers)
+
+    def assert_same(self, sync, async_):
+        self.assertEqual(async_.status_code, sync.status_code)
+        self.assertEqual(async_.content, sync.content)
+        self.assertEqual(async_.get("ETag"), sync.get("ETag"))
+
+    def test_same_responses_per_role(self):
+        for user in (self.admin, self.teacher, self.other_teacher, self.student):
+            for path in self.paths():
+                with self.subTest(role=user.role, path=path):
+                    sync, async_ = self.get_both(user, path)
+                    self.assert_same(sync, async_)
+                    if sync.status_code != 200:
+                        continue
+
+                    sync, async_ = self.get_both(user, path, sync["ETag"])
+                    self.assertEqual(sync.status_code, 304)
+                    self.assert_same(sync, async_)
+
+    def test_not_found(self):
+        for path in self.paths()[-1:] + [f"{API}/groups/{uuid.uuid4()}/"]:
+            with self.subTest(path=path):
+                sync, async_ = self.get_both(self.admin, path)
+                self.assertEqual(async_.status_code, 404)
+                self.assert_same(sync, async_)
+
+
+class CompactListTests(RosterTestCase):
+    path = f"{API}/students/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for email, group in (
+            ("second@example.com", cls.group),
+            ("third@example.com", cls.other_group),
+        ):
+            Student.objects.create(
+                user=create_user(email),
+                group=group,
+                date_of_birth=datetime.date(2005, 1, 1),
+            )
+
+    def assert_compact(self, response):
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        groups = {str(self.group.pk), str(self.other_group.pk)}
+        teachers = {str(self.teacher.pk), str(self.other_teacher.pk)}
+
+        for row in body["results"]:
+            self.assertNotIn("group", row)
+            self.assertIn(row["group_id"], groups)
+            self.assertIn(row["teacher_id"], teachers)
+        # INFO: each group / teacher once, however many rows point to it
+        self.assertEqual(set(body["included"]["groups"]), groups)
+        self.assertEqual(set(body["included"]["teachers"]), teachers)
+        included_group = body["included"]["groups"][str(self.group.pk)]
+        self.assertEqual(included_group["name"], "Group A")
+        self.assertEqual(included_group["teacher_id"], str(self.teacher.pk))
+        self.assertEqual(
+            body["included"]["teachers"][str(self.teacher.pk)]["email"],
+            self.teacher.email,
+        )
+        return body
+
+    def test_view_param(self):
+        body = self.assert_compact(
+            api_client(self.admin).get(self.path, {"view": "compact"})
+        )
+
+        self.assertEqual(len(body["results"]), 3)
+
+    def test_accept_profile(self):
+        response = api_client(self.admin).get(
+            self.path, HTTP_ACCEPT="application/json; profile=compact"
+        )
+
+        self.assert_compact(response)
+        self.assertEqual(
+            response.json(),
+            api_client(self.admin).get(self.path, {"view": "compact"}).json(),
+        )
+
+    def test_full_view_nests(self):
+        response = api_client(self.admin).get(self.path)
+
+        self.assertNotIn("included", response.json())
+        self.assertEqual(
+            response.json()["results"][0]["group"]["teacher"]["email"],
+            self.teacher.email,
+        )
+
+
+class SparseFieldsetTests(RosterTestCase):
+    path = f"{API}/students/"
+
+    def list_sql(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client(self.admin).get(self.path, params)
+        self.assertEqual(response.status_code, 200)
+        # INFO: the page itself, not ConditionalGetMixin's validator query
+        (sql,) = [q["sql"] for q in queries if " LIMIT " in q["sql"]]
+        return sql
+
+    def test_fields(self):
+        client = api_client(self.admin)
+        params = {"fields": "id, first_name"}
+
+        response = client.get(self.path, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [list(row) for row in response.data["results"]], [["id", "first_name"]]
+        )
+
+        response = client.get(f"{self.path}{self.student.pk}/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data), ["id", "first_name"])
+
+    def test_exclude(self):
+        full = api_client(self.admin).get(f"{self.path}{self.student.pk}/")
+        response = api_client(self.admin).get(
+            f"{self.path}{self.student.pk}/", {"exclude": "group,email"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(response.data),
+            [name for name in full.data if name not in ("group", "email")],
+        )
+
+    def test_unknown_fields(self):
+        client = api_client(self.admin)
+        for param in ("fields", "exclude"):
+            with self.subTest(param=param):
+                # INFO: write-only fields cannot be picked either
+                response = client.get(self.path, {param: "id,password,nope"})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    response.data[param], ["Unknown field(s): password, nope."]
+                )
+
+    def test_compact_view_conflict(self):
+        response = api_client(self.admin).get(
+            self.path, {"view": "compact", "fields": "id"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.data)
+
+    def test_list_reads_only_the_kept_columns(self):
+        for fast_reads in (True, False):
+            with self.subTest(fast_reads=fast_reads), self.settings(
+                FAST_READS=fast_reads
+            ):
+                full = self.list_sql({})
+                sparse = self.list_sql({"fields": "id,first_name,status"})
+
+                # INFO: values_list() with FAST_READS, only() without
+                for sql in (full, sparse):
+                    self.assertIn('"users_user"."first_name"', sql)
+                    self.assertIn('"users_student"."status"', sql)
+                self.assertIn('"users_student"."date_of_birth"', full)
+                self.assertNotIn('"users_student"."date_of_birth"', sparse)
+                self.assertIn('"users_group"', full)
+                self.assertNotIn('"users_group"', sparse)
+                self.assertLess(len(sparse), len(full))
+
+
+class MetricsTests(RosterTestCase):
+    path = f"{API}/metrics/"
+    route = '{route="students-list",method="GET"}'
+
+    def scrape(self):
+        """
+        The metrics as `{"name{labels}": value}`; the registry is per process, so tests
+        compare before / after.
+        """
+        response = api_client(self.admin).get(self.path)
+        self.assertEqual(response.status_code, 200)
+        return {
+            series: float(value)
+            for series, value in (
+                line.rsplit(" ", 1)
+                for line in response.content.decode().splitlines()
+                if not line.startswith("#")
+            )
+        }
+
+    def delta(self, before, after, series):
+        return after.get(series, 0) - before.get(series, 0)
+
+    def list_students(self, times=1, **metrics):
+        with self.settings(METRICS={"ENABLED": True, **metrics}):
+            before = self.scrape()
+            client = api_client(self.admin)
+            for _ in range(times):
+                self.assertEqual(client.get(f"{API}/students/").status_code, 200)
+            return before, self.scrape()
+
+    def test_admin_only(self):
+        self.assertIn(api_client().get(self.path).status_code, (401, 403))
+        for user in (self.teacher, self.student):
+            with self.subTest(role=user.role):
+                self.assertEqual(api_client(user).get(self.path).status_code, 403)
+
+        response = api_client(self.admin).get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+
+    def test_counts_requests_per_route(self):
+        before, after = self.list_students(times=2, SAMPLE_RATE=0)
+
+        self.assertEqual(
+            self.delta(
+                before,
+                after,
+                'http_requests_total{route="students-list",method="GET",status="200"}',
+            ),
+            2,
+        )
+        self.assertEqual(
+            self.delta(
+                before, after, f"http_request_duration_seconds_count{self.route}"
+            ),
+            2,
+        )
+        self.assertEqual(
+            self.delta(before, after, f"http_response_size_bytes_count{self.route}"), 2
+        )
+
+    def test_sampling_controls_the_db_and_serializer_histograms(self):
+        sampled = (
+            "http_request_db_seconds",
+            "http_request_queries",
+            "http_request_serializer_seconds",
+        )
+
+        before, after = self.list_students(SAMPLE_RATE=0)
+        for name in sampled:
+            with self.subTest(sample_rate=0, metric=name):
+                self.assertEqual(
+                    self.delta(before, after, f"{name}_count{self.route}"), 0
+                )
+
+        before, after = self.list_students(SAMPLE_RATE=1)
+        for name in sampled:
+            with self.subTest(sample_rate=1, metric=name):
+                self.assertEqual(
+                    self.delta(before, after, f"{name}_count{self.route}"), 1
+                )
+        self.assertGreater(
+            self.delta(before, after, f"http_request_db_seconds_sum{self.route}"), 0
+        )
+        self.assertGreater(
+            self.delta(before, after, f"http_request_queries_sum{self.route}"), 0
+        )
+        self.assertGreater(
+            self.delta(
+                before, after, f"http_request_serializer_seconds_sum{self.route}"
+            ),
+            0,
+        )
+
+    def test_disabled(self):
+        before, after = self.list_students(ENABLED=False)
+
+        self.assertEqual(
+            self.delta(
+                before, after, f"http_request_duration_seconds_count{self.route}"
+            ),
+            0,
+        )
+
+
+@override_settings(
+    QUERY_BUDGET={"ENABLED": True, "RAISE": True},
+    # INFO: worst case: counters maintained on every write
+    GROUP_COUNTERS=True,
+)
+class QueryBudgetTests(RosterTestCase):
+    """
+    Every `query_budget` entry is the exact worst case over the roles that may call the
+    action, with real JWTs and a cold token-version cache (DummyCache).
+    QueryBudgetMiddleware raises as soon as a request goes over.
+    """
+
+    maxDiff = None
+
+    def setUp(self):
+        self.measured = {}
+
+    def jwt_client(self, user):
+        client = APIClient()
+        user.refresh_from_db()  # INFO: an earlier PUT may have bumped token_version
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def measure(
+        self, viewset, action, users, request, expected_status=200, prepare=None
+    ):
+        """
+        Runs `request(client, prepared)` once per user and records the largest query count.
+        `prepare()` (not counted) creates what the request consumes, e.g. a row to delete.
+        """
+        for user in users:
+            client = self.jwt_client(user)
+            prepared = prepare() if prepare else None
+            with CaptureQueriesContext(connection) as ctx:
+                response = request(client, prepared)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            self.assertEqual(
+                response.status_code,
+                expected_status,
+                f"{viewset.__name__}.{action} as {user.role}: {getattr(response, 'data', '')}",
+            )
+            queries = sum(
+                1
+                for query in ctx.captured_queries
+                if counts_toward_budget(query["sql"])
+            )
+            key = (viewset, action)
+            self.measured[key] = max(self.measured.get(key, 0), queries)
+
+    def assertBudgetsExact(self, *viewsets):
+        budgets = {
+            (viewset, action): budget
+            for viewset in viewsets
+            for action, budget in viewset.query_budget.items()
+        }
+        self.assertEqual(
+            {f"{v.__name__}.{a}": n for (v, a), n in self.measured.items()},
+            {f"{v.__name__}.{a}": n for (v, a), n in budgets.items()},
+        )
+
+    def student_payload(self, n, group):
+        return {
+            "email": f"budget{n}@example.com",
+            "password": "budget-password",
+            "first_name": "Budget",
+            "last_name": f"Student {n}",
+            "phone_number": f"+7{n:06d}",
+            "date_of_birth": "2006-01-01",
+            "group_id": str(group.pk),
+        }
+
+    def new_student(self, n, group):
+        user = create_user(f"fresh{n}@example.com")
+        return Student.objects.create(
+            user=user, group=group, date_of_birth=datetime.date(2006, 1, 1)
+        )
+
+    def test_student_budgets(self):
+        viewset = StudentViewSet
+        staff = [self.admin, self.teacher]
+        readers = [*staff, self.student]
+        detail = f"{API}/students/{self.student.pk}/"
+        second_group = Group.objects.create(
+            name="Group A2", subject="Math", teacher=self.group.teacher
+        )
+        numbers = count()
+
+        self.measure(viewset, "list", readers, lambda c, _: c.get(f"{API}/students/"))
+        self.measure(viewset, "retrieve", readers, lambda c, _: c.get(detail))
+        self.measure(
+            viewset,
+            "create",
+            staff,
+            lambda c, _: c.post(
+                f"{API}/students/",
+                self.student_payload(next(numbers), self.group),
+                format="json",
+            ),
+            201,
+        )
+        self.measure(
+            viewset,
+            "update",
+            staff,
+            lambda c, _: c.put(
+                detail,
+                {
+                    **self.student_payload(next(numbers), self.group),
+                    "status": "STUDYING",
+                },
+                format="json",
+            ),
+        )
+        self.measure(
+            viewset,
+            "partial_update",
+            staff,
+            lambda c, _: c.patch(detail, {"first_name": "Patched"}, format="json"),
+        )
+        self.measure(
+            viewset,
+            "destroy",
+            staff,
+            lambda c, student: c.delete(f"{API}/students/{student.pk}/"),
+            204,
+            prepare=lambda: self.new_student(next(numbers), self.group),
+        )
+        self.measure(
+            viewset,
+            "bulk",
+            staff,
+            lambda c, _: c.post(
+                f"{API}/students/bulk/",
+                [self.student_payload(next(numbers), self.group) for _ in range(3)],
+                format="json",
+            ),
+            201,
+        )
+        self.measure(
+            viewset,
+            "bulk_move",
+            staff,
+            lambda c, students: c.post(
+                f"{API}/students/bulk-move/",
+                {
+                    "student_ids": [str(student.pk) for student in students],
+                    "group_id": str(second_group.pk),
+                },
+                format="json",
+            ),
+            prepare=lambda: [
+                self.new_student(next(numbers), self.group) for _ in range(3)
+            ],
+        )
+        self.measure(
+            viewset, "export", readers, lambda c, _: c.get(f"{API}/students/export/")
+        )
+        self.assertBudgetsExact(viewset)
+
+    def test_teacher_budgets(self):
+        viewset = TeacherViewSet
+        admin = [self.admin]
+        detail = f"{API}/teachers/{self.teacher.pk}/"
+        numbers = count()
+
+        def teacher_payload():
+            n = next(numbers)
+            return {
+                "email": f"budget-teacher{n}@example.com",
+                "password": "budget-password",
+                "first_name": "Budget",
+                "last_name": f"Teacher {n}",
+                "phone_number": f"+8{n:06d}",
+            }
+
+        def new_teacher():
+            user = create_user(
+                f"fresh-teacher{next(numbers)}@example.com", RoleType.TEACHER
+            )
+            return Teacher.objects.create(user=user)
+
+        self.measure(viewset, "list", admin, lambda c, _: c.get(f"{API}/teachers/"))
+        self.measure(viewset, "retrieve", admin, lambda c, _: c.get(detail))
+        self.measure(
+            viewset,
+            "create",
+            admin,
+            lambda c, _: c.post(f"{API}/teachers/", teacher_payload(), format="json"),
+            201,
+        )
+        self.measure(
+            viewset,
+            "update",
+            admin,
+            lambda c, _: c.put(detail, teacher_payload(), format="json"),
+        )
+        self.measure(
+            viewset,
+            "partial_update",
+            admin,
+            lambda c, _: c.patch(detail, {"specialization": "Algebra"}, format="json"),
+        )
+        self.measure(
+            viewset,
+            "destroy",
+            admin,
+            lambda c, teacher: c.delete(f"{API}/teachers/{teacher.pk}/"),
+            204,
+            prepare=new_teacher,
+        )
+        self.measure(
+            viewset,
+            "dashboard",
+            [self.teacher],
+            lambda c, _: c.get(f"{API}/teachers/me/dashboard/"),
+        )
+        self.assertBudgetsExact(viewset)
+
+    def test_group_budgets(self):
+        viewset = GroupViewSet
+        readers = [self.admin, self.teacher, self.student]
+        detail = f"{API}/groups/{self.group.pk}/"
+        numbers = count()
+
+        def group_payload():
+            return {
+                "name": f"Budget group {next(numbers)}",
+                "subject": "Chemistry",
+                "teacher_id": str(self.group.teacher_id),
+            }
+
+        def new_group():
+            return Group.objects.create(
+                name=f"Fresh group {next(numbers)}",
+                subject="Chemistry",
+                teacher_id=self.group.teacher_id,
+            )
+
+        def graduating_group():
+            group = new_group()
+            Student.objects.create(
+                user=create_user(f"graduate{next(numbers)}@example.com"),
+                group=group,
+                date_of_birth=datetime.date(2005, 1, 1),
+            )
+            return group
+
+        self.measure(viewset, "list", readers, lambda c, _: c.get(f"{API}/groups/"))
+        self.measure(viewset, "retrieve", readers, lambda c, _: c.get(detail))
+        self.measure(
+            viewset,
+            "create",
+            [self.admin],
+            lambda c, _: c.post(f"{API}/groups/", group_payload(), format="json"),
+            201,
+        )
+        self.measure(
+            viewset,
+            "update",
+            [self.admin],
+            lambda c, _: c.put(detail, group_payload(), format="json"),
+        )
+        self.measure(
+            viewset,
+            "partial_update",
+            [self.admin],
+            lambda c, _: c.patch(detail, {"description": "Patched"}, format="json"),
+        )
+        self.measure(
+            viewset,
+            "destroy",
+            [self.admin],
+            lambda c, group: c.delete(f"{API}/groups/{group.pk}/"),
+            204,
+            prepare=new_group,
+        )
+        self.measure(
+            viewset, "stats", readers, lambda c, _: c.get(f"{API}/groups/stats/")
+        )
+        self.measure(
+            viewset,
+            "complete",
+            [self.admin, self.teacher],
+            lambda c, group: c.post(f"{API}/groups/{group.pk}/complete/"),
+            prepare=graduating_group,
+        )
+        self.assertBudgetsExact(viewset)
+
+    def test_job_budgets(self):
+        viewset = JobViewSet
+        job = submit_job(
+            "groups.complete", {"group_id": str(self.group.pk)}, self.teacher
+        )
+        users = [self.admin, self.teacher]
+        self.measure(viewset, "list", users, lambda c, _: c.get(f"{API}/jobs/"))
+        self.measure(
+            viewset, "retrieve", users, lambda c, _: c.get(f"{API}/jobs/{job.pk}/")
+        )
+        self.assertBudgetsExact(viewset)
+
+    def test_teacher_list_does_not_grow_with_teachers(self):
+        client = self.jwt_client(self.admin)
+
+        def queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(f"{API}/teachers/?page_size=50")
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        before = queries()
+        for n in range(10):
+            Teacher.objects.create(
+                user=create_user(f"many-teachers{n}@example.com", RoleType.TEACHER)
+            )
+        self.assertEqual(queries(), before)
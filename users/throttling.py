@@ -0,0 +1,88 @@
+import hashlib
+import threading
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# INFO: guards the read-modify-write of a bucket between the threads of this process
+_bucket_lock = threading.Lock()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket over DRF's "N/period" rates: bursts of up to N requests, refilled at
+    N per period. Buckets live in the process-local cache ("local"), so every worker
+    process counts its own requests. A scope without a rate is not throttled.
+    """
+
+    @property
+    def cache(self):
+        return caches["local"]
+
+    def get_rate(self):
+        # INFO: read per request (DRF reads them at import), so settings overrides apply
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        refill = self.num_requests / self.duration  # tokens per second
+        with _bucket_lock:
+            tokens, stamp = self.cache.get(self.key, (self.num_requests, self.now))
+            elapsed = max(0.0, self.now - stamp)  # INFO: time.time() can step back
+            self.tokens = min(self.num_requests, tokens + elapsed * refill)
+            if self.tokens < 1:
+                return self.throttle_failure()
+            # INFO: an expired entry is a full bucket again
+            self.cache.set(self.key, (self.tokens - 1, self.now), self.duration)
+        return True
+
+    def wait(self):
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    """
+    Token obtain attempts per client IP.
+    """
+
+    scope = "login"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class LoginEmailRateThrottle(TokenBucketThrottle):
+    """
+    Token obtain attempts per account email, guesses spread over many IPs still add up.
+    """
+
+    scope = "login_email"
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        email = (
+            data.get(get_user_model().USERNAME_FIELD) if hasattr(data, "get") else None
+        )
+        if not isinstance(email, str) or not email.strip():
+            return None
+        ident = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class RefreshRateThrottle(LoginRateThrottle):
+    """
+    Token refresh attempts per client IP.
+    """
+
+    scope = "refresh"
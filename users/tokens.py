@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation import is_revoked, revoke_token
+
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+def add_user_claims(token, user):
+    """
+    Claims read by StatelessJWTAuthentication so API requests need no user lookup.
+    """
+    token["role"] = user.role
+    token["is_active"] = user.is_active
+    token["is_staff"] = user.is_staff
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refuses refresh tokens issued before the user's token_version was bumped
+    (password change / deactivation), and re-issues claims from the current user row.
+    With ROTATE_REFRESH_TOKENS and BLACKLIST_AFTER_ROTATION a refresh token works once:
+    it is revoked (users.revocation) before its replacement is issued.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if is_revoked(refresh[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+        user = (
+            get_user_model()
+            .objects.filter(
+                **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+            )
+            .first()
+        )
+        if user is None or refresh.get(TOKEN_VERSION_CLAIM) != user.token_version:
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            if not revoke_token(refresh):
+                raise TokenError(_("Token is blacklisted"))
+
+        add_user_claims(refresh, user)
+        attrs["refresh"] = str(refresh)
+        return super().validate(attrs)
@@ -0,0 +1,31 @@
+import os
+import time
+import uuid
+
+from django.conf import settings
+
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562, version 7): 48-bit unix milliseconds, then 74 random bits.
+    New keys land at the right edge of the primary key B-tree instead of a random page.
+    """
+    millis = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")  # 80 bits, 74 are used
+
+    value = (millis & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= (rand >> 62 & 0xFFF) << 64  # rand_a, 12 bits
+    value |= 0b10 << 62  # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b, 62 bits
+    return uuid.UUID(int=value)
+
+
+def new_uuid():
+    """
+    Primary key default of User / Group: uuid4, or uuid7 with UUID_VERSION=7.
+    Both kinds can live in the same table, only new rows are affected.
+    """
+    if getattr(settings, "UUID_VERSION", 4) == 7:
+        return uuid7()
+    return uuid.uuid4()
@@ -1,16 +1,355 @@
-from rest_framework import viewsets
-from .models import Group, RoleType, Student, Teacher
-from .permissions import IsAdmin, IsAdminOrReadOnly, IsAdminOrTeacherCanWrite
-from .serializers import StudentSerializer, TeacherSerializer, GroupSerializer
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from django.http import HttpResponse, StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from .async_views import AsyncReadMixin
+from .conditional import ConditionalGetMixin
+from .database import database_stats, ping
+from .exports import EXPORT_FORMATS, aiter_batches
+from .filters import (
+    GroupFilter,
+    IndexedOrderingFilter,
+    PrefixSearchFilter,
+    StudentFilter,
+    TeacherFilter,
+)
+from .jobs import seal_bulk_rows, submit_job
+from .metrics import render_metrics, serializer_timer
+from .models import ChangeAction, Group, Job, RoleType, Student, Teacher
+from .outbox import changes_since, record_change
+from .pagination import KeysetPagination
+from .parsers import CSVParser
+from .permissions import (
+    IsAdmin,
+    IsAdminOrReadOnly,
+    IsAdminOrTeacherCanWrite,
+    IsTeacher,
+)
+from .projections import get_projection
+from .scopes import aget_user_scope, get_user_scope
+from .serializers import (
+    ChangeFeedParamsSerializer,
+    GroupCompactSerializer,
+    GroupDashboardSerializer,
+    GroupSerializer,
+    JobSerializer,
+    StudentBulkMoveSerializer,
+    StudentCompactSerializer,
+    StudentSerializer,
+    TeacherSerializer,
+    build_included,
+    readable_field_names,
+)
+from .services import (
+    BULK_MAX_ROWS,
+    bulk_enroll_students,
+    bulk_move_students,
+    check_bulk_rows,
+    complete_group,
+    group_stats,
+)
+from .throttling import (
+    LoginEmailRateThrottle,
+    LoginRateThrottle,
+    RefreshRateThrottle,
+)
 
-class StudentViewSet(viewsets.ModelViewSet):
+COMPACT_PROFILE = "compact"
+FIELDSET_ACTIONS = ("list", "retrieve")
+# INFO: applied on top of get_queryset() scoping, ordering also drives KeysetPagination
+FILTER_BACKENDS = [DjangoFilterBackend, PrefixSearchFilter, IndexedOrderingFilter]
+
+
+def wants_compact(request):
+    """
+    Compact list mode: `?view=compact` or `Accept: application/json; profile=compact`
+    """
+    if request.query_params.get("view") == COMPACT_PROFILE:
+        return True
+    return any(
+        media_type.params.get("profile") == COMPACT_PROFILE
+        for media_type in request.accepted_types
+    )
+
+
+def wants_background(request):
+    """
+    Run the action as a background job: `?async=true` or `Prefer: respond-async`
+    """
+    if request.query_params.get("async") in ("1", "true"):
+        return True
+    return "respond-async" in request.headers.get("Prefer", "")
+
+
+def job_accepted(request, kind, payload):
+    """
+    Queues a job for `manage.py runworker`: 202 with the job id and where to poll it.
+    """
+    job = submit_job(kind, payload, request.user)
+    url = reverse("jobs-detail", args=[job.pk], request=request)
+    return Response(
+        {"job_id": job.pk, "status": job.status, "url": url},
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Location": url},
+    )
+
+
+class CompactListMixin(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    `list` in compact mode: rows reference related objects by id, and each related
+    object is serialized once in `included` instead of being nested in every row.
+    """
+
+    compact_serializer_class = serializers.Serializer
+    # INFO: build_included() argument -> the attribute of each object holding it
+    included_relations = {}
+
+    def get_included(self, objects):
+        return build_included(
+            **{
+                kind: [getattr(obj, attr) for obj in objects]
+                for kind, attr in self.included_relations.items()
+            }
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not wants_compact(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        objects = list(queryset) if page is None else page
+        return self.compact_response(objects, page)
+
+    async def alist(self, request, *args, **kwargs):
+        if not wants_compact(request):
+            return await super().alist(  # pyright: ignore[reportAttributeAccessIssue]
+                request, *args, **kwargs
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(  # pyright: ignore[reportAttributeAccessIssue]
+            queryset
+        )
+        objects = [obj async for obj in queryset] if page is None else page
+        return self.compact_response(objects, page)
+
+    def compact_response(self, objects, page):
+        serializer = self.compact_serializer_class(
+            objects, many=True, context=self.get_serializer_context()
+        )
+        included = self.get_included(objects)
+
+        if page is None:
+            return Response({"results": serializer.data, "included": included})
+
+        response = self.get_paginated_response(serializer.data)
+        response.data["included"] = included  # pyright: ignore[reportOptionalSubscript]
+        return response
+
+
+class SparseFieldsMixin(viewsets.GenericViewSet):
+    """
+    Sparse fieldsets for list / retrieve: `?fields=id,first_name` renders only these top-level
+    fields, `?exclude=group` all but these. Lists also read less: only the columns of the kept
+    fields, joined only to the relations they go through. A detail read keeps its full row,
+    its ETag needs every `updated_at`.
+    """
+
+    fields_query_param = "fields"
+    exclude_query_param = "exclude"
+
+    def get_fieldset(self):
+        """
+        The top-level field names to render, None for all of them.
+        """
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = self._parse_fieldset()
+        return self._fieldset
+
+    def _parse_fieldset(self):
+        if self.action not in FIELDSET_ACTIONS:
+            return None
+        requested = {
+            param: [
+                name.strip()
+                for name in self.request.query_params.get(param, "").split(",")
+                if name.strip()
+            ]
+            for param in (self.fields_query_param, self.exclude_query_param)
+        }
+        if not any(requested.values()):
+            return None
+        if wants_compact(self.request):
+            raise serializers.ValidationError(
+                {"fields": ["Sparse fieldsets are not available in compact view."]}
+            )
+
+        readable = readable_field_names(self.get_serializer_class())
+        errors = {
+            param: [f"Unknown field(s): {', '.join(unknown)}."]
+            for param, names in requested.items()
+            if (unknown := [name for name in names if name not in readable])
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        include = requested[self.fields_query_param]
+        exclude = requested[self.exclude_query_param]
+        return tuple(
+            name
+            for name in readable
+            if (not include or name in include) and name not in exclude
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            context["fields"] = fieldset
+        return context
+
+    def get_fieldset_projection(self):
+        """
+        The Projection of a list's sparse fieldset: which columns / relations it reads.
+        """
+        fieldset = self.get_fieldset()
+        if self.action != "list" or fieldset is None:
+            return None
+        return get_projection(self.get_serializer_class(), fieldset)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        projection = self.get_fieldset_projection()
+        if projection is None:
+            return queryset
+        # INFO: KeysetPagination reads the ordering field of the last row
+        return projection.prune(queryset, *getattr(self, "ordering_fields", ()))
+
+    def get_updated_at_fields(self):
+        # INFO: ConditionalGetMixin's list validators, only for relations still rendered
+        updated_at_fields = getattr(super(), "get_updated_at_fields")()
+        projection = self.get_fieldset_projection()
+        if projection is None:
+            return updated_at_fields
+        return tuple(
+            path
+            for path in updated_at_fields
+            if path.rpartition("__")[0] in {"", *projection.relations}
+        )
+
+
+class ProjectionListMixin(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    `list` from `values_list()` rows of only the columns the serializer reads, mapped to
+    dicts by the serializer's Projection: no model instances, no per-field DRF calls.
+    With SparseFieldsMixin's sparse fieldset, the Projection of the kept fields.
+    Falls back to the serializer when FAST_READS is off or the serializer has fields
+    a projection cannot express.
+    """
+
+    def get_projection(self):
+        if not settings.FAST_READS:
+            return None
+        return get_projection(
+            self.get_serializer_class(),
+            self.get_fieldset(),  # pyright: ignore[reportAttributeAccessIssue]
+        )
+
+    def projected_rows(self, projection):
+        queryset = self.filter_queryset(self.get_queryset())
+        # INFO: KeysetPagination reads the pk and the ordering field of the last row
+        return projection.values(queryset, "pk", *getattr(self, "ordering_fields", ()))
+
+    def projected_response(self, projection, rows, page):
+        with serializer_timer(self.request):
+            data = [projection.map_row(row) for row in rows]
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.projected_rows(projection)
+        page = self.paginate_queryset(rows)
+        return self.projected_response(
+            projection, list(rows) if page is None else page, page
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        if projection is None:
+            return await super().alist(  # pyright: ignore[reportAttributeAccessIssue]
+                request, *args, **kwargs
+            )
+
+        rows = self.projected_rows(projection)
+        page = await self.apaginate_queryset(  # pyright: ignore[reportAttributeAccessIssue]
+            rows
+        )
+        return self.projected_response(
+            projection, [row async for row in rows] if page is None else page, page
+        )
+
+
+class StudentViewSet(
+    SparseFieldsMixin,
+    ConditionalGetMixin,
+    CompactListMixin,
+    ProjectionListMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = StudentSerializer
+    pagination_class = KeysetPagination
+    compact_serializer_class = StudentCompactSerializer
+    included_relations = {"groups": "group"}
+    filter_backends = FILTER_BACKENDS
+    filterset_class = StudentFilter
+    search_fields = ["user__email", "user__first_name", "user__last_name"]
+    ordering_fields = ["created_at", "enrollment_date"]
+    ordering = "created_at"
+    updated_at_fields = (
+        "updated_at",
+        "user__updated_at",
+        "group__updated_at",
+        "group__teacher__updated_at",
+        "group__teacher__user__updated_at",
+    )
     permission_classes = [IsAdminOrTeacherCanWrite]
+    # INFO: max SQL queries per action, see QueryBudgetMiddleware. Exact worst case
+    # (cold token-version cache, GROUP_COUNTERS on), pinned by users.tests.QueryBudgetTests
+    query_budget = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 8,
+        "update": 7,
+        "partial_update": 5,
+        "destroy": 12,
+        "bulk": 7,
+        "bulk_move": 7,
+        "export": 2,
+    }
 
     def perform_destroy(self, instance):
-        user = instance.user
-        user.delete()
+        with transaction.atomic():
+            record_change(instance, ChangeAction.DELETED)
+            instance.user.delete()
 
     def get_queryset(self):
         user = self.request.user
@@ -24,25 +363,251 @@ class StudentViewSet(viewsets.ModelViewSet):
         if user.role == RoleType.ADMIN:  # pyright: ignore[reportAttributeAccessIssue]
             return qs
         if user.role == RoleType.TEACHER:  # pyright: ignore[reportAttributeAccessIssue]
-            return qs.filter(group__teacher__user=user)
+            return qs.filter(group__teacher_id=user.pk)
         if user.role == RoleType.STUDENT:  # pyright: ignore[reportAttributeAccessIssue]
-            return qs.filter(user=user)
+            return qs.filter(user_id=user.pk)
         return qs.none()
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        parser_classes=[JSONParser, CSVParser],
+    )
+    def bulk(self, request):
+        """
+        Enroll many students at once.
+        Body: JSON list of student objects or `text/csv` with a header row.
+        `?async=true` / `Prefer: respond-async`: 202 and a background job instead.
+        """
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"detail": "Expected a non-empty list of students."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > BULK_MAX_ROWS:
+            return Response(
+                {"detail": f"At most {BULK_MAX_ROWS} students per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if wants_background(request):
+            # INFO: the cheap checks answer now, the hashing is left to the worker
+            _, errors = check_bulk_rows(rows, request.user)
+            if errors:
+                return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+            return job_accepted(
+                request, "students.bulk_enroll", {"rows": seal_bulk_rows(rows)}
+            )
+
+        students, errors = bulk_enroll_students(rows, request.user)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "created": len(students),
+                "ids": [student.user.id for student in students],
+            },
+            status=status.HTTP_201_CREATED,
+        )
 
-class TeacherViewSet(viewsets.ModelViewSet):
-    queryset = Teacher.objects.all()
+    @action(detail=False, methods=["post"], url_path="bulk-move", url_name="bulk-move")
+    def bulk_move(self, request):
+        """
+        Move students to another group in one UPDATE.
+        Body: `{"student_ids": [...], "group_id": "..."}`, teachers only within their own groups.
+        `?async=true` / `Prefer: respond-async`: 202 and a background job instead.
+        """
+        serializer = StudentBulkMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        student_ids = serializer.validated_data["student_ids"]
+        if len(student_ids) > BULK_MAX_ROWS:
+            return Response(
+                {"detail": f"At most {BULK_MAX_ROWS} students per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        group_id = serializer.validated_data["group_id"]
+        if wants_background(request):
+            return job_accepted(
+                request,
+                "students.bulk_move",
+                {"student_ids": student_ids, "group_id": group_id},
+            )
+
+        summary, errors = bulk_move_students(student_ids, group_id, request.user)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(summary)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Streams the whole (role-scoped, filtered) roster, `?type=ndjson` (default) or `?type=csv`.
+        Rows are read through a server-side cursor, memory stays flat for any roster size.
+        Under ASGI the stream is async (see aiter_batches), a sync one would be buffered whole.
+        """
+        export_type = request.query_params.get("type", "ndjson")
+        if export_type not in EXPORT_FORMATS:
+            return Response(
+                {"type": f"Choose one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        content_type, stream = EXPORT_FORMATS[export_type]
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = StudentCompactSerializer(context=self.get_serializer_context())
+
+        content = stream(queryset, serializer)
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_batches(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="students.{export_type}"'
+        )
+        return response
+
+
+class TeacherViewSet(SparseFieldsMixin, ProjectionListMixin, viewsets.ModelViewSet):
+    queryset = Teacher.objects.select_related("user")
     serializer_class = TeacherSerializer
+    pagination_class = KeysetPagination
+    filter_backends = FILTER_BACKENDS
+    filterset_class = TeacherFilter
+    search_fields = ["user__email", "user__first_name", "user__last_name"]
+    ordering_fields = ["created_at", "hired_date"]
+    ordering = "created_at"
     permission_classes = [IsAdmin]
+    query_budget = {
+        "list": 2,
+        "retrieve": 2,
+        "create": 6,
+        "update": 6,
+        "partial_update": 5,
+        "destroy": 12,
+        "dashboard": 4,
+    }
 
     def perform_destroy(self, instance):
-        user = instance.user
-        user.delete()
+        with transaction.atomic():
+            record_change(instance, ChangeAction.DELETED)
+            instance.user.delete()
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="me/dashboard",
+        url_name="me-dashboard",
+        permission_classes=[IsTeacher],
+    )
+    def dashboard(self, request):
+        """
+        The teacher's profile and groups, each group with its student roster.
+        Three queries (teacher, groups, students) whatever the number of groups / students.
+        """
+        teacher = get_object_or_404(self.get_queryset(), pk=request.user.pk)
+        students = Student.objects.select_related("user").order_by(
+            "user__last_name", "user__first_name", "pk"
+        )
+        groups = (
+            Group.objects.filter(teacher_id=teacher.pk)
+            .order_by("name", "pk")
+            .prefetch_related(Prefetch("students", queryset=students))
+        )
+        context = self.get_serializer_context()
+
+        return Response(
+            {
+                "teacher": TeacherSerializer(teacher, context=context).data,
+                "groups": GroupDashboardSerializer(
+                    groups, many=True, context=context
+                ).data,
+            }
+        )
 
 
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(
+    SparseFieldsMixin,
+    ConditionalGetMixin,
+    CompactListMixin,
+    ProjectionListMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = GroupSerializer
+    pagination_class = KeysetPagination
+    compact_serializer_class = GroupCompactSerializer
+    included_relations = {"teachers": "teacher"}
+    filter_backends = FILTER_BACKENDS
+    filterset_class = GroupFilter
+    search_fields = ["name", "subject"]
+    ordering_fields = ["created_at", "name"]
+    ordering = "created_at"
+    updated_at_fields = (
+        "updated_at",
+        "teacher__updated_at",
+        "teacher__user__updated_at",
+    )
     permission_classes = [IsAdminOrReadOnly]
+    query_budget = {
+        "list": 4,
+        "retrieve": 3,
+        "create": 5,
+        "update": 6,
+        "partial_update": 4,
+        "destroy": 5,
+        "stats": 3,
+        "complete": 8,
+    }
+
+    async def aprepare(self, request):
+        # INFO: get_queryset() reads a student's group from the scope
+        await aget_user_scope(request)
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def stats(self, request):
+        """
+        Student counts per status for every group the user can see.
+        """
+        groups = self.filter_queryset(self.get_queryset())
+        rows = group_stats(groups.select_related(None))
+
+        totals = {}
+        for row in rows:
+            for key, value in row["students"].items():
+                totals[key] = totals.get(key, 0) + value
+
+        return Response({"groups": rows, "totals": totals})
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            record_change(instance, ChangeAction.DELETED)
+            instance.delete()
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="complete",
+        permission_classes=[IsAdminOrTeacherCanWrite],
+    )
+    def complete(self, request, pk=None):
+        """
+        Marks the group COMPLETED and its studying students GRADUATED.
+        Admins, or the teacher of the group. `?async=true` / `Prefer: respond-async`: 202 and a background job.
+        """
+        group = self.get_object()
+        if wants_background(request):
+            return job_accepted(request, "groups.complete", {"group_id": group.pk})
+
+        summary = complete_group(group)
+        if summary is None:
+            return Response(
+                {"detail": "A terminated group cannot be completed."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(summary)
 
     def get_queryset(self):
         queryset = Group.objects.select_related("teacher", "teacher__user")
@@ -55,13 +620,102 @@ class GroupViewSet(viewsets.ModelViewSet):
             return queryset
 
         if user.role == RoleType.TEACHER:  # pyright: ignore[reportAttributeAccessIssue]
-            return queryset.filter(teacher__user=user)
+            return queryset.filter(teacher_id=user.pk)
 
         if user.role == RoleType.STUDENT:  # pyright: ignore[reportAttributeAccessIssue]
-            try:
-                student = Student.objects.only("group_id").get(user=user)
-            except Student.DoesNotExist:
+            group_id = get_user_scope(self.request).student_group_id
+            if group_id is None:
                 return queryset.none()
-            return queryset.filter(pk=student.group.id)
+            return queryset.filter(pk=group_id)
 
         return queryset.none()
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Background jobs (users.jobs) and their outcome: admins see all, others their own.
+    """
+
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    query_budget = {"list": 3, "retrieve": 2}
+
+    def get_queryset(self):
+        jobs = Job.objects.order_by("-created_at")
+        user = self.request.user
+        if user.role == RoleType.ADMIN:  # pyright: ignore[reportAttributeAccessIssue]
+            return jobs
+        return jobs.filter(created_by_id=user.pk)
+
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """
+    `POST /api/v1/token/` behind per-IP and per-email token buckets:
+    a throttled attempt gets 429 before any password hashing.
+    """
+
+    throttle_classes = [LoginRateThrottle, LoginEmailRateThrottle]
+
+
+class ThrottledTokenRefreshView(TokenRefreshView):
+    """
+    `POST /api/v1/token/refresh/` behind a per-IP token bucket.
+    """
+
+    throttle_classes = [RefreshRateThrottle]
+
+
+class ChangeFeedView(APIView):
+    """
+    `GET /api/v1/changes/?since=<seq>&limit=<n>`: student / teacher / group change events
+    after `since`, oldest first. Poll again with `next` until `has_more` is false.
+    Events only name the object, fetch it to sync (404 means it is gone).
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        params = ChangeFeedParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        since = params.validated_data["since"]
+
+        events, has_more = changes_since(since, params.validated_data["limit"])
+        return Response(
+            {
+                "results": events,
+                "next": events[-1]["seq"] if events else since,
+                "has_more": has_more,
+            }
+        )
+
+
+class DatabaseHealthView(APIView):
+    """
+    `GET /api/v1/health/db/`: a DB round trip plus connection / pool metrics (per process).
+    503 when the database cannot be reached.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        stats = database_stats()
+        try:
+            stats["ping_ms"] = ping()
+        except DatabaseError as exc:
+            stats["error"] = str(exc)
+            return Response(stats, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(stats)
+
+
+class MetricsView(APIView):
+    """
+    `GET /api/v1/metrics/`: per-route request metrics of this process, Prometheus text format.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return HttpResponse(
+            render_metrics(database_stats()["pool"]),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )